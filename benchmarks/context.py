@@ -0,0 +1,20 @@
+import os
+import sys
+
+# Run benchmarks without opening a window.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# Add forggie2/ directory to the search path.
+cwd = os.path.abspath(os.path.join(os.path.dirname(__file__)))
+path = os.path.join(cwd, '..', 'forggie2')
+sys.path.insert(0, path)
+
+import animatedsprite
+import clock
+import configregistry
+import highscores
+import level
+import loaders
+import logger
+import main
+import traffic
@@ -0,0 +1,183 @@
+"""Benchmarks of the game hot paths.
+
+Run with 'make bench'. Results are compared with the saved baseline and the
+run fails if the game got slower than the allowed threshold.
+"""
+import os
+import random
+
+import pygame
+import pytest
+
+from context import animatedsprite, clock, configregistry, highscores
+from context import level, loaders, logger, main, traffic
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+LEVELS = ['level%d.conf' % i for i in range(1, 8)]
+
+# Amount of copies of the level 7 traffic moved together.
+TRAFFIC_COPIES = (1, 10, 50)
+
+# Amount of headless frames played by the Game.play() benchmark.
+PLAY_FRAMES = 100
+
+
+@pytest.fixture(scope='module', autouse=True)
+def display():
+    """Display is needed to convert images like the game does."""
+    pygame.init()
+    pygame.display.set_mode((600, 800))
+    yield
+    pygame.quit()
+
+
+def loadLevel(name, seed=1):
+    """Load level with the same car positions every time."""
+    lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800,
+                      clock=clock.TickClock(), seed=seed)
+    lvl.load(os.path.join(CONFIG_DIR, name))
+    return lvl
+
+
+@pytest.mark.parametrize('name', LEVELS)
+def test_Level_load(benchmark, name):
+    """Level loading with images already cached."""
+    benchmark(loadLevel, name)
+
+
+def test_loadImage_cold(benchmark):
+    """Image decoding and conversion."""
+    def setup():
+        loaders.IMAGE_CACHE.clear()
+
+    benchmark.pedantic(loaders.loadImage, args=('background2.png',),
+                       setup=setup, rounds=20)
+
+
+def test_loadImage_cached(benchmark):
+    """Image cache lookup."""
+    loaders.loadImage('car1.png', useAlpha=True)
+    benchmark(loaders.loadImage, 'car1.png', useAlpha=True)
+
+
+def test_AnimatedSprite_init(benchmark):
+    """Animation frames cut from the animation image."""
+    config = configregistry.REGISTRY.animation(
+        os.path.join(CONFIG_DIR, 'animation_frog_up.conf'))
+    benchmark(animatedsprite.AnimatedSprite, config, IMAGE_DIR, (100, 100))
+
+
+@pytest.mark.parametrize('copies', TRAFFIC_COPIES)
+def test_sprites_update(benchmark, copies):
+    """Car.update() and Floater.update() of every object for one frame."""
+    sprites = []
+    for seed in range(copies):
+        lvl = loadLevel('level7.conf', seed)
+        sprites += lvl.cars + lvl.floaters
+
+    benchmark.extra_info['objects'] = len(sprites)
+
+    def update():
+        for sprite in sprites:
+            sprite.update()
+
+    benchmark(update)
+
+
+@pytest.mark.parametrize('copies', TRAFFIC_COPIES)
+def test_TrafficEngine_step(benchmark, copies):
+    """The same movement as test_sprites_update() done by the engine."""
+    cars = []
+    floaters = []
+    for seed in range(copies):
+        lvl = loadLevel('level7.conf', seed)
+        cars += lvl.cars
+        floaters += lvl.floaters
+
+    engine = traffic.TrafficEngine(cars, floaters, 600)
+    benchmark.extra_info['objects'] = len(engine.sprites)
+    benchmark(engine.step)
+
+
+def test_Frog_update(benchmark):
+    """Frog jumping towards the finish for one second of the game time."""
+    lvl = loadLevel('level1.conf')
+    frog = lvl.frog
+
+    def jump():
+        frog.moveToStart()
+        for tick in range(clock.DEFAULT_FRAME_RATE):
+            lvl.clock.tick()
+            frog.pressedUp = tick % 4 == 0
+            frog.update([], -1, -1, lvl.floaters, lvl.riverTracks)
+
+    benchmark(jump)
+
+
+def test_Logger_log_long(benchmark):
+    """Long messages split to fit the screen."""
+    log = logger.Logger(screenWidth=600, screenHeight=800, fontSize=20)
+    msg = 'collisionWithRiver: 3, floaters: ' + 'x' * 400
+    benchmark(log.log, msg)
+
+
+def test_Highscores_render(benchmark):
+    """Rendering of the full highscores table."""
+    scores = highscores.Highscores()
+    scores.scores = [{'totalSeconds': 60.5 + idx, 'name': f'player{idx}',
+                      'minutes': 1, 'seconds': 0.5 + idx}
+                     for idx in range(scores.maxEntries)]
+    benchmark(scores.render)
+
+
+def test_TopScores_insert_manyRuns(benchmark):
+    """Keeping the best results of thousands of runs."""
+    rng = random.Random(1)
+    results = [highscores.makeScore(rng.uniform(60, 600), f'p{idx}')
+               for idx in range(5000)]
+
+    def insertAll():
+        top = highscores.TopScores()
+        for score in results:
+            top.insert(score)
+
+    benchmark(insertAll)
+
+
+class FakeClock:
+    """pygame.time.Clock which does not wait: every frame is one tick."""
+
+    def tick(self, framerate=0):
+        return 1000 / main.FRAME_RATE
+
+
+def test_Game_play_frames(benchmark, monkeypatch, request):
+    """Loading the first level and playing PLAY_FRAMES headless frames."""
+    game = main.Game(CONFIG_DIR, IMAGE_DIR)
+    request.addfinalizer(game.preloader.close)
+    monkeypatch.setattr(main.pygame.time, 'Clock', FakeClock)
+
+    frames = [0]
+    getEvents = pygame.event.get
+
+    def events():
+        getEvents()
+        frames[0] += 1
+        if frames[0] > PLAY_FRAMES:
+            return [pygame.event.Event(pygame.QUIT)]
+        if frames[0] % 10 == 0:
+            return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP)]
+        return []
+
+    monkeypatch.setattr(main.pygame.event, 'get', events)
+
+    def play():
+        frames[0] = 0
+        game.play(game.screen, highscores.TopScores())
+
+    benchmark.extra_info['frames'] = PLAY_FRAMES
+    benchmark.pedantic(play, rounds=5)
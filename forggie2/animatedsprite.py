@@ -1,130 +1,139 @@
 """Animated sprite."""
 import os
-import copy
-import configparser
 import pygame
 
 import loaders
+from clock import WALL_CLOCK
 
-# Amount of frames in animated sprite.
-MAX_FRAME_COUNT = 5
 
+# Frames shared by all sprites of the same animation:
+# (AnimationConfig, image directory, rotate) -> AnimationFrames.
+ANIMATION_CACHE = {}
 
-class AnimatedSprite(pygame.sprite.Sprite):
-    """Class to show animated sprite."""
 
-    def __init__(self, configPath, configDir, imageDir, position, rotate=None,
-                 isActive=False):
-        """Initialize sprite used to show info data.
+class AnimationFrames:
+    """Frame surfaces, times and move distances of one animation."""
+
+    __slots__ = ('frames', 'frameTimes', 'distances', 'frameCount',
+                 'imageSize', 'collisionSize', 'horizontalMargin',
+                 'verticalMargin')
+
+    def __init__(self, animationConfig, imageDir, rotate=None):
+        """Cut frames out of the animation image.
 
         Args:
-            configPath:   Relative path to the animation configuration file.
-            position:     Tuple with x and y coordinates of the top left
-                          corner of the image to be placed on the screen.
-            frameRate:    Max frame rate limit for the application.
-            rotate:       Angle in degrees to rotate the image. Positive
-                          values will rotate counterclockwise, negative -
-                          clockwise. Float.
-            isActive:     Boolean value that indicates if animation should be
-                          running.
-            configDir:    Game settings directory. String.
-            imageDir:     Image directory. String.
+            animationConfig: Animation configuration.
+                             configregistry.AnimationConfig record.
+            imageDir:        Image directory. String.
+            rotate:          Angle in degrees to rotate the frames. Float.
         """
-        pygame.sprite.Sprite.__init__(self)
+        imagePath = os.path.join(imageDir, animationConfig.filename)
+        frameWidth, frameHeight = animationConfig.frameSize
+        collWidth, collHeight = animationConfig.collisionFrameSize
 
-        self.configPath = configPath
-        self.configDir = configDir
-        self.imageDir = imageDir
+        loadedImage, rect = loaders.loadImage(
+            imagePath, useAlpha=animationConfig.useAlpha)
 
-        # Load animation configuration.
-        config = configparser.ConfigParser()
-        config.read(os.path.join(self.configDir, configPath))
+        # Sprite rect covers the whole animation image.
+        self.imageSize = rect.size
+        self.collisionSize = (collWidth, collHeight)
+        self.horizontalMargin = int((frameWidth - collWidth) / 2)
+        self.verticalMargin = int((frameHeight - collHeight) / 2)
 
-        generalCfg = config['general']
-        animationCfg = config['animation']
-        useAlpha = generalCfg.getboolean('useAlphaChannel', False)
+        frames = []
+        distances = []
+        for frameConfig in animationConfig.frames:
+            # Frame's area inside an image.
+            value = loadedImage.subsurface(pygame.Rect(frameConfig.area))
+            if rotate is not None:
+                value = pygame.transform.rotate(value, rotate)
 
-        imageFile = generalCfg['filename']
-        imagePath = os.path.join(self.imageDir, imageFile)
+            frames.append(value)
 
-        values = animationCfg.get('frameSize').split(',')
-        frameWidth = int(values[0])
-        frameHeight = int(values[1])
+            if isinstance(frameConfig.distance, int):
+                distances.append(frameConfig.distance)
 
-        values = animationCfg.get('collisionFrameSize', '0,0').split(',')
-        collWidth = int(values[0])
-        collHeight = int(values[1])
+        self.frames = tuple(frames)
+        self.frameTimes = tuple(frameConfig.time
+                                for frameConfig in animationConfig.frames)
+        self.distances = tuple(distances)
+        self.frameCount = len(self.frames)
 
-        framesConfig = {}
-        for i in range(1, MAX_FRAME_COUNT + 1, 1):
-            # Get X and Y coordinates of the top left corner of the frame.
-            name = 'frame' + str(i)
-            try:
-                frameXY = animationCfg.get(name).split(',')
-                frameTime = animationCfg[name + 'Time']
-                dist = animationCfg.get(name + 'MoveDistance')
 
-            except AttributeError:
-                continue
+def animationFrames(animationConfig, imageDir, rotate=None):
+    """Return cached frames of the animation, cutting them on the first call.
 
-            coordX = int(frameXY[0])
-            coordY = int(frameXY[1])
+    Args:
+        animationConfig: Animation configuration.
+                         configregistry.AnimationConfig record.
+        imageDir:        Image directory. String.
+        rotate:          Angle in degrees to rotate the frames. Float.
 
-            framesConfig[i] = {'frame': (coordX, coordY, frameWidth,
-                                         frameHeight),
-                               'time': int(frameTime),
-                               }
+    Returns:
+        AnimationFrames object shared by all callers.
+    """
+    key = (animationConfig, os.path.normpath(imageDir), rotate)
+    frames = ANIMATION_CACHE.get(key)
+    if frames is None:
+        frames = ANIMATION_CACHE[key] = AnimationFrames(animationConfig,
+                                                        imageDir, rotate)
 
-            # Not all animated sprites move, so not all have 'distance'.
-            if dist is not None:
-                framesConfig[i]['distance'] = int(dist)
+    return frames
 
-        self.loadedImage, self.rect = loaders.loadImage(imagePath,
-                                                        useAlpha=useAlpha)
-        self.rect.topleft = position
 
-        # Set collision rect to correct position.
-        self.horizontalMargin = int((frameWidth - collWidth) / 2)
-        self.verticalMargin = int((frameHeight - collHeight) / 2)
+class AnimatedSprite(pygame.sprite.Sprite):
+    """Class to show animated sprite.
 
-        self.collisionRect = pygame.Rect(position[0] + self.horizontalMargin,
-                                         position[1] + self.verticalMargin,
-                                         collWidth, collHeight)
-
-        self.frames = []
-        self.frameTimes = []
-        self.distances = []
-        for i in range(1, MAX_FRAME_COUNT + 1, 1):
-            try:
-                config = framesConfig[i]
-            except KeyError:
-                # We don't know how many frames are present, so it will fail
-                # when asked for non-existend frame.
-                continue
+    Frames are shared with other sprites of the same animation (see
+    animationFrames()), sprite keeps only its position and playback state.
+    """
 
-            # Frame's area inside an image.
-            cfg = config['frame']
-            area = pygame.Rect(cfg[0], cfg[1], cfg[2], cfg[3])
-            value = self.loadedImage.subsurface(area)
-            if rotate is not None:
-                value = pygame.transform.rotate(value, rotate)
+    def __init__(self, animationConfig, imageDir, position, rotate=None,
+                 isActive=False, clock=None):
+        """Initialize sprite used to show info data.
 
-            name = 'image' + str(i)
-            setattr(self, name, value)
+        Args:
+            animationConfig: Animation configuration.
+                             configregistry.AnimationConfig record.
+            imageDir:        Image directory. String.
+            position:        Tuple with x and y coordinates of the top left
+                             corner of the image to be placed on the screen.
+            rotate:          Angle in degrees to rotate the image. Positive
+                             values will rotate counterclockwise, negative -
+                             clockwise. Float.
+            isActive:        Boolean value that indicates if animation should
+                             be running.
+            clock:           Clock to time animation frames with. Object
+                             with now() method. None - real time clock.
+        """
+        pygame.sprite.Sprite.__init__(self)
 
-            self.frames.append(getattr(self, name))
-            self.frameTimes.append(config['time'])
+        self.animationConfig = animationConfig
+        self.imageDir = imageDir
+        self.clock = clock or WALL_CLOCK
 
-            distance = config.get('distance')
-            if isinstance(distance, int):
-                self.distances.append(distance)
+        shared = animationFrames(animationConfig, imageDir, rotate)
+
+        self.rect = pygame.Rect(position, shared.imageSize)
+
+        # Set collision rect to correct position.
+        self.horizontalMargin = shared.horizontalMargin
+        self.verticalMargin = shared.verticalMargin
+
+        self.collisionRect = pygame.Rect(position[0] + self.horizontalMargin,
+                                         position[1] + self.verticalMargin,
+                                         *shared.collisionSize)
+
+        # Shared tuples, never changed by the sprite.
+        self.frames = shared.frames
+        self.frameTimes = shared.frameTimes
+        self.distances = shared.distances
+        self.frameCount = shared.frameCount
 
-        self.frameCount = len(self.frames)
         self.currentFrame = -1
-        self.image = self.frames[self.currentFrame]
         self.currentFrameTime = self.frameTimes[self.currentFrame]
 
-        self.currentFrameStart = pygame.time.get_ticks()
+        self.currentFrameStart = self.clock.now()
 
         self.image = self.frames[self.currentFrame]
 
@@ -140,7 +149,7 @@ class AnimatedSprite(pygame.sprite.Sprite):
         self.moveDistance = 0
 
         self.debug = False
-        self.currentCycleDistances = copy.copy(self.distances)
+        self.currentCycleDistances = list(self.distances)
 
     def setPosition(self, position):
         """Set animation's position.
@@ -160,7 +169,7 @@ class AnimatedSprite(pygame.sprite.Sprite):
         if not self.isActive:
             return
 
-        now = pygame.time.get_ticks()
+        now = self.clock.now()
         frameTime = now - self.currentFrameStart
 
         if frameTime >= self.currentFrameTime:
@@ -169,11 +178,11 @@ class AnimatedSprite(pygame.sprite.Sprite):
             if self.currentFrame == self.frameCount - 1:
                 self.cyclesDone += 1
                 self.currentFrame = -1
-                self.currentCycleDistances = copy.copy(self.distances)
+                self.currentCycleDistances = list(self.distances)
                 if self.cyclesDone == self.cycles:
                     self.isActive = False
 
-            self.currentFrameStart = pygame.time.get_ticks()
+            self.currentFrameStart = now
             self.currentFrameTime = self.frameTimes[self.currentFrame]
             self.image = self.frames[self.currentFrame]
 
@@ -188,7 +197,22 @@ class AnimatedSprite(pygame.sprite.Sprite):
         self.isActive = False
         self.currentFrame = -1
         self.image = self.frames[self.currentFrame]
-        self.currentCycleDistances = copy.copy(self.distances)
+        self.currentCycleDistances = list(self.distances)
+
+    def resetState(self, position):
+        """Put the sprite back to the state it was created in.
+
+        Args:
+            position: Tuple with X and Y coordinates of the top left corner
+                      of the animation.
+        """
+        self.setPosition(position)
+        self.resetAnimation()
+        self.currentFrameTime = self.frameTimes[self.currentFrame]
+        self.currentFrameStart = self.clock.now()
+        self.cycles = None
+        self.cyclesDone = 0
+        self.moveDistance = 0
 
     def startAnimation(self, cycles=-1):
         """Fix the start time of the first animation frame.
@@ -200,4 +224,4 @@ class AnimatedSprite(pygame.sprite.Sprite):
         self.cycles = cycles
         self.cyclesDone = 0
         self.isActive = True
-        self.currentFrameStart = pygame.time.get_ticks()
+        self.currentFrameStart = self.clock.now()
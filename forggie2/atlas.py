@@ -0,0 +1,153 @@
+"""Texture atlas of car, car shadow and floater images.
+
+All vehicle images, and their copies rotated by 180 degrees, are packed into
+one surface. Sprites use subsurfaces of it instead of owning their own
+(rotated) copies of the images.
+"""
+import os
+
+import pygame
+
+import loaders
+from configregistry import REGISTRY
+
+# Width of the atlas surface in pixels.
+ATLAS_WIDTH = 512
+
+# Empty pixels between packed images.
+PADDING = 1
+
+# Game configuration file listing the levels whose vehicles are packed.
+GAME_CONFIG_NAME = 'game.conf'
+
+# Atlases of the vehicle images: configuration directory -> SpriteAtlas.
+VEHICLE_ATLASES = {}
+
+
+def copyPixels(image):
+    """Return copy of the image with per pixel alpha and the same pixels."""
+    size = image.get_size()
+    return pygame.image.frombytes(pygame.image.tobytes(image, 'RGBA'), size,
+                                  'RGBA')
+
+
+class SpriteAtlas:
+    """Images packed into one surface in rows (shelves) of similar height."""
+
+    def __init__(self, images, width=ATLAS_WIDTH):
+        """Pack images.
+
+        Args:
+            images: Dict key -> Surface object. Key is (image name, rotated)
+                    tuple for vehicle atlases.
+            width:  Width of the atlas surface in pixels. Integer.
+        """
+        # Tallest images first, so shelves waste little height.
+        order = sorted(images, key=lambda key: (-images[key].get_height(),
+                                                 str(key)))
+
+        # Key -> Rect of the image in the atlas.
+        self.rects = {}
+        posX = posY = shelfHeight = 0
+        for key in order:
+            imageWidth, imageHeight = images[key].get_size()
+            if imageWidth > width:
+                raise ValueError(f'Image {key} is wider than the atlas.')
+
+            if posX + imageWidth > width:
+                posX = 0
+                posY += shelfHeight + PADDING
+                shelfHeight = 0
+
+            self.rects[key] = pygame.Rect(posX, posY, imageWidth, imageHeight)
+            posX += imageWidth + PADDING
+            shelfHeight = max(shelfHeight, imageHeight)
+
+        surface = pygame.Surface((width, posY + shelfHeight), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        for key, rect in self.rects.items():
+            # Max of the pixels and the transparent black atlas is an exact
+            # copy, unlike alpha blending.
+            surface.blit(copyPixels(images[key]), rect,
+                         special_flags=pygame.BLEND_RGBA_MAX)
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        self.surface = surface
+
+        # Key -> subsurface. Shared by all sprites, must not be drawn on.
+        self.images = {key: surface.subsurface(rect)
+                       for key, rect in self.rects.items()}
+
+    def get(self, key):
+        """Return image packed under the key. Subsurface object."""
+        return self.images[key]
+
+
+def vehicleImages(configDir):
+    """Return names of car, car shadow and floater images of the game levels.
+
+    Images of the cars and floaters referenced by the levels of game.conf are
+    returned, whatever their configuration files are named.
+
+    Args:
+        configDir: Game settings directory. String.
+    """
+    gamePath = os.path.join(configDir, GAME_CONFIG_NAME)
+    if not os.path.exists(gamePath):
+        return []
+
+    names = []
+    for levelName in REGISTRY.game(gamePath).levels:
+        levelConfig = REGISTRY.level(os.path.join(configDir, levelName))
+        for track in levelConfig.tracks:
+            for carConfig in track.objects:
+                names += [carConfig.image, carConfig.shadowImage]
+
+        for track in levelConfig.riverTracks:
+            names += [floaterConfig.image for floaterConfig in track.objects]
+
+    return list(dict.fromkeys(names))
+
+
+def vehicleAtlas(configDir):
+    """Return atlas of all vehicle images, building it on the first call.
+
+    Keys are (image name, rotated) tuples, rotated images are turned by 180
+    degrees.
+
+    Args:
+        configDir: Game settings directory. String.
+    """
+    configDir = os.path.normpath(os.path.abspath(configDir))
+    atlas = VEHICLE_ATLASES.get(configDir)
+    if atlas is None:
+        images = {}
+        for name in vehicleImages(configDir):
+            image, _ = loaders.loadImage(name, useAlpha=True)
+            images[(name, False)] = image
+            images[(name, True)] = pygame.transform.rotate(image, 180)
+
+        atlas = VEHICLE_ATLASES[configDir] = SpriteAtlas(images)
+
+    return atlas
+
+
+def vehicleImage(config, name, rotated=False):
+    """Return vehicle image from the atlas of the configuration directory.
+
+    Args:
+        config:  CarConfig or FloaterConfig record the image belongs to.
+        name:    Image name. String.
+        rotated: Return the image rotated by 180 degrees. Boolean.
+    """
+    atlas = vehicleAtlas(os.path.dirname(config.path))
+    image = atlas.images.get((name, rotated))
+    if image is None:
+        # Image of a configuration file from elsewhere.
+        image, _ = loaders.loadImage(name, useAlpha=True)
+        if rotated:
+            image = pygame.transform.rotate(image, 180)
+
+    return image
@@ -0,0 +1,546 @@
+"""Many copies of a level simulated together with numpy.
+
+BatchFroggieEnv keeps cars, floaters and frogs of N independent level
+instances in arrays of shape (N, objects) and (N,) and advances all of them
+with one vectorized step per tick. Rules are the same as in Simulation with
+Car, Floater, Frog and AnimatedSprite objects, so an instance behaves like a
+FroggieEnv episode given the same car positions.
+"""
+import os
+
+import numpy as np
+
+from clock import DEFAULT_FRAME_RATE
+from level import Level
+from traffic import TrafficEngine, CAR_WRAP_MARGIN, CAR_WRAP_GAP
+from env import CONFIG_DIR, IMAGE_DIR, ACTION_NAMES, GRID_CELL_SIZE
+from env import GRID_CARS, GRID_FLOATERS, GRID_FROG, GRID_CHANNELS
+from env import OBSERVATION_GRID, MAX_EPISODE_STEPS
+from env import REWARD_COMPLETED, REWARD_DIED, REWARD_PROGRESS
+
+# Actions accepted by BatchFroggieEnv.step(), the same as FroggieEnv's.
+ACTION_NOOP = ACTION_NAMES.index('noop')
+ACTION_UP = ACTION_NAMES.index('up')
+ACTION_DOWN = ACTION_NAMES.index('down')
+ACTION_LEFT = ACTION_NAMES.index('left')
+ACTION_RIGHT = ACTION_NAMES.index('right')
+
+# Frog jump animations: Frog attribute names and the direction of the move.
+FROG_ANIMATIONS = (('jumpUpAnim', ACTION_UP),
+                   ('jumpDownAnim', ACTION_DOWN),
+                   ('jumpUpLeftAnim', ACTION_LEFT),
+                   ('jumpDownLeftAnim', ACTION_LEFT),
+                   ('jumpUpRightAnim', ACTION_RIGHT),
+                   ('jumpDownRightAnim', ACTION_RIGHT))
+
+# Animation started by an action: [action, isFacingUp] -> index in
+# FROG_ANIMATIONS. Up and down do not depend on the facing.
+START_ANIMATION = np.array([[-1, -1], [0, 0], [1, 1], [3, 2], [5, 4]])
+
+
+def overlap(left, top, width, height, rectLeft, rectTop, rectWidth,
+            rectHeight):
+    """Vectorized pygame.Rect.colliderect().
+
+    Arguments are numbers or broadcastable numpy arrays.
+    """
+    return ((left < rectLeft + rectWidth) & (rectLeft < left + width)
+            & (top < rectTop + rectHeight) & (rectTop < top + height)
+            & (width > 0) & (height > 0) & (rectWidth > 0)
+            & (rectHeight > 0))
+
+
+class BatchFroggieEnv:
+    """N copies of one level, one frog life per episode.
+
+    Finished instances are reset automatically inside step(), the way
+    vectorized Gym environments do it.
+    """
+
+    def __init__(self, level, count, configDir=CONFIG_DIR,
+                 imageDir=IMAGE_DIR, screenWidth=600, screenHeight=800,
+                 observation=OBSERVATION_GRID, cellSize=GRID_CELL_SIZE,
+                 maxSteps=MAX_EPISODE_STEPS, frameRate=DEFAULT_FRAME_RATE,
+                 seed=None):
+        """Initialize environment.
+
+        Args:
+            level:        Level configuration file name or path. String.
+            count:        Amount of level instances. Integer.
+            configDir:    Game settings directory. String.
+            imageDir:     Image directory. String.
+            screenWidth:  Screen width in pixels. Integer.
+            screenHeight: Screen height in pixels. Integer.
+            observation:  OBSERVATION_GRID - lane occupancy grids, None - no
+                          observations (for statistics only).
+            cellSize:     Size of the occupancy grid cell in pixels. Integer.
+            maxSteps:     Steps after which an episode is stopped. Integer.
+            frameRate:    Simulated frames per second. Integer.
+            seed:         Seed of the random car positions. Integer.
+        """
+        if observation not in (OBSERVATION_GRID, None):
+            raise ValueError(f"Unknown observation type '{observation}'.")
+
+        self.count = count
+        self.screenWidth = screenWidth
+        self.screenHeight = screenHeight
+        self.observation = observation
+        self.cellSize = cellSize
+        self.maxSteps = maxSteps
+        self.frameRate = frameRate
+        self.rng = np.random.default_rng(seed)
+
+        self.gridShape = (count, GRID_CHANNELS,
+                          -(-screenHeight // cellSize),
+                          -(-screenWidth // cellSize))
+
+        # Lanes, sizes and starting positions are taken from one level
+        # loaded the usual way from the level?.conf track sections.
+        template = Level(configDir, imageDir, screenWidth, screenHeight,
+                         seed=seed)
+        template.load(os.path.join(configDir, level))
+        self.loadTraffic(template)
+        self.loadFrog(template)
+
+        self.reset()
+
+    def loadTraffic(self, template):
+        """Copy car and floater lanes of the level.
+
+        Args:
+            template: Loaded level. Level object.
+        """
+        engine = TrafficEngine(template.cars, template.floaters,
+                               self.screenWidth)
+
+        # Values which are the same in every instance. Shape (objects,).
+        self.objectCount = len(engine.sprites)
+        self.isCar = engine.isCar
+        self.startX = engine.x.copy()
+        self.width = engine.width
+        self.speed = engine.speed
+        self.roadTop = engine.roadTop
+        self.startTopGap = engine.roadTopGap.copy()
+        self.freeVerticalSpace = engine.freeVerticalSpace
+        self.crMarginLeft = engine.crMarginLeft
+        self.crMarginTop = engine.crMarginTop
+        self.collisionWidth = engine.collisionWidth
+        self.collisionHeight = engine.collisionHeight
+        self.carToLeft = engine.carToLeft
+        self.carToRight = engine.carToRight
+        self.floaterToLeft = engine.floaterToLeft
+        self.floaterToRight = engine.floaterToRight
+
+        # Only these get a random distance from the top of the road.
+        self.randomTopGap = self.isCar.copy()
+
+        shape = (self.count, self.objectCount)
+        self.x = np.zeros(shape, dtype=np.int64)
+        self.y = np.zeros(shape, dtype=np.int64)
+        self.roadTopGap = np.zeros(shape, dtype=np.int64)
+        self.collisionX = np.zeros(shape, dtype=np.int64)
+        self.collisionY = np.zeros(shape, dtype=np.int64)
+
+        rivers = template.riverTrackRects
+        self.riverTop = np.array([r.top for r in rivers], dtype=np.int64)
+        self.riverHeight = np.array([r.height for r in rivers],
+                                    dtype=np.int64)
+        self.riverSpeed = np.array(
+            [-t.speed if t.direction == 'to_left' else t.speed
+             for t in template.riverTracks], dtype=np.int64)
+
+        self.finishRect = template.finishImage.collisionRect.copy()
+
+    def loadFrog(self, template):
+        """Copy frog jump animations of the level.
+
+        Args:
+            template: Loaded level. Level object.
+        """
+        frog = template.frog
+        animations = [getattr(frog, name) for name, _ in FROG_ANIMATIONS]
+
+        for anim in animations:
+            if any(anim.frameTimes):
+                raise ValueError(f"Frames of '{anim.animationConfig.path}' "
+                                 f"must be shown for a single tick.")
+
+        startAnim = frog.jumpUpAnim
+        self.frogStart = startAnim.collisionRect.topleft
+        self.frogWidth, self.frogHeight = startAnim.collisionRect.size
+        self.frogMargin = startAnim.horizontalMargin
+        self.frogPosY = template.frogPosY
+
+        # Per animation tables. Shape (animations,) and (animations, frames).
+        self.animDirection = np.array([d for _, d in FROG_ANIMATIONS])
+        self.animFrameCount = np.array([a.frameCount for a in animations])
+        self.animWidth = np.array([a.rect.width for a in animations])
+        maxFrames = self.animFrameCount.max()
+        self.animDistances = np.zeros((len(animations), maxFrames),
+                                      dtype=np.int64)
+        for idx, anim in enumerate(animations):
+            distances = anim.distances or [0] * anim.frameCount
+            self.animDistances[idx, :len(distances)] = distances
+
+        count = self.count
+        self.frogX = np.zeros(count, dtype=np.int64)
+        self.frogY = np.zeros(count, dtype=np.int64)
+        self.frogAnim = np.zeros(count, dtype=np.int64)
+        self.frogFrame = np.zeros(count, dtype=np.int64)
+        self.frogActive = np.zeros(count, dtype=bool)
+        self.frogFacingUp = np.zeros(count, dtype=bool)
+
+        # AnimatedSprite.moveDistance of every animation of every frog.
+        self.frogMoveDistance = np.zeros((count, len(animations)),
+                                         dtype=np.int64)
+
+        self.ticks = np.zeros(count, dtype=np.int64)
+        self.steps = np.zeros(count, dtype=np.int64)
+        self.levelTime = np.zeros(count, dtype=np.int64)
+        self.bestTop = np.zeros(count, dtype=np.int64)
+
+    def reset(self, instances=None):
+        """Start new episodes.
+
+        Args:
+            instances: Boolean mask of instances to reset. None - all.
+
+        Returns:
+            Observations of all instances.
+        """
+        if instances is None:
+            instances = np.ones(self.count, dtype=bool)
+
+        self.resetInstances(instances)
+        return self.observe()
+
+    def resetInstances(self, instances):
+        """Put traffic and frogs of the given instances to the start.
+
+        Args:
+            instances: Boolean mask of instances to reset.
+        """
+        count = int(instances.sum())
+        if not count:
+            return
+
+        # Car placement as in Car.calcPositions().
+        gaps = np.broadcast_to(self.startTopGap,
+                               (count, self.objectCount)).copy()
+        randomGaps = self.randomGap(count)
+        gaps[:, self.randomTopGap] = randomGaps[:, self.randomTopGap]
+
+        x = np.broadcast_to(self.startX, gaps.shape)
+        y = self.roadTop + gaps
+        self.roadTopGap[instances] = gaps
+        self.x[instances] = x
+        self.y[instances] = y
+
+        # Collision rects of freshly placed objects have X and Y swapped
+        # until the first step (see Car.calcPositions()).
+        self.collisionX[instances] = y + self.crMarginTop
+        self.collisionY[instances] = x + self.crMarginLeft
+
+        self.frogX[instances], self.frogY[instances] = self.frogStart
+        self.frogAnim[instances] = 0
+        self.frogFrame[instances] = -1
+        self.frogActive[instances] = False
+        self.frogFacingUp[instances] = True
+        self.frogMoveDistance[instances] = 0
+
+        self.ticks[instances] = 0
+        self.steps[instances] = 0
+        self.levelTime[instances] = 0
+        self.bestTop[instances] = self.frogStart[1]
+
+    def randomGap(self, count):
+        """Return random distances of objects from the top of their roads.
+
+        Args:
+            count: Amount of instances. Integer.
+
+        Returns:
+            Integer array of shape (count, objects).
+        """
+        high = np.maximum(self.freeVerticalSpace, 2)
+        return self.rng.integers(2, high + 1,
+                                 size=(count, self.objectCount))
+
+    def stepTraffic(self):
+        """Move cars and floaters of all instances (TrafficEngine.step())."""
+        x = self.x
+        x += self.speed
+        right = x + self.width
+        width = self.screenWidth
+
+        carLeft = self.carToLeft & (x <= -CAR_WRAP_MARGIN)
+        x[carLeft] += CAR_WRAP_MARGIN + CAR_WRAP_GAP + width
+
+        carRight = self.carToRight & (right >= width + CAR_WRAP_MARGIN)
+        x[carRight] -= CAR_WRAP_MARGIN + CAR_WRAP_GAP + width
+
+        floaterLeft = self.floaterToLeft & (right < 0)
+        x[floaterLeft] = width
+
+        floaterRight = self.floaterToRight & (x > width)
+        x[floaterRight] = np.broadcast_to(-self.width, x.shape)[floaterRight]
+
+        wrapped = carLeft | carRight | floaterLeft | floaterRight
+        if wrapped.any():
+            self.y[wrapped] = (self.roadTop + self.roadTopGap)[wrapped]
+
+            # Cars moving to the right get a new random distance from the
+            # top of the road for the next time they appear.
+            _, objects = np.nonzero(carRight)
+            if objects.size:
+                high = np.maximum(self.freeVerticalSpace[objects], 2)
+                self.roadTopGap[carRight] = self.rng.integers(2, high + 1)
+
+        np.add(x, self.crMarginLeft, out=self.collisionX)
+        np.add(self.y, self.crMarginTop, out=self.collisionY)
+
+    def collideFrogs(self, mask):
+        """Find objects each frog collides with.
+
+        Args:
+            mask: Boolean array selecting objects to check. Shape (objects,).
+
+        Returns:
+            Tuple (hit, index): boolean array telling if frog collides with
+            anything and index of the first colliding object among selected.
+        """
+        hits = overlap(self.collisionX[:, mask], self.collisionY[:, mask],
+                       self.collisionWidth[mask], self.collisionHeight[mask],
+                       self.frogX[:, None], self.frogY[:, None],
+                       self.frogWidth, self.frogHeight)
+        if not hits.shape[1]:
+            return hits.any(axis=1), np.zeros(len(hits), dtype=np.int64)
+
+        return hits.any(axis=1), hits.argmax(axis=1)
+
+    def driftFrogs(self, instances, speed):
+        """Move frogs standing on moving things (Frog.move()).
+
+        Args:
+            instances: Boolean mask of frogs to move.
+            speed:     Amount of pixels to move every frog. Integer array.
+        """
+        left = self.frogX - self.frogMargin
+        stripWidth = self.animWidth[self.frogAnim]
+
+        moved = left + speed
+        toLeft = speed <= 0
+        moved = np.where(toLeft & (left + speed <= 0), 0, moved)
+        moved = np.where(~toLeft & (left + stripWidth + speed
+                                    >= self.screenWidth),
+                         self.screenWidth - stripWidth, moved)
+
+        self.frogX = np.where(instances, moved + self.frogMargin, self.frogX)
+
+    def jumpFrogs(self, running):
+        """Move frogs by their current animation frame distance.
+
+        Args:
+            running: Boolean mask of frogs with running animations.
+        """
+        idx = np.arange(len(self.frogX))
+        anim = self.frogAnim
+        distance = self.frogMoveDistance[idx, anim]
+        direction = self.animDirection[anim]
+        x = self.frogX
+        y = self.frogY
+
+        # Frog.moveUp(), moveDown(), moveLeft() and moveRight().
+        up = running & (direction == ACTION_UP)
+        newY = np.where(y - distance <= 0, 0, y - distance)
+        y = np.where(up, newY, y)
+
+        down = running & (direction == ACTION_DOWN)
+        bottom = y + self.frogHeight + distance
+        newY = np.where(bottom >= self.screenHeight,
+                        self.screenHeight - self.frogHeight, y + distance)
+        y = np.where(down, newY, y)
+
+        left = running & (direction == ACTION_LEFT)
+        newX = np.where(x - distance <= 0, 0, x - distance)
+        x = np.where(left, newX, x)
+
+        right = running & (direction == ACTION_RIGHT)
+        newX = np.where(x + self.frogWidth + distance >= self.screenWidth,
+                        self.screenWidth - self.frogWidth, x + distance)
+        x = np.where(right, newX, x)
+
+        self.frogX = x
+        self.frogY = y
+
+        # AnimatedSprite.update(): show the next frame.
+        frame = self.frogFrame + 1
+        cycleDone = running & (frame == self.animFrameCount[anim] - 1)
+        frame = np.where(cycleDone, -1, frame)
+        self.frogFrame = np.where(running, frame, self.frogFrame)
+        self.frogActive &= ~cycleDone
+
+        # Frame -1 is the last frame of the animation.
+        frame = np.where(self.frogFrame < 0, self.animFrameCount[anim] - 1,
+                         self.frogFrame)
+        nextDistance = self.animDistances[anim, frame]
+        self.frogMoveDistance[idx[running], anim[running]] = \
+            nextDistance[running]
+
+    def stepFrogs(self, actions, hitByCars, onFloater, floaterIdx, inRiver,
+                  riverIdx):
+        """Update frogs of all instances (Frog.update()).
+
+        Returns:
+            Boolean array of frogs killed or drowned during the step.
+        """
+        down = hitByCars | (inRiver & ~onFloater)
+
+        floaterSpeed = self.speed[~self.isCar]
+        if floaterSpeed.size:
+            self.driftFrogs(onFloater, floaterSpeed[floaterIdx])
+
+        if self.riverSpeed.size:
+            self.driftFrogs(inRiver & ~onFloater, self.riverSpeed[riverIdx])
+
+        # Start a new jump if the previous one has finished.
+        start = ~self.frogActive & ~down & (actions != ACTION_NOOP)
+        anim = START_ANIMATION[actions, self.frogFacingUp.astype(np.int64)]
+        self.frogAnim = np.where(start, anim, self.frogAnim)
+        self.frogFacingUp = np.where(start & (actions == ACTION_UP), True,
+                                     self.frogFacingUp)
+        self.frogFacingUp = np.where(start & (actions == ACTION_DOWN), False,
+                                     self.frogFacingUp)
+        self.frogActive |= start
+
+        self.jumpFrogs(self.frogActive & ~down)
+
+        return down
+
+    def detectCollisions(self):
+        """Find what every frog collides with.
+
+        Returns:
+            Tuple of arrays (hitByCars, onFloater, floaterIdx, inRiver,
+            riverIdx, completed). Index arrays tell the first floater or
+            river track the frog is on.
+        """
+        hitByCars, _ = self.collideFrogs(self.isCar)
+        onFloater, floaterIdx = self.collideFrogs(~self.isCar)
+
+        rivers = overlap(0, self.riverTop, self.screenWidth,
+                         self.riverHeight, self.frogX[:, None],
+                         self.frogY[:, None], self.frogWidth,
+                         self.frogHeight)
+        inRiver = rivers.any(axis=1)
+        if rivers.shape[1]:
+            riverIdx = rivers.argmax(axis=1)
+        else:
+            riverIdx = np.zeros(len(rivers), dtype=np.int64)
+
+        finish = self.finishRect
+        completed = overlap(self.frogX, self.frogY, self.frogWidth,
+                            self.frogHeight, finish.left, finish.top,
+                            finish.width, finish.height)
+
+        return hitByCars, onFloater, floaterIdx, inRiver, riverIdx, completed
+
+    def step(self, actions):
+        """Advance all instances by one tick.
+
+        Args:
+            actions: Index in ACTIONS for every instance. Integer array of
+                     shape (N,).
+
+        Returns:
+            Tuple (observations, rewards, dones, info). info is a dict of
+            arrays describing finished episodes before they were reset:
+            'completed', 'died', 'levelTime' (miliseconds) and 'steps'.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+
+        # Collisions are checked against positions shown in the previous
+        # frame, like in Simulation.step().
+        collisions = self.detectCollisions()
+        completed = collisions[-1]
+
+        self.stepTraffic()
+        died = self.stepFrogs(actions, *collisions[:-1])
+
+        # TickClock.tick() of every instance.
+        elapsed = ((self.ticks + 1) * 1000 // self.frameRate
+                   - self.ticks * 1000 // self.frameRate)
+        self.ticks += 1
+        self.steps += 1
+        self.levelTime += np.where(died, 0, elapsed)
+
+        rewards = np.zeros(self.count)
+        progress = self.bestTop - self.frogY
+        better = progress > 0
+        rewards[better] += (REWARD_PROGRESS * progress[better]
+                            / self.frogPosY)
+        self.bestTop = np.where(better, self.frogY, self.bestTop)
+        rewards[died] += REWARD_DIED
+        rewards[completed] += REWARD_COMPLETED
+
+        dones = died | completed | (self.steps >= self.maxSteps)
+        info = {'completed': completed,
+                'died': died,
+                'levelTime': self.levelTime.copy(),
+                'steps': self.steps.copy()}
+
+        self.resetInstances(dones)
+
+        return self.observe(), rewards, dones, info
+
+    def observe(self):
+        """Return observations of all instances."""
+        if self.observation is None:
+            return None
+
+        return self.occupancyGrids()
+
+    def occupancyGrids(self):
+        """Return lane occupancy grids of all instances.
+
+        Returns:
+            Numpy uint8 array of shape (N, GRID_CHANNELS, rows, columns),
+            see FroggieEnv.occupancyGrid().
+        """
+        count, _, rows, columns = self.gridShape
+        cell = self.cellSize
+
+        channel = np.append(np.where(self.isCar, GRID_CARS, GRID_FLOATERS),
+                            GRID_FROG)
+        left = np.column_stack((self.collisionX, self.frogX))
+        top = np.column_stack((self.collisionY, self.frogY))
+        width = np.append(self.collisionWidth, self.frogWidth)
+        height = np.append(self.collisionHeight, self.frogHeight)
+
+        visible = ((width > 0) & (height > 0)
+                   & (left < self.screenWidth) & (left + width > 0)
+                   & (top < self.screenHeight) & (top + height > 0))
+        col0 = np.clip(left // cell, 0, columns - 1)
+        col1 = np.clip((left + width - 1) // cell, 0, columns - 1)
+        row0 = np.clip(top // cell, 0, rows - 1)
+        row1 = np.clip((top + height - 1) // cell, 0, rows - 1)
+
+        # Columns covered by every rect. Shape (N, objects, columns).
+        cols = np.arange(columns)
+        covered = ((col0[..., None] <= cols) & (cols <= col1[..., None])
+                   & visible[..., None])
+
+        # Rows of the grid as one table: (instance, channel, row) -> row.
+        grid = np.zeros(self.gridShape, dtype=bool)
+        gridRows = grid.reshape(-1, columns)
+        base = (np.arange(count)[:, None] * GRID_CHANNELS + channel) * rows
+
+        # Every object is copied to its rows in all instances at once. Rows of
+        # one object never repeat among instances, so plain fancy indexing
+        # is enough. Rects cover only a few rows each.
+        for offset in range(int((row1 - row0).max(initial=0)) + 1):
+            rowIdx = base + np.minimum(row0 + offset, row1)
+            for obj in range(len(channel)):
+                gridRows[rowIdx[:, obj]] |= covered[:, obj]
+
+        return grid.view(np.uint8)
@@ -0,0 +1,254 @@
+"""Single file with all images and configuration files of the game.
+
+Bundle file layout:
+    magic b'FRGB', version (uint8), index length (uint32, little endian),
+    index (UTF-8 JSON), data blocks.
+
+Index maps file names to data blocks and keeps the size and modification
+time of the packed files:
+    {'images':  {name: [offset, width, height, format]},
+     'configs': {name: [offset, length]},
+     'sources': {'images':  {name: [size, mtime in nanoseconds]},
+                 'configs': {name: [size, mtime in nanoseconds]}}}
+
+Images are stored as raw pixels ('RGBA' or 'RGB' format of
+pygame.image.tobytes()), so surfaces are made straight from the memory mapped
+file without decoding. Configuration files are stored as text; they are
+parsed only once per process anyway (see configregistry), what costs is
+opening every file. A bundle whose files changed on disk since it was built
+is stale (see AssetBundle.staleFiles()).
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+
+import pygame
+
+MAIN_DIR = os.path.split(os.path.abspath(__file__))[0]
+CONFIG_DIR = os.path.join(MAIN_DIR, '..', 'configs')
+IMAGE_DIR = os.path.join(MAIN_DIR, '..', 'images')
+
+# Bundle the game looks for at start up.
+BUNDLE_PATH = os.path.join(MAIN_DIR, '..', 'assets.bundle')
+
+BUNDLE_MAGIC = b'FRGB'
+BUNDLE_VERSION = 2
+
+HEADER = struct.Struct('<4sBI')
+
+# Image data blocks start at offsets divisible by this.
+ALIGNMENT = 16
+
+
+def listFiles(directory, extension):
+    """Return sorted names of the files with the extension in directory."""
+    return sorted(name for name in os.listdir(directory)
+                  if name.endswith(extension))
+
+
+def fileStamp(path):
+    """Return [size, mtime in nanoseconds] of the file."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def buildBundle(path, imageDir=IMAGE_DIR, configDir=CONFIG_DIR):
+    """Pack all images and configuration files into a bundle.
+
+    Args:
+        path:      Path to the bundle file to write. String.
+        imageDir:  Image directory. String.
+        configDir: Game settings directory. String.
+
+    Returns:
+        Tuple (amount of images, amount of configuration files).
+    """
+    blocks = []
+    index = {'images': {}, 'configs': {},
+             'sources': {'images': {}, 'configs': {}}}
+    offset = 0
+
+    def addBlock(data):
+        nonlocal offset
+        padding = -offset % ALIGNMENT
+        blocks.append(b'\0' * padding + data)
+        start = offset + padding
+        offset = start + len(data)
+        return start
+
+    for name in listFiles(imageDir, '.png'):
+        imagePath = os.path.join(imageDir, name)
+        index['sources']['images'][name] = fileStamp(imagePath)
+        surface = pygame.image.load(imagePath)
+        if surface.get_flags() & pygame.SRCALPHA:
+            pixelFormat = 'RGBA'
+        else:
+            pixelFormat = 'RGB'
+
+        start = addBlock(pygame.image.tobytes(surface, pixelFormat))
+        width, height = surface.get_size()
+        index['images'][name] = [start, width, height, pixelFormat]
+
+    for name in listFiles(configDir, '.conf'):
+        configPath = os.path.join(configDir, name)
+        index['sources']['configs'][name] = fileStamp(configPath)
+        with open(configPath, 'rb') as configFile:
+            data = configFile.read()
+        index['configs'][name] = [addBlock(data), len(data)]
+
+    indexData = json.dumps(index, sort_keys=True).encode('utf-8')
+
+    # Data offsets in the index are counted from the first aligned byte
+    # after the index.
+    dataStart = HEADER.size + len(indexData)
+    padding = -dataStart % ALIGNMENT
+
+    with open(path, 'wb') as bundleFile:
+        bundleFile.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION,
+                                     len(indexData)))
+        bundleFile.write(indexData)
+        bundleFile.write(b'\0' * padding)
+        for block in blocks:
+            bundleFile.write(block)
+
+    return len(index['images']), len(index['configs'])
+
+
+class AssetBundle:
+    """Read only view of a bundle file mapped to memory."""
+
+    def __init__(self, path, imageDir=IMAGE_DIR, configDir=CONFIG_DIR):
+        """Open bundle.
+
+        Args:
+            path:      Path to the bundle file. String.
+            imageDir:  Directory the bundled images were taken from. String.
+            configDir: Directory the bundled configuration files were taken
+                       from. String.
+        """
+        self.path = path
+        self.imageDir = os.path.normpath(os.path.abspath(imageDir))
+        self.configDir = os.path.normpath(os.path.abspath(configDir))
+
+        with open(path, 'rb') as bundleFile:
+            # Copy on write mapping: surfaces made from it may be drawn on
+            # without changing the file.
+            self.data = mmap.mmap(bundleFile.fileno(), 0,
+                                  access=mmap.ACCESS_COPY)
+
+        try:
+            magic, version, indexLength = HEADER.unpack_from(self.data)
+        except struct.error as exc:
+            raise ValueError(f"Broken bundle '{path}'.") from exc
+
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise ValueError(f"'{path}' is not a bundle of this version.")
+
+        indexEnd = HEADER.size + indexLength
+        index = json.loads(self.data[HEADER.size:indexEnd].decode('utf-8'))
+        self.images = index['images']
+        self.configs = index['configs']
+        self.sources = index['sources']
+
+        self.dataStart = indexEnd + (-indexEnd % ALIGNMENT)
+        self.buffer = memoryview(self.data)
+
+    def staleFiles(self):
+        """Return paths of the packed files changed or removed since packing.
+
+        Files added to the directories later are not listed, they are read
+        from disk anyway.
+        """
+        stale = []
+        for directory, kind in ((self.imageDir, 'images'),
+                                (self.configDir, 'configs')):
+            for name, stamp in sorted(self.sources[kind].items()):
+                path = os.path.join(directory, name)
+                try:
+                    if fileStamp(path) != stamp:
+                        stale.append(path)
+                except OSError:
+                    stale.append(path)
+
+        return stale
+
+    def name(self, path, directory):
+        """Return name of the file inside directory or None."""
+        path = os.path.normpath(os.path.abspath(path))
+        if os.path.dirname(path) != directory:
+            return None
+
+        return os.path.basename(path)
+
+    def hasImage(self, path):
+        """Return True if the image is in the bundle."""
+        return self.name(path, self.imageDir) in self.images
+
+    def image(self, path):
+        """Return surface of the bundled image or None.
+
+        Surface shares memory with the mapped file, so the bundle must stay
+        open while it is used.
+
+        Args:
+            path: Path to the image file. String.
+        """
+        entry = self.images.get(self.name(path, self.imageDir))
+        if entry is None:
+            return None
+
+        offset, width, height, pixelFormat = entry
+        start = self.dataStart + offset
+        size = width * height * len(pixelFormat)
+        return pygame.image.frombuffer(self.buffer[start:start + size],
+                                       (width, height), pixelFormat)
+
+    def config(self, path):
+        """Return text of the bundled configuration file or None.
+
+        Args:
+            path: Path to the configuration file. String.
+        """
+        entry = self.configs.get(self.name(path, self.configDir))
+        if entry is None:
+            return None
+
+        offset, length = entry
+        start = self.dataStart + offset
+        return bytes(self.buffer[start:start + length]).decode('utf-8')
+
+    def close(self):
+        """Unmap the file. Surfaces made from it must not be used later."""
+        self.buffer.release()
+        self.data.close()
+
+
+def parseArgs(args):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Pack images and configuration files of forggie2 into '
+                    'a single bundle file.')
+    parser.add_argument('--output', default=BUNDLE_PATH,
+                        help='bundle file to write (default: %(default)s)')
+    parser.add_argument('--images', default=IMAGE_DIR,
+                        help='image directory (default: %(default)s)')
+    parser.add_argument('--configs', default=CONFIG_DIR,
+                        help='configuration directory (default: %(default)s)')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    """Entry point of the bundle build tool."""
+    options = parseArgs(sys.argv[1:] if args is None else args)
+    images, configs = buildBundle(options.output, options.images,
+                                  options.configs)
+    size = os.path.getsize(options.output)
+    print(f"Packed {images} images and {configs} configuration files into "
+          f"'{options.output}' ({size} bytes).")
+
+
+if __name__ == '__main__':
+    main()
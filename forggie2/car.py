@@ -1,23 +1,22 @@
 """Class defining car on the street."""
 import random
-import configparser
 
 import pygame
 
-import loaders
-from staticsprite import StaticImage
+from atlas import vehicleImage
 
 
 class Car(pygame.sprite.Sprite):
     """Traffic car."""
 
-    def __init__(self, configPath, roadDirection, screenWidth=0,
+    def __init__(self, carConfig, roadDirection, screenWidth=0,
                  screenHeight=0, roadTop=0, roadBottom=0, gapInFront=0,
-                 speed=0):
+                 speed=0, rng=None):
         """Initialize car object.
 
         Args:
-            configPath:    Path to the configuration file.
+            carConfig:     Car configuration. configregistry.CarConfig
+                           record.
             roadDirection: Direction in which all cars on the road should move.
                            'to_left' or 'to_right'.
             screenWidth:   Screen width in pixels. Integer.
@@ -27,20 +26,24 @@ class Car(pygame.sprite.Sprite):
             gapInFront:    Integer which specifies how many pixels to leave
                            in front of the car.
             speed:         Speed at which car is moving. Integer.
+            rng:           Random number generator placing the car on the
+                           road. random.Random object, usually shared by all
+                           cars of a level. None - the random module.
         """
         pygame.sprite.Sprite.__init__(self)
 
-        self.configPath = configPath
-        config = configparser.ConfigParser()
-        config.read(configPath)
+        self.configPath = carConfig.path
 
-        # Load car image.
-        path = config['general']['image']
-        self.image, self.rect = loaders.loadImage(path, useAlpha=True)
+        # Car image from the vehicle atlas, rotated if the car drives
+        # against its image.
+        self.image = vehicleImage(carConfig, carConfig.image,
+                                  rotated=roadDirection != carConfig.direction)
+        self.rect = self.image.get_rect()
 
-        # Load car shadow.
-        path = config['general']['shadow_image']
-        self.shadow = StaticImage(path, useAlpha=True)
+        # Car shadow, also from the atlas.
+        self.shadow = pygame.sprite.Sprite()
+        self.shadow.image = vehicleImage(carConfig, carConfig.shadowImage)
+        self.shadow.rect = self.shadow.image.get_rect()
 
         self.screenWidth = screenWidth
         self.screenHeight = screenHeight
@@ -56,18 +59,16 @@ class Car(pygame.sprite.Sprite):
 
         self.speed = speed
 
+        self.rng = rng or random
+
         self.direction = roadDirection
-        carDirection = config['general']['direction']
-        if roadDirection != carDirection:
-            self.image = pygame.transform.rotate(self.image, 180)
 
         self.carWidth = self.rect.width
 
-        cfg = config['general']
-        self.crMarginTop = cfg.getint('crMarginTop')
-        self.crMarginBottom = cfg.getint('crMarginBottom')
-        self.crMarginLeft = cfg.getint('crMarginLeft')
-        self.crMarginRight = cfg.getint('crMarginRight')
+        self.crMarginTop = carConfig.crMarginTop
+        self.crMarginBottom = carConfig.crMarginBottom
+        self.crMarginLeft = carConfig.crMarginLeft
+        self.crMarginRight = carConfig.crMarginRight
         self.collisionRect = pygame.Rect(
             self.rect.left + self.crMarginLeft,
             self.rect.top + self.crMarginTop,
@@ -95,7 +96,7 @@ class Car(pygame.sprite.Sprite):
 
     def calcPositions(self):
         """Calculate initial positions of car's sprites."""
-        self.roadTopGap = random.randint(2, self.freeVerticalSpace)
+        self.roadTopGap = self.rng.randint(2, self.freeVerticalSpace)
 
         # Place car on the road.
         if self.direction == 'to_left':
@@ -136,7 +137,7 @@ class Car(pygame.sprite.Sprite):
                 # other side of the screen.
                 self.rect.topleft = (-20 - self.carWidth - tmp,
                                      self.roadTop + self.roadTopGap)
-                self.roadTopGap = random.randint(2, self.freeVerticalSpace)
+                self.roadTopGap = self.rng.randint(2, self.freeVerticalSpace)
 
         self.collisionRect.topleft = (self.rect.left + self.crMarginLeft,
                                       self.rect.top + self.crMarginTop)
@@ -0,0 +1,90 @@
+"""Clocks telling animations and the level timer what time it is."""
+import pygame
+
+# Default amount of simulation steps per second.
+DEFAULT_FRAME_RATE = 24
+
+
+class WallClock:
+    """Real time clock (time since pygame.init())."""
+
+    def now(self):
+        """Return current time in miliseconds."""
+        return pygame.time.get_ticks()
+
+
+class TickClock:
+    """Deterministic clock advanced in fixed steps.
+
+    Time only changes when tick() is called, so anything driven by this
+    clock gives the same results no matter how fast simulation is run.
+    To run the simulation in real time, pass elapsed real time to
+    accumulate() and do as many steps as it returns.
+    """
+
+    def __init__(self, frameRate=DEFAULT_FRAME_RATE):
+        """Initialize clock.
+
+        Args:
+            frameRate: Amount of steps per second of simulated time. Integer.
+        """
+        self.frameRate = frameRate
+
+        # Amount of steps done.
+        self.ticks = 0
+
+        # Real time in miliseconds not yet consumed by the steps.
+        self.accumulator = 0
+
+    @property
+    def stepTime(self):
+        """Return nominal length of one step in miliseconds."""
+        return 1000 / self.frameRate
+
+    def now(self):
+        """Return simulated time in miliseconds. Integer."""
+        return self.ticks * 1000 // self.frameRate
+
+    def tick(self):
+        """Advance the clock by one step.
+
+        Returns:
+            Amount of miliseconds the step took. Integer. Sum of the results
+            is always equal to now().
+        """
+        before = self.now()
+        self.ticks += 1
+        return self.now() - before
+
+    def reset(self):
+        """Move the clock back to the start."""
+        self.ticks = 0
+        self.accumulator = 0
+
+    def accumulate(self, elapsed, maxSteps=None):
+        """Add elapsed real time and return amount of steps to run.
+
+        Args:
+            elapsed:  Real time passed since the last call in miliseconds.
+                      Number.
+            maxSteps: Max amount of steps to return. Time not covered by the
+                      returned steps is dropped if the limit is hit, so slow
+                      machines do not fall further and further behind.
+                      None - no limit. Integer.
+
+        Returns:
+            Amount of steps to run. Integer.
+        """
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.stepTime)
+        self.accumulator -= steps * self.stepTime
+
+        if maxSteps is not None and steps > maxSteps:
+            steps = maxSteps
+            self.accumulator = 0
+
+        return steps
+
+
+# Clock used by sprites not given a clock of their own.
+WALL_CLOCK = WallClock()
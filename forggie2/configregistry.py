@@ -0,0 +1,335 @@
+"""Registry of parsed configuration files.
+
+Every configuration file is parsed only once per process. Parsed data is kept
+in immutable records which are passed to object constructors instead of
+configuration file paths.
+"""
+import os
+import threading
+import collections
+import configparser
+
+import loaders
+
+# Max amount of frames in animated sprite.
+MAX_FRAME_COUNT = 5
+
+# Car track section configuration names from level?.conf files.
+TRACK_SECTIONS = ('track1', 'track2', 'track3', 'track4', 'track5')
+
+# Water object track section configuration names in level?.conf files.
+RIVER_SECTIONS = ('waterTrack1', 'waterTrack2', 'waterTrack3', 'waterTrack4',
+                  'waterTrack5')
+
+# Max amount of life crystals in [LifeIndicator] section of game.conf.
+MAX_LIFES = 10
+
+
+# Car configuration (car?.conf).
+CarConfig = collections.namedtuple('CarConfig', (
+    'path', 'image', 'shadowImage', 'direction', 'crMarginTop',
+    'crMarginBottom', 'crMarginLeft', 'crMarginRight'))
+
+# Floating object configuration (stuff?.conf).
+FloaterConfig = collections.namedtuple('FloaterConfig', (
+    'path', 'image', 'direction', 'crMarginTop', 'crMarginBottom',
+    'crMarginLeft', 'crMarginRight'))
+
+# Single animation frame: area is a tuple (x, y, width, height) inside the
+# animation image, time - miliseconds to show the frame, distance - pixels to
+# move the sprite while showing the frame (None for not moving animations).
+FrameConfig = collections.namedtuple('FrameConfig', (
+    'area', 'time', 'distance'))
+
+# Animation configuration (animation_*.conf, life_crystal.conf). frameSize and
+# collisionFrameSize are (width, height) tuples, frames - tuple of
+# FrameConfig records.
+AnimationConfig = collections.namedtuple('AnimationConfig', (
+    'path', 'filename', 'useAlpha', 'frameSize', 'collisionFrameSize',
+    'frames'))
+
+# Enabled car or river track of a level. objects - tuple of CarConfig or
+# FloaterConfig records, gaps - tuple of integers (one gap per object).
+TrackConfig = collections.namedtuple('TrackConfig', (
+    'section', 'top', 'bottom', 'direction', 'speed', 'objects', 'gaps'))
+
+# Level configuration (level?.conf). tracks and riverTracks are tuples of
+# TrackConfig records.
+LevelConfig = collections.namedtuple('LevelConfig', (
+    'path', 'name', 'background', 'frogPosX', 'frogPosY',
+    'frogCollisionWidth', 'frogCollisionHeight', 'finishImage',
+    'finishImageX', 'finishImageY', 'finishCenterWidth', 'finishCenterHeight',
+    'tracks', 'riverTracks'))
+
+# Game configuration (game.conf). levels - tuple of level configuration file
+# names, lifePositions - tuple of (x, y) positions of life crystals,
+# dirtyRects - update only changed screen areas, replayPath - file to record
+# the played game to (None - do not record), profilerTracePath - file to
+# write frame phase times to (None - do not write), logPath - JSON lines
+# file to write game events to (None - do not write), leaderboardPath -
+# SQLite database of all completed games (None - do not keep).
+GameConfig = collections.namedtuple('GameConfig', (
+    'path', 'name', 'screenWidth', 'screenHeight', 'highscorePath', 'levels',
+    'lifeTextPosition', 'lifePositions', 'dirtyRects', 'replayPath',
+    'profilerTracePath', 'logPath', 'leaderboardPath'))
+
+
+def parseInts(value):
+    """Convert comma separated list of integers into a tuple.
+
+    Args:
+        value: Text string, e.g. '40, 70'.
+    """
+    return tuple(int(x) for x in value.replace(' ', '').split(','))
+
+
+def parseNames(value):
+    """Convert comma separated list of names into a tuple.
+
+    Args:
+        value: Text string, e.g. 'car1.conf, car2.conf'.
+    """
+    return tuple(x.strip() for x in value.split(','))
+
+
+class ConfigRegistry:
+    """Parses configuration files and keeps parsed records."""
+
+    def __init__(self):
+        """Initialize registry."""
+        # (record type name, absolute path) -> record.
+        self.records = {}
+
+        # Amount of configuration files parsed.
+        self.parseCount = 0
+
+        # Held while looking up and parsing a file. Level files are parsed
+        # by the preloader thread while the main thread may need the same
+        # records. Reentrant: parsing a level gets its car and floater
+        # records.
+        self.lock = threading.RLock()
+
+    def read(self, path):
+        """Parse configuration file.
+
+        Args:
+            path: Path to the configuration file. String.
+
+        Returns:
+            configparser.ConfigParser object.
+        """
+        config = configparser.ConfigParser()
+
+        text = None
+        if loaders.BUNDLE is not None:
+            text = loaders.BUNDLE.config(path)
+
+        if text is None:
+            config.read(path)
+        else:
+            config.read_string(text, source=path)
+
+        self.parseCount += 1
+        return config
+
+    def get(self, kind, path, parse):
+        """Return cached record or parse the file and cache the record.
+
+        Args:
+            kind:  Record type name. String.
+            path:  Path to the configuration file. String.
+            parse: Function taking absolute path and returning the record.
+        """
+        path = os.path.normpath(os.path.abspath(path))
+        key = (kind, path)
+        with self.lock:
+            record = self.records.get(key)
+            if record is None:
+                record = parse(path)
+                self.records[key] = record
+
+        return record
+
+    def car(self, path):
+        """Return CarConfig record for the given car configuration file."""
+        return self.get('car', path, self.parseCar)
+
+    def floater(self, path):
+        """Return FloaterConfig record for the given configuration file."""
+        return self.get('floater', path, self.parseFloater)
+
+    def animation(self, path):
+        """Return AnimationConfig record for the given configuration file."""
+        return self.get('animation', path, self.parseAnimation)
+
+    def level(self, path):
+        """Return LevelConfig record for the given configuration file."""
+        return self.get('level', path, self.parseLevel)
+
+    def game(self, path):
+        """Return GameConfig record for the given configuration file."""
+        return self.get('game', path, self.parseGame)
+
+    def parseCar(self, path):
+        """Parse car configuration file."""
+        cfg = self.read(path)['general']
+        return CarConfig(path=path,
+                         image=cfg['image'],
+                         shadowImage=cfg['shadow_image'],
+                         direction=cfg['direction'],
+                         crMarginTop=cfg.getint('crMarginTop'),
+                         crMarginBottom=cfg.getint('crMarginBottom'),
+                         crMarginLeft=cfg.getint('crMarginLeft'),
+                         crMarginRight=cfg.getint('crMarginRight'))
+
+    def parseFloater(self, path):
+        """Parse floating object configuration file."""
+        cfg = self.read(path)['general']
+        return FloaterConfig(path=path,
+                             image=cfg['image'],
+                             direction=cfg['direction'],
+                             crMarginTop=cfg.getint('crMarginTop'),
+                             crMarginBottom=cfg.getint('crMarginBottom'),
+                             crMarginLeft=cfg.getint('crMarginLeft'),
+                             crMarginRight=cfg.getint('crMarginRight'))
+
+    def parseAnimation(self, path):
+        """Parse animation configuration file."""
+        config = self.read(path)
+        generalCfg = config['general']
+        animationCfg = config['animation']
+
+        frameWidth, frameHeight = parseInts(animationCfg.get('frameSize'))
+        collisionFrameSize = parseInts(animationCfg.get('collisionFrameSize',
+                                                        '0,0'))
+
+        frames = []
+        for i in range(1, MAX_FRAME_COUNT + 1):
+            # Get X and Y coordinates of the top left corner of the frame.
+            name = 'frame' + str(i)
+            frameXY = animationCfg.get(name)
+            if frameXY is None:
+                continue
+
+            coordX, coordY = parseInts(frameXY)
+
+            # Not all animated sprites move, so not all have 'distance'.
+            distance = animationCfg.get(name + 'MoveDistance')
+            if distance is not None:
+                distance = int(distance)
+
+            frames.append(FrameConfig(
+                area=(coordX, coordY, frameWidth, frameHeight),
+                time=int(animationCfg[name + 'Time']),
+                distance=distance))
+
+        return AnimationConfig(
+            path=path,
+            filename=generalCfg['filename'],
+            useAlpha=generalCfg.getboolean('useAlphaChannel', False),
+            frameSize=(frameWidth, frameHeight),
+            collisionFrameSize=collisionFrameSize,
+            frames=tuple(frames))
+
+    def parseTracks(self, config, sections, objectsOption, configDir):
+        """Parse car or river track sections of the level configuration.
+
+        Args:
+            config:        Parsed level config object.
+                           configparser.ConfigParser object.
+            sections:      Names of the track sections. Tuple.
+            objectsOption: Name of the option listing configuration files of
+                           objects on the track ('cars' or 'floaters').
+            configDir:     Directory of object configuration files. String.
+
+        Returns:
+            Tuple of TrackConfig records of enabled tracks.
+        """
+        if objectsOption == 'cars':
+            loadObject = self.car
+        else:
+            loadObject = self.floater
+
+        tracks = []
+        for trackSection in sections:
+            cfg = config[trackSection]
+            if not cfg.getboolean('enabled'):
+                continue
+
+            gaps = parseInts(cfg.get('gaps'))
+
+            objects = []
+            for idx, configName in enumerate(parseNames(cfg.get(
+                    objectsOption))):
+                configPath = os.path.join(configDir, configName)
+                if idx == len(gaps):
+                    raise ValueError(f"No gap defined for '{configPath}' in "
+                                     f"section '{trackSection}'.")
+
+                objects.append(loadObject(configPath))
+
+            tracks.append(TrackConfig(section=trackSection,
+                                      top=cfg.getint('top'),
+                                      bottom=cfg.getint('bottom'),
+                                      direction=cfg.get('direction'),
+                                      speed=cfg.getint('speed'),
+                                      objects=tuple(objects),
+                                      gaps=gaps))
+
+        return tuple(tracks)
+
+    def parseLevel(self, path):
+        """Parse level configuration file."""
+        config = self.read(path)
+        configDir = os.path.dirname(path)
+
+        cfg = config['general']
+        return LevelConfig(
+            path=path,
+            name=cfg.get('name', ''),
+            background=cfg.get('background'),
+            frogPosX=cfg.getint('frogPosX'),
+            frogPosY=cfg.getint('frogPosY'),
+            frogCollisionWidth=cfg.getint('frogCollisionWidth'),
+            frogCollisionHeight=cfg.getint('frogCollisionHeight'),
+            finishImage=cfg.get('finishImage'),
+            finishImageX=cfg.getint('finishImageX'),
+            finishImageY=cfg.getint('finishImageY'),
+            finishCenterWidth=cfg.getint('finishCenterWidth'),
+            finishCenterHeight=cfg.getint('finishcenterHeight'),
+            tracks=self.parseTracks(config, TRACK_SECTIONS, 'cars',
+                                    configDir),
+            riverTracks=self.parseTracks(config, RIVER_SECTIONS, 'floaters',
+                                         configDir))
+
+    def parseGame(self, path):
+        """Parse game configuration file."""
+        config = self.read(path)
+
+        cfg = config['general']
+        lifesCfg = config['LifeIndicator']
+
+        lifePositions = []
+        for i in range(1, MAX_LIFES + 1):
+            position = lifesCfg.get('pos' + str(i))
+            if position:
+                lifePositions.append(parseInts(position))
+
+        return GameConfig(
+            path=path,
+            name=cfg['name'],
+            screenWidth=cfg.getint('screenWidth'),
+            screenHeight=cfg.getint('screenHeight'),
+            highscorePath=cfg.get('highscorePath'),
+            levels=parseNames(cfg['levels']),
+            lifeTextPosition=parseInts(lifesCfg.get('textPosition')),
+            lifePositions=tuple(lifePositions),
+            dirtyRects=cfg.getboolean('dirtyRects', True),
+            replayPath=cfg.get('replayPath') or None,
+            profilerTracePath=cfg.get('profilerTracePath') or None,
+            logPath=cfg.get('logPath') or None,
+            leaderboardPath=cfg.get('leaderboardPath') or None)
+
+
+# Registry used by the game.
+REGISTRY = ConfigRegistry()
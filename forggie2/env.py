@@ -0,0 +1,261 @@
+"""Reinforcement learning environment running levels without a window.
+
+Interface follows OpenAI Gym: reset() returns the first observation,
+step(action) returns (observation, reward, done, info). Gym itself is not
+required.
+"""
+import itertools
+import os
+
+import numpy as np
+import pygame
+
+from clock import TickClock
+from level import Level
+from renderer import LevelRenderer
+from simulation import Simulation, Inputs, NO_INPUTS
+from simulation import EVENT_KILLED, EVENT_DROWNED, EVENT_COMPLETED
+
+MAIN_DIR = os.path.split(os.path.abspath(__file__))[0]
+CONFIG_DIR = os.path.join(MAIN_DIR, '..', 'configs')
+IMAGE_DIR = os.path.join(MAIN_DIR, '..', 'images')
+
+# Actions accepted by FroggieEnv.step(): index -> keys pressed.
+ACTIONS = (NO_INPUTS,
+           Inputs(True, False, False, False, False, False),
+           Inputs(False, True, False, False, False, False),
+           Inputs(False, False, True, False, False, False),
+           Inputs(False, False, False, True, False, False))
+ACTION_NAMES = ('noop', 'up', 'down', 'left', 'right')
+
+# Observation types.
+OBSERVATION_GRID = 'grid'
+OBSERVATION_FRAME = 'frame'
+
+# Size of the lane occupancy grid cell in pixels.
+GRID_CELL_SIZE = 20
+
+# Lane occupancy grid channels.
+GRID_CARS = 0
+GRID_FLOATERS = 1
+GRID_FROG = 2
+GRID_CHANNELS = 3
+
+# Rewards.
+REWARD_COMPLETED = 1.0
+REWARD_DIED = -1.0
+
+# Reward for getting from the start to the finish line, split between all
+# rows closer to the finish the frog reaches for the first time.
+REWARD_PROGRESS = 1.0
+
+# Episode is stopped after this many steps (one minute of the game time at
+# 24 frames per second).
+MAX_EPISODE_STEPS = 1440
+
+
+class FroggieEnv:
+    """Single frog on a single level, one life per episode."""
+
+    def __init__(self, configDir=CONFIG_DIR, imageDir=IMAGE_DIR,
+                 screenWidth=600, screenHeight=800,
+                 observation=OBSERVATION_GRID, cellSize=GRID_CELL_SIZE,
+                 maxSteps=MAX_EPISODE_STEPS, frameRate=None):
+        """Initialize environment.
+
+        Args:
+            configDir:    Game settings directory. String.
+            imageDir:     Image directory. String.
+            screenWidth:  Screen width in pixels. Integer.
+            screenHeight: Screen height in pixels. Integer.
+            observation:  OBSERVATION_GRID - lane occupancy grid,
+                          OBSERVATION_FRAME - rendered RGB frame.
+            cellSize:     Size of the occupancy grid cell in pixels. Integer.
+            maxSteps:     Steps after which the episode is stopped. Integer.
+            frameRate:    Simulated frames per second. None - game default.
+        """
+        if observation not in (OBSERVATION_GRID, OBSERVATION_FRAME):
+            raise ValueError(f"Unknown observation type '{observation}'.")
+
+        self.configDir = configDir
+        self.imageDir = imageDir
+        self.screenWidth = screenWidth
+        self.screenHeight = screenHeight
+        self.observation = observation
+        self.cellSize = cellSize
+        self.maxSteps = maxSteps
+        self.frameRate = frameRate
+
+        self.actionCount = len(ACTIONS)
+        self.gridShape = (GRID_CHANNELS,
+                          -(-screenHeight // cellSize),
+                          -(-screenWidth // cellSize))
+
+        self.levelPath = None
+        self.level = None
+        self.simulation = None
+        self.renderer = None
+
+        # Surface the frame observation is drawn on and sprite groups drawn
+        # on it, bottom first.
+        self.frame = None
+        self.groups = ()
+
+        self.steps = 0
+        self.done = True
+
+        # Highest (smallest) Y coordinate of the frog reached in the episode.
+        self.bestTop = 0
+
+    def reset(self, level=None, seed=None):
+        """Start a new episode.
+
+        Args:
+            level: Level configuration file name or path. String. None -
+                   the level of the previous episode.
+            seed:  Seed of the random car positions. Integer. None -
+                   different positions every episode.
+
+        Returns:
+            First observation.
+        """
+        if level is not None:
+            self.levelPath = os.path.join(self.configDir, level)
+
+        if self.levelPath is None:
+            raise ValueError('No level given for the first episode.')
+
+        if self.frameRate is None:
+            clock = TickClock()
+        else:
+            clock = TickClock(self.frameRate)
+
+        self.level = Level(self.configDir, self.imageDir, self.screenWidth,
+                           self.screenHeight, clock=clock, seed=seed)
+        self.level.load(self.levelPath)
+        self.simulation = Simulation(self.level)
+        self.renderer = None
+
+        self.steps = 0
+        self.done = False
+        self.bestTop = self.simulation.frog.collisionRect.top
+
+        return self.observe()
+
+    def step(self, action):
+        """Advance the level by one tick.
+
+        Args:
+            action: Index in ACTIONS. Integer.
+
+        Returns:
+            Tuple (observation, reward, done, info). info is a dict with
+            'events' (list of simulation events), 'levelTime' (miliseconds)
+            and 'steps'.
+        """
+        if self.done:
+            raise RuntimeError('Episode is over, call reset().')
+
+        simulation = self.simulation
+        events = simulation.step(ACTIONS[action])
+        self.steps += 1
+
+        reward = 0.0
+        top = simulation.frog.collisionRect.top
+        if top < self.bestTop:
+            start = simulation.level.frogPosY
+            reward += REWARD_PROGRESS * (self.bestTop - top) / start
+            self.bestTop = top
+
+        if EVENT_KILLED in events or EVENT_DROWNED in events:
+            reward += REWARD_DIED
+            self.done = True
+
+        if EVENT_COMPLETED in events:
+            reward += REWARD_COMPLETED
+            self.done = True
+
+        if self.steps >= self.maxSteps:
+            self.done = True
+
+        info = {'events': events,
+                'levelTime': simulation.levelTime,
+                'steps': self.steps}
+
+        return self.observe(), reward, self.done, info
+
+    def observe(self):
+        """Return observation of the current state."""
+        if self.observation == OBSERVATION_FRAME:
+            return self.render()
+
+        return self.occupancyGrid()
+
+    def occupancyGrid(self):
+        """Return lane occupancy grid of the current state.
+
+        Returns:
+            Numpy uint8 array of shape (GRID_CHANNELS, rows, columns). Cell
+            is 1 if collision rect of a car, floater or the frog (channel
+            GRID_CARS, GRID_FLOATERS or GRID_FROG) covers part of it.
+        """
+        traffic = self.simulation.traffic
+        frogRect = self.simulation.frog.collisionRect
+
+        grid = np.zeros(self.gridShape, dtype=np.uint8)
+        _, rows, columns = self.gridShape
+        cell = self.cellSize
+
+        rects = zip(traffic.isCar.tolist(), traffic.collisionX.tolist(),
+                    traffic.collisionY.tolist(),
+                    traffic.collisionWidth.tolist(),
+                    traffic.collisionHeight.tolist())
+        frog = (None, frogRect.left, frogRect.top, frogRect.width,
+                frogRect.height)
+
+        for isCar, left, top, width, height in itertools.chain(rects,
+                                                                (frog,)):
+            if width <= 0 or height <= 0:
+                continue
+
+            # Cells covered by the rect, clipped to the screen.
+            col0 = max(left // cell, 0)
+            col1 = min((left + width - 1) // cell, columns - 1)
+            row0 = max(top // cell, 0)
+            row1 = min((top + height - 1) // cell, rows - 1)
+            if col0 > col1 or row0 > row1:
+                continue
+
+            if isCar is None:
+                channel = GRID_FROG
+            elif isCar:
+                channel = GRID_CARS
+            else:
+                channel = GRID_FLOATERS
+
+            grid[channel, row0:row1 + 1, col0:col1 + 1] = 1
+
+        return grid
+
+    def render(self):
+        """Draw the current state.
+
+        Returns:
+            Numpy uint8 array of shape (screenHeight, screenWidth, 3).
+        """
+        if self.renderer is None:
+            self.frame = pygame.Surface((self.screenWidth, self.screenHeight))
+            self.renderer = LevelRenderer(self.frame, self.level,
+                                          useDirtyRects=False)
+            level = self.level
+            self.groups = (pygame.sprite.RenderUpdates(level.floaters),
+                           self.simulation.frog.all,
+                           pygame.sprite.RenderUpdates(level.shadows),
+                           pygame.sprite.RenderUpdates(level.cars))
+
+        self.simulation.syncSprites()
+        self.renderer.beginFrame()
+        for group in self.groups:
+            self.renderer.drawGroup(group)
+
+        return pygame.surfarray.array3d(self.frame).swapaxes(0, 1)
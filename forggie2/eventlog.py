@@ -0,0 +1,319 @@
+"""Leveled, structured game log with pluggable sinks.
+
+Usage:
+    LOG.info('Loading level', path=levelConfigPath)
+    LOG.event(EVENT_DEATH, cause='car', lifesLeft=2)
+
+Every call makes a LogRecord and passes it to the sinks accepting its level.
+Sinks writing to files or stdout are run on a background thread, so the game
+loop only puts the record to a queue and never waits for I/O. The on-screen
+overlay sink (logger.Logger) only stores the message and is written at once.
+"""
+import sys
+import json
+import time
+import queue
+import atexit
+import threading
+import collections
+
+# Log levels.
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING',
+               ERROR: 'ERROR'}
+
+# Events of the structured records. EVENT_MESSAGE - plain text message.
+EVENT_MESSAGE = 'message'
+EVENT_IMAGE_LOADED = 'imageLoaded'
+EVENT_LEVEL_LOADED = 'levelLoaded'
+EVENT_DEATH = 'death'
+EVENT_LEVEL_COMPLETED = 'levelCompleted'
+EVENT_GAME_COMPLETED = 'gameCompleted'
+EVENT_FRAME_STATS = 'frameStats'
+
+# Max amount of records waiting for the background thread. Records logged
+# while the queue is full are dropped (and counted), the game is not slowed
+# down.
+QUEUE_SIZE = 10000
+
+# One log entry. time - seconds since the epoch, level - one of the log
+# levels, event - EVENT_* string, message - text, data - dict of the event
+# fields.
+LogRecord = collections.namedtuple('LogRecord', ('time', 'level', 'event',
+                                                 'message', 'data'))
+
+# Put to the queue to stop the background thread.
+STOP = object()
+
+
+def formatRecord(record):
+    """Return record as a line of text.
+
+    Args:
+        record: LogRecord object.
+    """
+    parts = [LEVEL_NAMES.get(record.level, str(record.level))]
+    if record.event != EVENT_MESSAGE:
+        parts.append(record.event)
+
+    if record.message:
+        parts.append(record.message)
+
+    parts += [f'{key}={value}' for key, value in record.data.items()]
+    return ' '.join(parts)
+
+
+class StdoutSink:
+    """Prints records to stdout as lines of text."""
+
+    # Written on the background thread.
+    threaded = True
+
+    def __init__(self, minLevel=INFO, stream=None):
+        """Initialize sink.
+
+        Args:
+            minLevel: Lowest level of the written records. Integer.
+            stream:   File object to write to. None - sys.stdout at the time
+                      of writing.
+        """
+        self.minLevel = minLevel
+        self.stream = stream
+
+    def write(self, record):
+        """Write one record."""
+        print(formatRecord(record), file=self.stream or sys.stdout)
+
+    def flush(self):
+        """Push written records to the stream."""
+        (self.stream or sys.stdout).flush()
+
+    def close(self):
+        """Stop using the sink."""
+        self.flush()
+
+
+class JsonLinesSink:
+    """Appends records to a file, one JSON object per line."""
+
+    # Written on the background thread.
+    threaded = True
+
+    def __init__(self, path, minLevel=DEBUG):
+        """Initialize sink.
+
+        Args:
+            path:     Path to the log file. String.
+            minLevel: Lowest level of the written records. Integer.
+        """
+        self.path = path
+        self.minLevel = minLevel
+        self.file = open(path, 'a')
+
+    def write(self, record):
+        """Write one record."""
+        entry = {'time': round(record.time, 3),
+                 'level': LEVEL_NAMES.get(record.level, record.level),
+                 'event': record.event}
+        if record.message:
+            entry['message'] = record.message
+
+        entry.update(record.data)
+        self.file.write(json.dumps(entry, default=str) + '\n')
+
+    def flush(self):
+        """Push written records to the file."""
+        self.file.flush()
+
+    def close(self):
+        """Close the file."""
+        self.file.close()
+
+
+class OverlaySink:
+    """Shows records on top of the game screen."""
+
+    # Written right away: storing a message costs less than queuing it, and
+    # the overlay is drawn on the main thread.
+    threaded = False
+
+    def __init__(self, logger, minLevel=DEBUG):
+        """Initialize sink.
+
+        Args:
+            logger:   logger.Logger object showing the messages.
+            minLevel: Lowest level of the written records. Integer.
+        """
+        self.logger = logger
+        self.minLevel = minLevel
+
+    def write(self, record):
+        """Write one record."""
+        self.logger.log(formatRecord(record))
+
+    def flush(self):
+        """Nothing to push, messages are drawn by the logger."""
+
+    def close(self):
+        """Stop using the sink."""
+
+
+class EventLog:
+    """Passes log records to sinks."""
+
+    def __init__(self, sinks=(), queueSize=QUEUE_SIZE):
+        """Initialize log.
+
+        Args:
+            sinks:     Sinks to write records to. Objects with minLevel and
+                       threaded attributes and write(), flush() and close()
+                       methods.
+            queueSize: Max amount of records waiting for the background
+                       thread. Integer.
+        """
+        self.sinks = []
+        self.queue = queue.Queue(maxsize=queueSize)
+        self.thread = None
+
+        # Lowest level accepted by any sink. Records below it are not even
+        # created.
+        self.minLevel = ERROR + 1
+
+        # Amount of records dropped because the queue was full.
+        self.dropped = 0
+
+        # Amount of failed writes and flushes of the threaded sinks. A failing
+        # sink does not stop the background thread.
+        self.errors = 0
+
+        for sink in sinks:
+            self.addSink(sink)
+
+    def addSink(self, sink):
+        """Start writing records to the sink."""
+        self.sinks = self.sinks + [sink]
+        self.minLevel = min(self.minLevel, sink.minLevel)
+
+        if sink.threaded and self.thread is None:
+            self.thread = threading.Thread(target=self.run,
+                                           name='EventLog', daemon=True)
+            self.thread.start()
+
+    def removeSink(self, sink):
+        """Stop writing records to the sink. The sink is not closed."""
+        self.flush()
+        self.sinks = [item for item in self.sinks if item is not sink]
+        self.minLevel = min((item.minLevel for item in self.sinks),
+                            default=ERROR + 1)
+
+    def log(self, level, message='', event=EVENT_MESSAGE, **data):
+        """Write a record to the sinks accepting its level.
+
+        Args:
+            level:   Log level. Integer.
+            message: Text of the record. String.
+            event:   Event of the record. EVENT_* string.
+            data:    Fields of the event. Values should be JSON serializable.
+        """
+        if level < self.minLevel:
+            return
+
+        record = LogRecord(time.time(), level, event, message, data)
+
+        threaded = False
+        for sink in self.sinks:
+            if level < sink.minLevel:
+                continue
+
+            if sink.threaded:
+                threaded = True
+            else:
+                sink.write(record)
+
+        if threaded:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def debug(self, message, **data):
+        """Write a DEBUG level message."""
+        self.log(DEBUG, message, **data)
+
+    def info(self, message, **data):
+        """Write an INFO level message."""
+        self.log(INFO, message, **data)
+
+    def warning(self, message, **data):
+        """Write a WARNING level message."""
+        self.log(WARNING, message, **data)
+
+    def error(self, message, **data):
+        """Write an ERROR level message."""
+        self.log(ERROR, message, **data)
+
+    def event(self, event, message='', level=INFO, **data):
+        """Write a structured event.
+
+        Args:
+            event:   EVENT_* string.
+            message: Optional text of the record. String.
+            level:   Log level. Integer.
+            data:    Fields of the event.
+        """
+        self.log(level, message, event=event, **data)
+
+    def run(self):
+        """Write queued records to the threaded sinks until stopped."""
+        while True:
+            record = self.queue.get()
+            try:
+                if record is STOP:
+                    return
+
+                for sink in self.sinks:
+                    if sink.threaded and record.level >= sink.minLevel:
+                        try:
+                            sink.write(record)
+                        except Exception:
+                            self.errors += 1
+
+                if self.queue.empty():
+                    for sink in self.sinks:
+                        if sink.threaded:
+                            try:
+                                sink.flush()
+                            except Exception:
+                                self.errors += 1
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Wait until queued records are written.
+
+        Returns at once if the background thread is not running, so nothing
+        would write the records.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        """Write queued records, stop the thread and close all sinks."""
+        if self.thread is not None:
+            self.queue.put(STOP)
+            self.thread.join()
+            self.thread = None
+
+        for sink in self.sinks:
+            sink.close()
+
+        self.sinks = []
+        self.minLevel = ERROR + 1
+
+
+# Log used by the game. Messages of INFO level and above go to stdout.
+LOG = EventLog([StdoutSink(INFO)])
+atexit.register(LOG.flush)
@@ -1,18 +1,18 @@
 """Class defining object floating in the river."""
-import configparser
 import pygame
-import loaders
+from atlas import vehicleImage
 
 
 class Floater(pygame.sprite.Sprite):
     """A thing that floats on water."""
 
-    def __init__(self, configPath, roadDirection, screenWidth=0,
+    def __init__(self, floaterConfig, roadDirection, screenWidth=0,
                  screenHeight=0, roadTop=0, roadBottom=0, gapInFront=0,
                  speed=0):
         """
         Args:
-            configPath:    Path to the configuration file.
+            floaterConfig: Floater configuration.
+                           configregistry.FloaterConfig record.
             roadDirection: Direction in which all cars on the road
                            should move.  'to_left' or 'to_right'.
             screenWidth:   Screen width in pixels. Integer.
@@ -25,11 +25,12 @@ class Floater(pygame.sprite.Sprite):
         """
         pygame.sprite.Sprite.__init__(self)
 
-        config = configparser.ConfigParser()
-        config.read(configPath)
-
-        imageFilename = config['general']['image']
-        self.image, self.rect = loaders.loadImage(imageFilename, useAlpha=True)
+        # Floater image from the vehicle atlas, rotated if the floater moves
+        # against its image.
+        self.image = vehicleImage(
+            floaterConfig, floaterConfig.image,
+            rotated=roadDirection != floaterConfig.direction)
+        self.rect = self.image.get_rect()
 
         self.screenWidth = screenWidth
         self.screenHeight = screenHeight
@@ -46,16 +47,13 @@ class Floater(pygame.sprite.Sprite):
         self.speed = speed
 
         self.direction = roadDirection
-        if roadDirection != config['general']['direction']:
-            self.image = pygame.transform.rotate(self.image, 180)
 
         self.carWidth = self.rect.width
 
-        cfg = config['general']
-        self.crMarginTop = cfg.getint('crMarginTop')
-        self.crMarginBottom = cfg.getint('crMarginBottom')
-        self.crMarginLeft = cfg.getint('crMarginLeft')
-        self.crMarginRight = cfg.getint('crMarginRight')
+        self.crMarginTop = floaterConfig.crMarginTop
+        self.crMarginBottom = floaterConfig.crMarginBottom
+        self.crMarginLeft = floaterConfig.crMarginLeft
+        self.crMarginRight = floaterConfig.crMarginRight
         self.collisionRect = pygame.Rect(
             self.rect.left + self.crMarginLeft,
             self.rect.top + self.crMarginTop,
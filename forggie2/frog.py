@@ -1,15 +1,22 @@
 """Class defining main character."""
 import os
-import configparser
 import pygame
 from animatedsprite import AnimatedSprite
+from configregistry import REGISTRY
+
+# Animation configuration files of the frog.
+ANIMATION_CONFIGS = ('animation_frog_up.conf', 'animation_frog_left.conf',
+                     'animation_frog_right.conf', 'animation_frog_down.conf',
+                     'animation_frog_down_left.conf',
+                     'animation_frog_down_right.conf', 'animation_dead.conf',
+                     'animation_drowning.conf')
 
 
 class Frog:
     """Animated frog."""
 
     def __init__(self, startX, startY, screenWidth, screenHeight,
-                 configDir, imageDir):
+                 configDir, imageDir, clock=None):
         """Initialize main character object.
 
         Args:
@@ -22,8 +29,11 @@ class Frog:
             frameRate:    Frame rate for animations.
             configDir:    Game settings directory. String.
             imageDir:     Image directory. String.
+            clock:        Clock to time frog animations with. Object with
+                          now() method. None - real time clock.
         """
         self.configDir = configDir
+        self.clock = clock
         self.imageDir = imageDir
         self.screenWidth = screenWidth
         self.screenHeight = screenHeight
@@ -38,41 +48,31 @@ class Frog:
         self.startPosition = self.position
 
         # Frog animation to jump up.
-        self.jumpUpAnim = AnimatedSprite('animation_frog_up.conf',
-                                         self.configDir, self.imageDir,
-                                         self.position)
+        self.jumpUpAnim = self.loadAnimation('animation_frog_up.conf')
 
         # Frog animation to move left when facing up.
-        self.jumpUpLeftAnim = AnimatedSprite('animation_frog_left.conf',
-                                             self.configDir, self.imageDir,
-                                             self.position)
+        self.jumpUpLeftAnim = self.loadAnimation('animation_frog_left.conf')
 
         # Frog animation to move right when facing up.
-        self.jumpUpRightAnim = AnimatedSprite('animation_frog_right.conf',
-                                              self.configDir, self.imageDir,
-                                              self.position)
+        self.jumpUpRightAnim = self.loadAnimation('animation_frog_right.conf')
 
         # Frog animation to jump down.
         #self.jumpDownAnim = AnimatedSprite('animation_frog_up.conf',
-        self.jumpDownAnim = AnimatedSprite('animation_frog_down.conf',
-                                           self.configDir, self.imageDir,
-                                           self.position)
+        self.jumpDownAnim = self.loadAnimation('animation_frog_down.conf')
 
         # Frog animation to move left when facing down.
-        self.jumpDownLeftAnim = AnimatedSprite('animation_frog_down_left.conf',
-                                               self.configDir, self.imageDir,
-                                               self.position)
+        self.jumpDownLeftAnim = self.loadAnimation(
+            'animation_frog_down_left.conf')
 
         # Frog animation to move rigt when facing down.
-        self.jumpDownRightAnim = AnimatedSprite('animation_frog_down_right.conf',
-                                                self.configDir, self.imageDir,
-                                                self.position)
+        self.jumpDownRightAnim = self.loadAnimation(
+            'animation_frog_down_right.conf')
 
         # Initial frog position.
         self.anim = self.jumpUpAnim
 
         # All sprites to animate at the same time for the frog.
-        self.all = pygame.sprite.Group(self.jumpUpAnim)
+        self.all = pygame.sprite.RenderUpdates(self.jumpUpAnim)
 
         # Every sprite can only be moved in 4 directions in 2D space. This
         # attribute tells us, which animation is currently running: 'up',
@@ -86,13 +86,10 @@ class Frog:
         self.collisionRect = self.anim.collisionRect
 
         # Image to show frog after being run over by a car.
-        self.deadFrog = AnimatedSprite('animation_dead.conf', self.configDir,
-                                       self.imageDir, self.position)
+        self.deadFrog = self.loadAnimation('animation_dead.conf')
 
         # Image to show when frog drawned in the river.
-        self.drownedFrog = AnimatedSprite('animation_drowning.conf',
-                                          self.configDir, self.imageDir,
-                                          self.position)
+        self.drownedFrog = self.loadAnimation('animation_drowning.conf')
         self.drownedFrog.cycles = 1
 
         # Was frog run over by a car?
@@ -119,6 +116,45 @@ class Frog:
         # Debug option.
         self.drawCollisionRects = False
 
+    def loadAnimation(self, configName):
+        """Create frog animation placed at the initial frog position.
+
+        Args:
+            configName: Animation configuration filename. String.
+        """
+        path = os.path.join(self.configDir, configName)
+        return AnimatedSprite(REGISTRY.animation(path), self.imageDir,
+                              self.position, clock=self.clock)
+
+    def reset(self):
+        """Put the frog back to the state it was created in."""
+        for anim in (self.jumpUpAnim, self.jumpUpLeftAnim,
+                     self.jumpUpRightAnim, self.jumpDownAnim,
+                     self.jumpDownLeftAnim, self.jumpDownRightAnim,
+                     self.deadFrog, self.drownedFrog):
+            anim.resetState(self.startPosition)
+
+        self.drownedFrog.cycles = 1
+
+        self.anim = self.jumpUpAnim
+        self.all.empty()
+        self.all.add(self.anim)
+        self.activeAnimation = 'up'
+        self.isFacingUp = True
+
+        self.pressedUp = False
+        self.pressedDown = False
+        self.pressedLeft = False
+        self.pressedRight = False
+
+        self.isDead = False
+        self.isDrowned = False
+        self.isLocked = False
+        self.lifesLeft = 3
+        self.showingDeadFrog = False
+        self.showingDrownedFrog = False
+        self.runningDrowningAnim = False
+
     # covered with tests
     def moveUp(self):
         """Move sprite vertically up on the screen."""
@@ -228,7 +264,8 @@ class Frog:
                          other value is id of the object on which
                          stands frog.
             floaters:    All Floater objects.
-            riverTracks: River track configuration dictionary.
+            riverTracks: River tracks. Tuple of configregistry.TrackConfig
+                         records.
         """
         if hitByCars != -1 and not self.isDead:
             self.isDead = True
@@ -267,8 +304,8 @@ class Frog:
 
         # If in river, but not on a floater.
         if inRiver != -1 and onFloater == -1:
-            speed = riverTracks[inRiver]['speed']
-            if riverTracks[inRiver]['direction'] == 'to_left':
+            speed = riverTracks[inRiver].speed
+            if riverTracks[inRiver].direction == 'to_left':
                 speed = -speed
 
             self.move(speed)
@@ -375,9 +412,15 @@ class Frog:
 
         Args:
             surface: Surface to draw sprites on to.
+
+        Returns:
+            List of Rect objects of the changed areas.
         """
+        rects = []
         if self.drawCollisionRects:
-            pygame.draw.rect(surface, (0, 255, 0), self.anim.collisionRect, 1)
-            pygame.draw.rect(surface, (255, 0, 0), self.collisionRect, 1)
+            rects.append(pygame.draw.rect(surface, (0, 255, 0),
+                                          self.anim.collisionRect, 1))
+            rects.append(pygame.draw.rect(surface, (255, 0, 0),
+                                          self.collisionRect, 1))
 
-        self.all.draw(surface)
+        return rects + self.all.draw(surface)
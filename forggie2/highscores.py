@@ -1,45 +1,199 @@
 """Class to deal with highscores."""
 import os
+import bisect
 import datetime
 import traceback
 import configparser
 import pygame
 
+from textcache import TEXT_CACHE, getFont
+from eventlog import LOG
+from scorejournal import ScoreJournal
+
+# X coordinates of the highscore table columns.
+COLUMN_NUMBER = 50
+COLUMN_NAME = 110
+COLUMN_MINUTES = 330
+COLUMN_MIN = 375
+COLUMN_SECONDS = 460
+COLUMN_S = 550
+
+# Size of the highscore table text.
+FONT_SIZE = 50
+
+
+def makeScore(totalSeconds, name):
+    """Return score dictionary.
+
+    Args:
+        totalSeconds: Time of the game in seconds. Float.
+        name:         Player name. String.
+    """
+    return {'totalSeconds': totalSeconds,
+            # Limit the length of the name to 9 characters.
+            'name': name[:9],
+            'minutes': int(totalSeconds / 60),
+            'seconds': totalSeconds % 60,
+            }
+
+
+class TopScores:
+    """Best scores, sorted from the best to the worst.
+
+    Scores are inserted at their place, nothing is sorted again, so keeping
+    the best of any amount of results costs O(log k) comparisons per
+    result.
+    """
+
+    def __init__(self, maxEntries=12, scores=()):
+        """Initialize container.
+
+        Args:
+            maxEntries: Amount of the best scores kept. Integer.
+            scores:     Score dictionaries to insert, in any order.
+        """
+        self.maxEntries = maxEntries
+
+        # Score dictionaries and their total seconds to bisect, from the best
+        # to the worst.
+        self.items = []
+        self.seconds = []
+
+        for score in scores:
+            self.insert(score)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def rank(self, totalSeconds):
+        """Return position a result would get in the table.
+
+        Results equal to the kept ones are placed after them.
+
+        Args:
+            totalSeconds: Time of the game in seconds. Float.
+
+        Returns:
+            Position, 1 - the best. Integer, may be greater than maxEntries.
+        """
+        return bisect.bisect_right(self.seconds, totalSeconds) + 1
+
+    def insert(self, score):
+        """Add score, dropping the worst one if there are too many.
+
+        Args:
+            score: Score dictionary.
+
+        Returns:
+            Position the score got or None, if it is not good enough.
+        """
+        rank = self.rank(score['totalSeconds'])
+        if rank > self.maxEntries:
+            return None
+
+        self.items.insert(rank - 1, score)
+        self.seconds.insert(rank - 1, score['totalSeconds'])
+        del self.items[self.maxEntries:]
+        del self.seconds[self.maxEntries:]
+        return rank
+
 
 class Highscores:
     """Class to load show and save highscore data."""
 
     def __init__(self):
         """Initialize object."""
-        # Max amount of entries in highscores table (and highscores.conf).
+        # Max amount of entries in highscores table.
         self.maxEntries = 12
 
-        font = pygame.font.Font(None, 70)
-        self.title = font.render('Highscores', True, pygame.Color('white'))
+        self.title = TEXT_CACHE.render('Highscores', 70)
+        self.textMin = TEXT_CACHE.render('min', FONT_SIZE)
+        self.textS = TEXT_CACHE.render('s', FONT_SIZE)
+
+        # Best scores. TopScores object.
+        self.top = TopScores(self.maxEntries)
 
-        font = pygame.font.Font(None, 50)
-        self.textMin = font.render('min', True, pygame.Color('white'))
-        self.textS = font.render('s', True, pygame.Color('white'))
+        # Rendered position numbers: '1.', '2.', ...
+        self.numbers = []
 
-        self.scores = []
+        # Rendered rows (all columns but the number) of the shown scores.
+        # (total seconds, name) -> Surface object.
+        self.rows = {}
+
+        # Rendered rows in the order of self.top.
         self.rendered = []
 
+        # ScoreJournal object the scores are stored in and its results the
+        # scores were made from.
+        self.journal = None
+        self.entries = []
+
+        # True if the journal can not be written, e.g. its directory is read
+        # only. Scores are then kept in memory only.
+        self.readOnly = False
+
+    @property
+    def scores(self):
+        """Return best scores as a list of dictionaries, best first."""
+        return self.top.items
+
+    @scores.setter
+    def scores(self, scores):
+        """Replace the scores, keeping only the best ones."""
+        self.top = TopScores(self.maxEntries, scores)
+
     def load(self, cfgpath):
         """Load highscores.
 
+        Highscores files of the older versions (INI files with 'result1',
+        'result2', ... sections) are converted to a journal.
+
         Args:
-            cfgpath: Path to the file with highscores. String.
+            cfgpath: Path to the highscores journal. String.
         """
-        cfg = configparser.ConfigParser()
-        cfg.read(cfgpath)
+        self.journal = ScoreJournal(cfgpath, self.maxEntries)
+        self.readOnly = False
 
         if not os.path.exists(cfgpath):
-            msg = f"WARNING: No '{cfgpath}' found. Will create one if needed."
-            print(msg)
-            return
+            msg = f"No '{cfgpath}' found. Will create one if needed."
+            LOG.warning(msg)
 
-        sectionNotPresent = False
+        # Reading a journal needs no lock, only converting a legacy file does.
+        if not self.journal.isJournal():
+            scores = []
+            try:
+                scores = self.loadLegacy(cfgpath)
+                with self.journal.locked():
+                    # Another game process may have converted it meanwhile.
+                    if not self.journal.isJournal():
+                        self.journal.rewrite(
+                            [(score['totalSeconds'], score['name'])
+                             for score in scores])
+            except OSError as exc:
+                LOG.error(f"Could not convert highscores '{cfgpath}': {exc}. "
+                          'New results will not be saved.')
+                self.readOnly = True
+                self.scores = scores
+                return
+
+        self.refresh()
+
+    def loadLegacy(self, cfgpath):
+        """Return highscores read from an INI file of the older versions.
+
+        Args:
+            cfgpath: Path to the file with highscores. String.
+
+        Returns:
+            List of score dictionaries.
+        """
+        cfg = configparser.ConfigParser()
+        scores = []
         try:
+            cfg.read(cfgpath)
             for i in range(1, self.maxEntries + 1):
                 try:
                     section = cfg['result' + str(i)]
@@ -49,90 +203,119 @@ class Highscores:
                     # them.
                     break
 
-                # Limit the length of the name to 9 characters.
-                name = section.get('name')[:9]
-
-                # Convert time into minutes and seconds.
-                totalSeconds = section.getfloat('time')
-
-                minutes = int(totalSeconds / 60)
-                seconds = totalSeconds % 60
-
-                new = {'totalSeconds': totalSeconds,
-                       'name': name,
-                       'minutes': minutes,
-                       'seconds': seconds,
-                       }
-                self.scores.append(new)
+                scores.append(makeScore(section.getfloat('time'),
+                                        section.get('name')))
         except Exception:
             # Whatever happens, we don't want it to prevent from running the
             # program, because highscores is not a vital part of the program.
-            if sectionNotPresent:
-                return
-            traceback.print_exc()
-            if os.path.exists(cfgpath):
-                now = datetime.datetime.now()
-                backupName = '%s.bck.%s' % (cfgpath, now.timestamp())
-                msg = (f"ERROR: Highscore data in file '{cfgpath}' is "
-                       f"not in expected format. Renaming '{cfgpath}' "
-                       f"to '{backupName}'. New '{cfgpath}' file "
-                       "will be created for new results.")
-                print(msg)
-                os.rename(cfgpath, backupName)
-            else:
-                msg = (f"WARNING:'{cfgpath}' does not exist. Will create "
-                       "one if needed.")
-                print(msg)
+            LOG.error('Could not read highscores.',
+                      traceback=traceback.format_exc())
+            now = datetime.datetime.now()
+            backupName = '%s.bck.%s' % (cfgpath, now.timestamp())
+            msg = (f"Highscore data in file '{cfgpath}' is "
+                   f"not in expected format. Renaming '{cfgpath}' "
+                   f"to '{backupName}'. New '{cfgpath}' file "
+                   "will be created for new results.")
+            LOG.error(msg)
+            os.rename(cfgpath, backupName)
+            return []
+
+        return scores
+
+    def refresh(self):
+        """Read results added to the journal, also by other game processes.
+
+        Returns:
+            True if the highscores changed.
+        """
+        if self.readOnly:
+            return False
+
+        self.journal.refresh()
+        entries = self.journal.entries
+        if entries == self.entries:
+            return False
 
-    def save(self, filepath):
-        """Write highscores to a file.
+        self.entries = entries
+        self.scores = [makeScore(totalSeconds, name)
+                       for totalSeconds, name in entries]
+        return True
+
+    def submit(self, score):
+        """Add result of a finished game to the journal.
 
         Args:
-            filepath:  Path to the file to save results to. String.
+            score: Score dictionary.
         """
-        self.scores.sort(key=lambda x: x['totalSeconds'])
+        if not self.readOnly:
+            try:
+                self.journal.submit(score['totalSeconds'], score['name'])
+            except OSError as exc:
+                LOG.error('Could not save highscores to '
+                          f"'{self.journal.path}': {exc}. New results will "
+                          'not be saved.')
+                self.readOnly = True
+            else:
+                self.refresh()
+                return
 
-        # We keep only best results that would fit our highscore table.
-        self.scores = self.scores[:self.maxEntries]
+        self.top.insert(score)
 
-        with open(filepath, 'w') as scoreFile:
-            txt = (f'# This file must have {self.maxEntries} entries.\n'
-                   f'# name - max 9 characters.\n'
-                   f'# time - time in seconds.\n\n')
-            scoreFile.write(txt)
+    def renderRow(self, score):
+        """Return row of the score drawn on one surface.
 
-            for idx, score in enumerate(self.scores, 1):
-                scoreFile.write(f'[result{idx}]\n')
-                scoreFile.write(f"name = {score['name']}\n")
-                scoreFile.write(f"time = {score['totalSeconds']}\n\n")
+        Row starts at the name column, the position number is drawn
+        separately, so the row stays valid when the score changes position.
 
-    def render(self):
-        """Render highscore text lines."""
-        # Sort and keep best entries only.
-        self.scores.sort(key=lambda x: x['totalSeconds'])
-        self.scores = self.scores[:self.maxEntries]
+        Args:
+            score: Score dictionary.
+        """
+        font = getFont(None, FONT_SIZE)
+        colour = pygame.Color('white')
 
-        font = pygame.font.Font(None, 50)
+        parts = [(font.render(score['name'], True, colour), COLUMN_NAME)]
+        if score['minutes']:
+            text = f"{score['minutes']}"
+            parts += [(font.render(text, True, colour), COLUMN_MINUTES),
+                      (self.textMin, COLUMN_MIN)]
 
-        self.rendered = []
-        for idx, item in enumerate(self.scores, 1):
-            text = str(idx) + '.'
-            textNumber = font.render(text, True, pygame.Color('white'))
+        # Limit length to avoid cases like '21.80000000000001 s'.
+        text = str(score['seconds'])[:5]
+        parts += [(font.render(text, True, colour), COLUMN_SECONDS),
+                  (self.textS, COLUMN_S)]
 
-            textName = font.render(item['name'], True, pygame.Color('white'))
+        width = max(posX + text.get_width() for text, posX in parts)
+        height = max(text.get_height() for text, _ in parts)
+        row = pygame.Surface((width - COLUMN_NAME, height), pygame.SRCALPHA)
+        row.fill((0, 0, 0, 0))
+        for text, posX in parts:
+            # Max of the text and the transparent black row is an exact copy,
+            # unlike alpha blending.
+            row.blit(text, (posX - COLUMN_NAME, 0),
+                     special_flags=pygame.BLEND_RGBA_MAX)
 
-            if item['minutes']:
-                text = f"{item['minutes']}"
-                textMinutes = font.render(text, True, pygame.Color('white'))
-            else:
-                textMinutes = None
+        return row
+
+    def render(self):
+        """Render highscore rows not rendered yet."""
+        font = getFont(None, FONT_SIZE)
+        while len(self.numbers) < len(self.top):
+            text = f'{len(self.numbers) + 1}.'
+            self.numbers.append(font.render(text, True,
+                                            pygame.Color('white')))
 
-            # Limit length to avoid cases like '21.80000000000001 s'.
-            text = str(item['seconds'])[:5]
-            textSeconds = font.render(text, True, pygame.Color('white'))
+        rows = {}
+        for score in self.top:
+            key = (score['totalSeconds'], score['name'])
+            row = self.rows.get(key)
+            if row is None:
+                row = self.renderRow(score)
+            rows[key] = row
 
-            tmp = (textNumber, textName, textMinutes, textSeconds)
-            self.rendered.append(tmp)
+        # Rows of the scores which dropped out of the table are forgotten.
+        self.rows = rows
+        self.rendered = [rows[(score['totalSeconds'], score['name'])]
+                         for score in self.top]
 
     def draw(self, surface):
         """Draw rendered text lines on the surface.
@@ -143,12 +326,7 @@ class Highscores:
         surface.blit(self.title, (80, 25))
 
         coordY = 50
-        for number, name, minutes, seconds in self.rendered:
+        for number, row in zip(self.numbers, self.rendered):
             coordY += 50
-            surface.blit(number, (50, coordY))
-            surface.blit(name, (110, coordY))
-            if minutes:
-                surface.blit(minutes, (330, coordY))
-                surface.blit(self.textMin, (375, coordY))
-            surface.blit(seconds, (460, coordY))
-            surface.blit(self.textS, (550, coordY))
+            surface.blit(number, (COLUMN_NUMBER, coordY))
+            surface.blit(row, (COLUMN_NAME, coordY))
@@ -0,0 +1,156 @@
+"""Collision lookup of moving objects grouped by their lanes."""
+import bisect
+
+
+class Lane:
+    """Objects of one track, sorted by the X coordinate of their left edge."""
+
+    def __init__(self, members):
+        """Initialize lane.
+
+        Args:
+            members: Indices of the objects on the lane. List of integers.
+        """
+        self.members = members
+
+        # Members sorted by their collision rect's left edge.
+        self.order = list(members)
+
+        # Vertical span covered by collision rects of the members.
+        self.top = 0
+        self.bottom = 0
+
+        # Widest collision rect of the members.
+        self.maxWidth = 0
+
+
+class LaneIndex:
+    """Finds objects colliding with a rect by checking only lanes it touches.
+
+    All objects of a lane move with the same speed, so their order by X
+    coordinate changes only when an object jumps to the other side of the
+    screen or to another Y coordinate. Lanes with such objects must be passed
+    to refresh(). A query then checks only lanes overlapping the rect and, in
+    each of them, only objects found by bisecting the sorted X coordinates.
+
+    Results are the same as pygame.Rect.collidelist() over the collision rects
+    of all objects would return.
+    """
+
+    def __init__(self, x, y, width, height, laneKeys):
+        """Initialize index.
+
+        Args:
+            x, y:          Collision rect positions. Numpy arrays updated in
+                           place by the owner of the index.
+            width, height: Collision rect sizes. Numpy arrays.
+            laneKeys:      Lane of every object, e.g. (roadTop, roadBottom,
+                           speed) tuples. Objects with the same key must move
+                           together. List.
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+        lanes = {}
+        for idx, key in enumerate(laneKeys):
+            lanes.setdefault(key, []).append(idx)
+
+        self.lanes = [Lane(members) for members in lanes.values()]
+
+        # Object index -> Lane object.
+        self.laneOf = [None] * len(laneKeys)
+        for lane in self.lanes:
+            for idx in lane.members:
+                self.laneOf[idx] = lane
+
+        self.refresh(self.lanes)
+
+    def refresh(self, lanes=None):
+        """Sort lanes again after their objects jumped.
+
+        Args:
+            lanes: Lane objects to refresh. All lanes if None.
+        """
+        if lanes is None:
+            lanes = self.lanes
+
+        x = self.x.tolist()
+        y = self.y.tolist()
+        width = self.width.tolist()
+        height = self.height.tolist()
+
+        for lane in lanes:
+            # Empty rects never collide, so they are left out of the lane.
+            members = [idx for idx in lane.members
+                       if width[idx] > 0 and height[idx] > 0]
+            members.sort(key=lambda idx: (x[idx], idx))
+            lane.order = members
+
+            if members:
+                lane.top = min(y[idx] for idx in members)
+                lane.bottom = max(y[idx] + height[idx] for idx in members)
+                lane.maxWidth = max(width[idx] for idx in members)
+
+            else:
+                lane.top = lane.bottom = lane.maxWidth = 0
+
+    def refreshObjects(self, indices):
+        """Sort lanes of the given objects again.
+
+        Args:
+            indices: Indices of objects which jumped. Iterable of integers.
+        """
+        lanes = {id(self.laneOf[idx]): self.laneOf[idx] for idx in indices}
+        if lanes:
+            self.refresh(lanes.values())
+
+    def collide(self, rect):
+        """Find the first object colliding with rect.
+
+        Args:
+            rect: Rect object to check collisions with.
+
+        Returns:
+            Lowest index of the colliding objects or -1.
+        """
+        if rect.width <= 0 or rect.height <= 0:
+            return -1
+
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        found = -1
+        for lane in self.lanes:
+            if lane.top >= bottom or lane.bottom <= top or not lane.order:
+                continue
+
+            order = lane.order
+            lefts = self.x[order].tolist()
+
+            # Only objects starting before the rect's right edge, but not
+            # further than the widest object to the left of it, can overlap.
+            start = bisect.bisect_right(lefts, left - lane.maxWidth)
+            end = bisect.bisect_left(lefts, right, start)
+
+            for pos in range(start, end):
+                idx = order[pos]
+                if found != -1 and idx > found:
+                    continue
+
+                objY = int(self.y[idx])
+                if (lefts[pos] + int(self.width[idx]) > left
+                        and objY < bottom
+                        and objY + int(self.height[idx]) > top):
+                    found = idx
+
+        return found
+
+
+def laneKeys(sprites):
+    """Return lane keys of cars or floaters placed by Level.
+
+    Args:
+        sprites: List of Car or Floater objects.
+    """
+    return [(s.roadTop, s.roadBottom, s.speed) for s in sprites]
+
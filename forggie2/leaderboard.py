@@ -0,0 +1,302 @@
+"""All completed games with their per level times, stored in SQLite.
+
+Unlike the highscores table, which keeps the best 12 total times, the
+leaderboard keeps every run. Indexes on the total and the level times let
+it answer top N and rank queries without reading all runs.
+"""
+import time
+import sqlite3
+import collections
+
+from textcache import TEXT_CACHE
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    totalMs INTEGER NOT NULL,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runsByTotal ON runs (totalMs, id);
+
+CREATE TABLE IF NOT EXISTS splits (
+    runId INTEGER NOT NULL REFERENCES runs (id),
+    levelIdx INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    levelMs INTEGER NOT NULL,
+    PRIMARY KEY (runId, levelIdx)
+);
+CREATE INDEX IF NOT EXISTS splitsByLevel ON splits (level, levelMs, runId);
+'''
+
+# Seconds to wait for another game process writing to the database.
+BUSY_TIMEOUT = 5
+
+# Rows shown on one page of the leaderboard screen.
+PAGE_SIZE = 12
+
+# Entry of the overall board. rank - position, 1 - the best, runId - id of
+# the run, name - player name, totalMs - total time in miliseconds,
+# finished - time the game finished at, seconds since the epoch.
+RunEntry = collections.namedtuple('RunEntry', ('rank', 'runId', 'name',
+                                               'totalMs', 'finished'))
+
+# Entry of a level board. levelMs - time of the level in miliseconds.
+SplitEntry = collections.namedtuple('SplitEntry', ('rank', 'runId', 'name',
+                                                   'levelMs'))
+
+
+def formatTime(miliseconds):
+    """Return time as 'M:SS.ss' string.
+
+    Args:
+        miliseconds: Time in miliseconds. Integer.
+    """
+    minutes, rest = divmod(miliseconds, 60000)
+    return f'{minutes}:{rest / 1000:05.2f}'
+
+
+class Leaderboard:
+    """Runs stored in an SQLite database file."""
+
+    def __init__(self, path):
+        """Open database, creating it if needed.
+
+        Args:
+            path: Path to the database file. String. ':memory:' - database
+                  in memory.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+
+        # Readers do not wait for a writer, several game processes may share
+        # the file.
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def addRun(self, name, levelTimes, levels, finished=None):
+        """Store a completed game.
+
+        Args:
+            name:       Player name. String.
+            levelTimes: Times of the levels in miliseconds. List of integers.
+            levels:     Level configuration file names, in the order of
+                        levelTimes. Strings.
+            finished:   Time the game finished at, seconds since the epoch.
+                        None - now.
+
+        Returns:
+            Id of the run. Integer.
+        """
+        if finished is None:
+            finished = time.time()
+
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (name, totalMs, finished) VALUES (?, ?, ?)',
+                (name, sum(levelTimes), finished))
+            runId = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO splits (runId, levelIdx, level, levelMs) '
+                'VALUES (?, ?, ?, ?)',
+                [(runId, idx, level, levelMs)
+                 for idx, (level, levelMs) in enumerate(zip(levels,
+                                                            levelTimes))])
+
+        return runId
+
+    def count(self):
+        """Return amount of stored runs."""
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM runs').fetchone()[0]
+
+    def levelCount(self, level):
+        """Return amount of stored times of the level.
+
+        Args:
+            level: Level configuration file name. String.
+        """
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM splits WHERE level = ?',
+            (level,)).fetchone()[0]
+
+    def top(self, limit=PAGE_SIZE, offset=0):
+        """Return the best runs by the total time.
+
+        Equal times are ordered by the time they were stored.
+
+        Args:
+            limit:  Max amount of runs to return. Integer.
+            offset: Amount of the better runs to skip. Integer.
+
+        Returns:
+            List of RunEntry records.
+        """
+        rows = self.connection.execute(
+            'SELECT id, name, totalMs, finished FROM runs '
+            'ORDER BY totalMs, id LIMIT ? OFFSET ?', (limit, offset))
+        return [RunEntry(rank, *row)
+                for rank, row in enumerate(rows, offset + 1)]
+
+    def topLevel(self, level, limit=PAGE_SIZE, offset=0):
+        """Return the best times of one level.
+
+        Args:
+            level:  Level configuration file name. String.
+            limit:  Max amount of times to return. Integer.
+            offset: Amount of the better times to skip. Integer.
+
+        Returns:
+            List of SplitEntry records.
+        """
+        rows = self.connection.execute(
+            'SELECT splits.runId, runs.name, splits.levelMs FROM splits '
+            'JOIN runs ON runs.id = splits.runId WHERE splits.level = ? '
+            'ORDER BY splits.levelMs, splits.runId LIMIT ? OFFSET ?',
+            (level, limit, offset))
+        return [SplitEntry(rank, *row)
+                for rank, row in enumerate(rows, offset + 1)]
+
+    def rank(self, totalMs):
+        """Return position a run with the total time would get.
+
+        Runs equal to the stored ones are placed after them.
+
+        Args:
+            totalMs: Total time in miliseconds. Integer.
+        """
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM runs WHERE totalMs <= ?',
+            (totalMs,)).fetchone()[0] + 1
+
+    def levelRank(self, level, levelMs):
+        """Return position a time of the level would get.
+
+        Args:
+            level:   Level configuration file name. String.
+            levelMs: Time of the level in miliseconds. Integer.
+        """
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM splits WHERE level = ? AND levelMs <= ?',
+            (level, levelMs)).fetchone()[0] + 1
+
+    def splits(self, runId):
+        """Return level times of the run.
+
+        Returns:
+            List of (level configuration file name, miliseconds) tuples.
+        """
+        return self.connection.execute(
+            'SELECT level, levelMs FROM splits WHERE runId = ? '
+            'ORDER BY levelIdx', (runId,)).fetchall()
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
+
+
+class LeaderboardView:
+    """Leaderboard screen: pages of the overall board and the level boards.
+    """
+
+    def __init__(self, leaderboard, levels, pageSize=PAGE_SIZE):
+        """Initialize view.
+
+        Args:
+            leaderboard: Leaderboard object.
+            levels:      Levels of the game as (configuration file name,
+                         level name) tuples.
+            pageSize:    Rows per page. Integer.
+        """
+        self.leaderboard = leaderboard
+        self.levels = tuple(levels)
+        self.pageSize = pageSize
+
+        # Shown board: 0 - overall, 1... - level of the same number.
+        self.board = 0
+        self.page = 0
+
+        # Title, rows and footer of the shown page as (Surface, position)
+        # tuples. None - page changed since it was rendered.
+        self.rendered = None
+
+    def show(self):
+        """Show the first page of the overall board."""
+        self.board = 0
+        self.page = 0
+        self.rendered = None
+
+    def pageCount(self):
+        """Return amount of pages of the shown board."""
+        if self.board == 0:
+            count = self.leaderboard.count()
+        else:
+            count = self.leaderboard.levelCount(self.levels[self.board - 1][0])
+
+        return max(1, -(-count // self.pageSize))
+
+    def nextPage(self):
+        """Show the next page, if there is one."""
+        if self.page + 1 < self.pageCount():
+            self.page += 1
+            self.rendered = None
+
+    def previousPage(self):
+        """Show the previous page, if there is one."""
+        if self.page > 0:
+            self.page -= 1
+            self.rendered = None
+
+    def nextBoard(self):
+        """Switch to the next level board, after the last to the overall."""
+        self.board = (self.board + 1) % (len(self.levels) + 1)
+        self.page = 0
+        self.rendered = None
+
+    def entries(self):
+        """Return (rank, name, miliseconds) tuples of the shown page."""
+        offset = self.page * self.pageSize
+        if self.board == 0:
+            return [(entry.rank, entry.name, entry.totalMs)
+                    for entry in self.leaderboard.top(self.pageSize,
+                                                      offset)]
+
+        level = self.levels[self.board - 1][0]
+        return [(entry.rank, entry.name, entry.levelMs)
+                for entry in self.leaderboard.topLevel(level, self.pageSize,
+                                                       offset)]
+
+    def render(self):
+        """Render the shown page."""
+        if self.board == 0:
+            title = 'Leaderboard'
+        else:
+            title = f'Level {self.board}: {self.levels[self.board - 1][1]}'
+
+        rendered = [(TEXT_CACHE.render(title, 60), (40, 25))]
+
+        coordY = 50
+        for rank, name, miliseconds in self.entries():
+            coordY += 50
+            rendered += [(TEXT_CACHE.render(f'{rank}.', 40), (30, coordY)),
+                         (TEXT_CACHE.render(name, 40), (150, coordY)),
+                         (TEXT_CACHE.render(formatTime(miliseconds), 40),
+                          (420, coordY))]
+
+        footer = (f'Page {self.page + 1}/{self.pageCount()}   '
+                  '<left>/<right> - page, <tab> - level')
+        rendered.append((TEXT_CACHE.render(footer, 26), (30, 740)))
+        self.rendered = rendered
+
+    def draw(self, surface):
+        """Draw the shown page.
+
+        Args:
+            surface: Surface object to draw on.
+        """
+        if self.rendered is None:
+            self.render()
+
+        for text, position in self.rendered:
+            surface.blit(text, position)
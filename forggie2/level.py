@@ -1,9 +1,12 @@
 """"Class to load a level."""
 import os
-import configparser
+import random
 
 import pygame
 
+from clock import TickClock
+from eventlog import LOG
+from configregistry import REGISTRY
 from staticsprite import StaticImage
 from frog import Frog
 from car import Car
@@ -13,7 +16,8 @@ from floater import Floater
 class Level:
     """Holds level parameters as attributes."""
 
-    def __init__(self, configDir, imageDir, screenWidth, screenHeight):
+    def __init__(self, configDir, imageDir, screenWidth, screenHeight,
+                 clock=None, seed=None):
         """Initialize level.
 
         Args:
@@ -21,20 +25,21 @@ class Level:
             imageDir:    Absolute path to the image folder. String.
             screenWidth: Game window width in pixels. Integer.
             screenHeight Game window height in pixels. Integer.
+            clock:       Clock driving level animations and timer.
+                         TickClock object. None - new TickClock.
+            seed:        Seed of the random car positions. Integer. The same
+                         seed places and moves cars the same way every time.
+                         None - seeded from the operating system.
         """
         self.configDir = configDir
         self.imageDir = imageDir
         self.screenWidth = screenWidth
         self.screenHeight = screenHeight
+        self.clock = clock or TickClock()
 
-        # Car track section configuration names from level?.conf files.
-        self.allowedTrackSections = ('track1', 'track2', 'track3', 'track4',
-                                     'track5')
-
-        # Water object track section configuration names in level?.conf files.
-        self.allowedRiverSections = ('waterTrack1', 'waterTrack2',
-                                     'waterTrack3', 'waterTrack4',
-                                     'waterTrack5')
+        # Random numbers used by the cars of this level only, so levels
+        # simulated side by side do not affect each other.
+        self.rng = random.Random(seed)
 
         # Level Name. String.
         self.name = None
@@ -60,7 +65,8 @@ class Level:
         # List of car objects used in the level.
         self.cars = None
 
-        # List of dictionaries defining each water track.
+        # Tuple of configregistry.TrackConfig records defining each water
+        # track.
         self.riverTracks = None
 
         # List of river tracks' rects to use later for collision detection.
@@ -69,60 +75,42 @@ class Level:
         # List of floater objects used in the level.
         self.floaters = None
 
-        # List of StaticImage's of car shadows.
+        # List of car shadow sprites.
         self.shadows = None
 
-    def loadCars(self, config, allowedSections):
+        # Speeds cars and floaters were created with. calcPositions() turns
+        # them to the direction of the track, reset() needs them again.
+        self.initialSpeeds = None
+
+        # Sprite groups to draw floaters, cars and car shadows with.
+        self.floaterSprites = None
+        self.carSprites = None
+        self.shadowSprites = None
+
+    def loadCars(self, tracks):
         """Load all cars used in the level.
 
         Args:
-            config:          Parsed level config object.
-                             configparser.ConfigParser object.
-            allowedSections: List or tuple of names used in configuration
-                             files to specify configuration for a track
-                             section.
+            tracks: Enabled car tracks of the level. Tuple of
+                    configregistry.TrackConfig records.
         """
         cars = []
         shadows = []
-        for trackSection in allowedSections:
-            print(f'Loading track: {trackSection}')
-
-            if not config[trackSection].getboolean('enabled'):
-                continue
-
-            cfg = config[trackSection]
-
-            gaps = []
-            for amount in cfg.get('gaps').replace(' ', '').split(','):
-                gaps.append(int(amount))
-
-            track = {'top': cfg.getint('top'),
-                     'bottom': cfg.getint('bottom'),
-                     'direction': cfg.get('direction'),
-                     'speed': cfg.getint('speed'),
-                     'gaps': gaps,
-                     }
-
-            # Get names of config files for cars for the level.
-            configFilenames = cfg.get('cars').replace(' ', '').split(',')
+        for track in tracks:
+            LOG.debug('Loading track', track=track.section)
 
             # Load specified cars.
             trackCars = []
             carShadows = []
             carWidth = 0
             initPos = 0
-            for idx, configName in enumerate(configFilenames):
-                configPath = os.path.join(self.configDir, configName)
-                if idx == len(gaps):
-                    msg = (f"No gap defined for car '{configPath}' in "
-                           f"section '{trackSection}'.")
-                    print(msg)
-                    raise ValueError(msg)
-                car = Car(configPath, roadDirection=track['direction'],
+            for idx, carConfig in enumerate(track.objects):
+                car = Car(carConfig, roadDirection=track.direction,
                           screenWidth=self.screenWidth,
                           screenHeight=self.screenHeight,
-                          roadTop=track['top'], roadBottom=track['bottom'],
-                          gapInFront=gaps[idx], speed=track['speed'])
+                          roadTop=track.top, roadBottom=track.bottom,
+                          gapInFront=track.gaps[idx], speed=track.speed,
+                          rng=self.rng)
 
                 # Calculate and set starting position of the car.
                 if idx == 0:
@@ -154,57 +142,27 @@ class Level:
 
         return (cars, shadows)
 
-    def loadFloaters(self, config, allowedSections):
+    def loadFloaters(self, tracks):
         """Load objects floating in the water.
 
         Args:
-            config:          Parsed level config object.
-                             configparser.ConfigParser object.
-            allowedSections: List or tuple of names used in configuration
-                             files to specify configuration for a track
-                             section.
+            tracks: Enabled river tracks of the level. Tuple of
+                    configregistry.TrackConfig records.
         """
-        riverTracks = []
         floatingObjects = []
-        for trackSection in allowedSections:
-
-            if not config[trackSection].getboolean('enabled'):
-                continue
-
-            cfg = config[trackSection]
-
-            gaps = []
-            for amount in cfg.get('gaps').replace(' ', '').split(','):
-                gaps.append(int(amount))
-
-            track = {'top': cfg.getint('top'),
-                     'bottom': cfg.getint('bottom'),
-                     'direction': cfg.get('direction'),
-                     'speed': cfg.getint('speed'),
-                     'gaps': gaps,
-                     }
-            riverTracks.append(track)
-
-            # Get names of config files for the floaters for the level.
-            configFilenames = cfg.get('floaters').replace(' ', '').split(',')
+        for track in tracks:
 
             # Load specified water objects.
             waterObjects = []
-            for idx, configName in enumerate(configFilenames):
-                configPath = os.path.join(self.configDir, configName)
-                if idx == len(gaps):
-                    msg = (f"No gap defined for floater '{configPath}' in "
-                           f"section '{trackSection}'.")
-                    print(msg)
-                    raise ValueError(msg)
-                stuff = Floater(configPath,
-                                roadDirection=track['direction'],
+            for idx, floaterConfig in enumerate(track.objects):
+                stuff = Floater(floaterConfig,
+                                roadDirection=track.direction,
                                 screenWidth=self.screenWidth,
                                 screenHeight=self.screenHeight,
-                                roadTop=track['top'],
-                                roadBottom=track['bottom'],
-                                gapInFront=gaps[idx],
-                                speed=track['speed'])
+                                roadTop=track.top,
+                                roadBottom=track.bottom,
+                                gapInFront=track.gaps[idx],
+                                speed=track.speed)
 
                 # Calculate and set starting position of the floater.
                 if idx == 0:
@@ -232,7 +190,7 @@ class Level:
 
             floatingObjects += waterObjects
 
-        return (riverTracks, floatingObjects)
+        return floatingObjects
 
     def load(self, levelConfigPath):
         """Load the level.
@@ -241,36 +199,29 @@ class Level:
             levelConfigPath: Absolute path to the level configuration
                              file. String.
         """
-        config = configparser.ConfigParser()
-        config.read(levelConfigPath)
-
-        cfg = config['general']
-        self.name = cfg.get('name', '')
+        cfg = REGISTRY.level(levelConfigPath)
+        self.name = cfg.name
 
         # Level background image.
-        path = cfg.get('background')
-        self.background = StaticImage(os.path.join(self.imageDir, path))
+        self.background = StaticImage(os.path.join(self.imageDir,
+                                                   cfg.background))
 
-        self.frogPosX = cfg.getint('frogPosX')
-        self.frogPosY = cfg.getint('frogPosY')
-        self.frogCollisionWidth = cfg.getint('frogCollisionWidth')
-        self.frogCollisionHeight = cfg.getint('frogCollisionHeight')
+        self.frogPosX = cfg.frogPosX
+        self.frogPosY = cfg.frogPosY
+        self.frogCollisionWidth = cfg.frogCollisionWidth
+        self.frogCollisionHeight = cfg.frogCollisionHeight
 
-        path = cfg.get('frog')
         self.frog = Frog(self.frogPosX, self.frogPosY,
                          self.screenWidth, self.screenHeight,
-                         self.configDir, self.imageDir)
+                         self.configDir, self.imageDir, clock=self.clock)
 
         # Load finish image.
-        filepath = cfg.get('finishImage')
-        posX = cfg.getint('finishImageX')
-        posY = cfg.getint('finishImageY')
-        centerX = cfg.getint('finishCenterWidth')
-        centerY = cfg.getint('finishcenterHeight')
+        centerX = cfg.finishCenterWidth
+        centerY = cfg.finishCenterHeight
 
-        finish = StaticImage(os.path.join(self.imageDir, filepath),
+        finish = StaticImage(os.path.join(self.imageDir, cfg.finishImage),
                              useAlpha=True)
-        finish.rect.topleft = (posX, posY)
+        finish.rect.topleft = (cfg.finishImageX, cfg.finishImageY)
         width = int((finish.rect.width - centerX) / 2)
         height = int((finish.rect.height - centerY) / 2)
         finish.collisionRect = pygame.Rect(finish.rect.left + width,
@@ -278,19 +229,45 @@ class Level:
                                            centerX, centerY)
         self.finishImage = finish
 
-        self.cars, self.shadows = self.loadCars(config,
-                                                self.allowedTrackSections)
+        self.cars, self.shadows = self.loadCars(cfg.tracks)
 
-        riverTracks, floatingObjects = self.loadFloaters(
-            config, self.allowedRiverSections)
+        riverTracks = cfg.riverTracks
+        floatingObjects = self.loadFloaters(riverTracks)
 
-        if riverTracks:
-            riverTrackRects = []
-            for track in riverTracks:
-                rect = pygame.Rect(0, track['top'], self.screenWidth,
-                                   track['bottom'] - track['top'])
-                riverTrackRects.append(rect)
+        riverTrackRects = []
+        for track in riverTracks:
+            rect = pygame.Rect(0, track.top, self.screenWidth,
+                               track.bottom - track.top)
+            riverTrackRects.append(rect)
 
         self.riverTracks = riverTracks
         self.floaters = floatingObjects
         self.riverTrackRects = riverTrackRects
+
+        self.initialSpeeds = [
+            -obj.speed if obj.direction == 'to_left' else obj.speed
+            for obj in self.cars + self.floaters]
+
+        self.floaterSprites = pygame.sprite.RenderUpdates(self.floaters)
+        self.carSprites = pygame.sprite.RenderUpdates(self.cars)
+        self.shadowSprites = pygame.sprite.RenderUpdates(self.shadows)
+
+    def reset(self, seed=None):
+        """Put the loaded level back to its initial state.
+
+        Cars, floaters and the frog are moved to their starting positions
+        without reading any files or creating sprites, the same way load()
+        places them for the seed.
+
+        Args:
+            seed: Seed of the random car positions. Integer. None - seeded
+                  from the operating system.
+        """
+        self.rng.seed(seed)
+        self.clock.reset()
+
+        for obj, speed in zip(self.cars + self.floaters, self.initialSpeeds):
+            obj.speed = speed
+            obj.calcPositions()
+
+        self.frog.reset()
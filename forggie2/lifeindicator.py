@@ -1,6 +1,9 @@
 """Life indicator."""
+import os
 import pygame
 from animatedsprite import AnimatedSprite
+from configregistry import REGISTRY
+from textcache import TEXT_CACHE
 
 MAX_LIFES = 10
 
@@ -8,37 +11,31 @@ MAX_LIFES = 10
 class LifeIndicator:
     """Class to show life crystal animations."""
 
-    def __init__(self, config, configDir, imageDir):
+    def __init__(self, gameConfig, configDir, imageDir):
         """Initialize object to show frog lifes.
 
         Args:
-            config:    Configuration found in game.conf section
-                       [LifeIndicator].
-                       ConfigParser object.
-            configDir: Game settings directory. String.
-            imageDir:  Image directory. String.
+            gameConfig: Game configuration with life indicator settings
+                        found in game.conf section [LifeIndicator].
+                        configregistry.GameConfig record.
+            configDir:  Game settings directory. String.
+            imageDir:   Image directory. String.
         """
         self.configDir = configDir
         self.imageDir = imageDir
 
-        font = pygame.font.Font(None, 27)
-        self.text = font.render('Lifes:', True, pygame.Color('white'))
+        self.text = TEXT_CACHE.render('Lifes:', 27)
 
-        pos = config.get('textPosition').split(',')
-        self.textPosition = (int(pos[0]), int(pos[1]))
+        self.textPosition = gameConfig.lifeTextPosition
 
+        animationConfig = REGISTRY.animation(os.path.join(self.configDir,
+                                                          'life_crystal.conf'))
         self.all = []
-        for i in range(1, MAX_LIFES + 1):
-            position = config.get('pos' + str(i))
-            if position:
-                position = position.split(',')
-                posX = int(position[0])
-                posY = int(position[1])
-                self.all.append(AnimatedSprite('life_crystal.conf',
-                                               self.configDir, self.imageDir,
-                                               (posX, posY), isActive=True))
-
-        self.crystalGroup = pygame.sprite.Group(self.all)
+        for position in gameConfig.lifePositions[:MAX_LIFES]:
+            self.all.append(AnimatedSprite(animationConfig, self.imageDir,
+                                           position, isActive=True))
+
+        self.crystalGroup = pygame.sprite.RenderUpdates(self.all)
 
     def resetLifes(self):
         """Set lifes back to maximum."""
@@ -46,7 +43,7 @@ class LifeIndicator:
         for animation in self.all:
             animation.currentFrame = 0
 
-        self.crystalGroup = pygame.sprite.Group(self.all)
+        self.crystalGroup.add(self.all)
 
     def update(self, frog):
         """Show how many lifes left on the screen.
@@ -71,7 +68,10 @@ class LifeIndicator:
 
         Args:
             surface: Surface to draw on to.
+
+        Returns:
+            List of Rect objects of the changed areas.
         """
-        surface.blit(self.text, self.textPosition)
+        rects = [surface.blit(self.text, self.textPosition)]
         self.crystalGroup.update()
-        self.crystalGroup.draw(surface)
+        return rects + self.crystalGroup.draw(surface)
@@ -1,9 +1,12 @@
 """Functions to load data (images, sounds etc.)."""
 
 import os
+import collections
 import pygame
 from pygame.locals import *
 
+from eventlog import LOG, DEBUG, EVENT_IMAGE_LOADED
+
 MAIN_DIR = os.path.split(os.path.abspath(__file__))[0]
 IMAGES_DIR = os.path.join(MAIN_DIR, '..', 'images')
 
@@ -11,30 +14,183 @@ IMAGES_DIR = os.path.join(MAIN_DIR, '..', 'images')
 SOUNDS_DIR = os.path.join(MAIN_DIR, '..', 'sounds')
 
 
+class ImageCache:
+    """Process wide cache of loaded (and converted) image surfaces.
+
+    Surfaces are kept in least recently used order. If the size limit is set,
+    the least recently used surfaces are dropped from the cache when the total
+    size of the cached pixel data goes over the limit.
+    """
+
+    def __init__(self, maxBytes=None):
+        """Initialize cache.
+
+        Args:
+            maxBytes: Max amount of bytes of pixel data to keep in the cache.
+                      None - no limit. Integer.
+        """
+        self.maxBytes = maxBytes
+
+        # Key -> surface. The last entry is the most recently used one.
+        self.surfaces = collections.OrderedDict()
+
+        # Amount of bytes used by the cached surfaces.
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def surfaceSize(surface):
+        """Return amount of bytes used by surface's pixel data."""
+        return surface.get_pitch() * surface.get_height()
+
+    def get(self, key):
+        """Return cached surface or None, if there is no such surface.
+
+        Args:
+            key: Cache key. Tuple with absolute image path and boolean telling
+                 if alpha channel is used.
+        """
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.surfaces.move_to_end(key)
+        return surface
+
+    def put(self, key, surface):
+        """Store surface in the cache.
+
+        Args:
+            key:     Cache key. Tuple.
+            surface: Surface object to store.
+        """
+        old = self.surfaces.pop(key, None)
+        if old is not None:
+            self.size -= self.surfaceSize(old)
+
+        self.surfaces[key] = surface
+        self.size += self.surfaceSize(surface)
+
+        if self.maxBytes is None:
+            return
+
+        # Drop least recently used surfaces, but always keep the newest one.
+        while self.size > self.maxBytes and len(self.surfaces) > 1:
+            _, dropped = self.surfaces.popitem(last=False)
+            self.size -= self.surfaceSize(dropped)
+
+    def clear(self):
+        """Remove all surfaces from the cache and reset the counters."""
+        self.surfaces.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+# Cache used by loadImage().
+IMAGE_CACHE = ImageCache()
+
+# AssetBundle images are taken from before reading image files or None.
+BUNDLE = None
+
+# Images read by decodeImage() and not yet converted by loadImage(): absolute
+# path -> surface.
+#
+# decodeImage() runs on the preloader thread, everything else here on the
+# main thread. The thread only looks keys up in IMAGE_CACHE.surfaces and
+# stores to DECODED, the main thread pops from DECODED; single dict
+# operations are atomic, so no lock is needed. At worst an image is decoded
+# on both threads and the unused copy stays in DECODED until the next
+# loadImage() of it. ImageCache itself (size, eviction) is used only on the
+# main thread.
+DECODED = {}
+
+
+def useBundle(assetBundle):
+    """Take images and configuration files from the bundle.
+
+    Args:
+        assetBundle: bundle.AssetBundle object. None - read files again.
+    """
+    global BUNDLE
+    BUNDLE = assetBundle
+
+
+def decodeImage(name):
+    """Read image file ahead of time.
+
+    Only reads and decodes the file, does not touch the display, so it can be
+    called from a worker thread. The next loadImage() of the image only
+    converts the decoded surface.
+
+    Args:
+        name: Image filename. String.
+    """
+    fullname = os.path.normpath(os.path.join(IMAGES_DIR, name))
+    cached = IMAGE_CACHE.surfaces
+    if ((fullname, False) in cached or (fullname, True) in cached
+            or fullname in DECODED):
+        return
+
+    # Bundled images need no decoding.
+    if BUNDLE is not None and BUNDLE.hasImage(fullname):
+        return
+
+    try:
+        DECODED[fullname] = pygame.image.load(fullname)
+    except pygame.error:
+        # loadImage() reports missing images.
+        pass
+
+
 def loadImage(name, useAlpha=False):
     """Load image.
 
+    Decoded (and converted to the display pixel format) image is cached, so
+    every image file is read from disk only once. Cached surface is shared
+    between all callers and must not be modified in place.
+
     Args:
         name:     Image filename. String.
         useAlpha: Should we use image's alpha channel and there defined
                   transparency? Boolean.
+
+    Returns:
+        Tuple with image surface and a new rect of the image.
     """
-    fullname = os.path.join(IMAGES_DIR, name)
-    try:
-        image = pygame.image.load(fullname)
-    except pygame.error:
-        print(f'Could not load image: {fullname}')
-        raise SystemExit(str(geterror()))
+    fullname = os.path.normpath(os.path.join(IMAGES_DIR, name))
+    key = (fullname, useAlpha)
+
+    image = IMAGE_CACHE.get(key)
+    if image is not None:
+        return image, image.get_rect()
+
+    image = DECODED.pop(fullname, None)
+    if image is None and BUNDLE is not None:
+        image = BUNDLE.image(fullname)
+
+    if image is None:
+        try:
+            image = pygame.image.load(fullname)
+        except pygame.error:
+            LOG.error(f'Could not load image: {fullname}')
+            raise SystemExit(str(geterror()))
 
-    method = ''
-    if useAlpha:
-        method = 'alpha channel'
-        image.convert_alpha()
+    # Surfaces can be converted to the display pixel format only when display
+    # mode is set (it is not when running without a window).
+    if pygame.display.get_surface() is not None:
+        if useAlpha:
+            image = image.convert_alpha()
+        else:
+            image = image.convert()
 
-    else:
-        image.convert()
+    LOG.event(EVENT_IMAGE_LOADED, level=DEBUG, path=fullname)
 
-    print(f'Successfully loaded {fullname}.')
+    IMAGE_CACHE.put(key, image)
 
     return image, image.get_rect()
 
@@ -45,7 +201,7 @@ def loadSound(name):
     try:
         sound = pygame.mixer.Sound(fullname)
     except pygame.error:
-        print(f'Could not load sound file: {fullname}')
+        LOG.error(f'Could not load sound file: {fullname}')
         raise SystemExit(str(geterror()))
 
     return sound
@@ -1,6 +1,10 @@
 """Class to print log messages on top of the game screen."""
+import collections
+
 import pygame
 
+from textcache import TEXT_CACHE, getFont
+
 
 class Logger:
     """Class to log on top of the game screen."""
@@ -26,7 +30,7 @@ class Logger:
         self.textColour = (255, 255, 255)
 
         # Selects default font.
-        self.font = pygame.font.Font(None, self.fontSize)
+        self.font = getFont(None, self.fontSize)
 
         # Margins to leave from screen edges when displaying messages.
         self.topMargin = topMargin
@@ -34,12 +38,13 @@ class Logger:
         self.leftMargin = leftMargin
         self.rightMargin = rightMargin
 
-        # All (split) messages to be shown on screen.
-        self.messages = []
-
-        # Max amount of messages to store in self.messages.
+        # Max amount of messages to keep.
         self.messageBufferSize = 100
 
+        # Newest logged messages, as they were given. Messages are split to
+        # fit the screen only when they are displayed.
+        self.entries = collections.deque(maxlen=self.messageBufferSize)
+
         # Count of newest entries from the log message buffer to show on
         # screen.
         self.messageShowCount = 35
@@ -52,6 +57,10 @@ class Logger:
         # lines.
         self.verticalGap = 20
 
+        # Shown messages drawn on one surface. None - messages were logged
+        # after it was drawn.
+        self.rendered = None
+
     @staticmethod
     def splitText(msg, count):
         """Split line of text into chunks to fit screen.
@@ -103,10 +112,18 @@ class Logger:
         if not logToScreen:
             return
 
-        # Decrease message buffer size to the configured size.
-        if len(self.messages) > self.messageBufferSize:
-            self.messages = self.messages[:self.messageBufferSize]
+        self.entries.append(msg)
+        self.rendered = None
+
+    def splitMessage(self, msg):
+        """Split message into lines that fit the screen width.
 
+        Args:
+            msg: Message as a string of text.
+
+        Returns:
+            List of text strings.
+        """
         # Screen width in pixels available to put a string of text.
         availableWidth = self.screenWidth - self.leftMargin - self.rightMargin
 
@@ -116,10 +133,48 @@ class Logger:
         # Amount of times we need to split our message in order to fit it.
         splitCount = float(width / availableWidth)
 
-        # Our message divided into parts.
-        divided = self.splitText(msg, splitCount)
-
-        self.messages = self.messages + divided
+        return self.splitText(msg, splitCount)
+
+    @property
+    def messages(self):
+        """Return all kept messages split into lines. List of strings."""
+        lines = []
+        for msg in self.entries:
+            lines += self.splitMessage(msg)
+
+        return lines
+
+    def shownLines(self):
+        """Return lines of the newest messages that fit on the screen."""
+        lines = []
+        for msg in reversed(self.entries):
+            lines[:0] = self.splitMessage(msg)
+            if len(lines) >= self.messageShowCount:
+                break
+
+        return lines[-self.messageShowCount:]
+
+    def render(self):
+        """Draw shown lines on the self.rendered surface."""
+        rendered = [TEXT_CACHE.render(line, self.fontSize, self.textColour,
+                                      antialias=self.antialias)
+                    for line in self.shownLines()]
+
+        width = max((line.get_width() for line in rendered), default=0)
+        height = 0
+        if rendered:
+            height = ((len(rendered) - 1) * self.verticalGap
+                      + max(line.get_height() for line in rendered))
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        for idx, line in enumerate(rendered):
+            # Max of the text and the transparent black surface is an exact
+            # copy, unlike alpha blending.
+            surface.blit(line, (0, idx * self.verticalGap),
+                         special_flags=pygame.BLEND_RGBA_MAX)
+
+        self.rendered = surface
 
     def displayMessages(self, screen):
         """Display stored messages on the screen.
@@ -128,12 +183,9 @@ class Logger:
             screen: Pygame screen object.
 
         Returns:
-            None.
+            List of Rect objects of the changed areas.
         """
-        xPos = self.msgX
-        yPos = self.msgY
+        if self.rendered is None:
+            self.render()
 
-        for msg in self.messages[-self.messageShowCount:]:
-            rendered = self.font.render(msg, self.antialias, self.textColour)
-            screen.blit(rendered, (xPos, yPos))
-            yPos += self.verticalGap
+        return [screen.blit(self.rendered, (self.msgX, self.msgY))]
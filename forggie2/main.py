@@ -3,23 +3,37 @@
 
 import os
 import sys
-import bisect
+import time
 import functools
-import configparser
 
 import pygame
 from pygame.locals import *
 
-from level import Level
+from configregistry import REGISTRY
 from logger import Logger
+from eventlog import LOG, OverlaySink, JsonLinesSink, DEBUG
+from eventlog import EVENT_LEVEL_LOADED, EVENT_DEATH, EVENT_LEVEL_COMPLETED
+from eventlog import EVENT_GAME_COMPLETED, EVENT_FRAME_STATS
 from highscores import Highscores
+from leaderboard import Leaderboard, LeaderboardView
 from staticsprite import StaticImage
 from lifeindicator import LifeIndicator
+from renderer import LevelRenderer
+from replay import Recorder, newSeed
+from preloader import LevelPreloader
+from bundle import AssetBundle, BUNDLE_PATH
+import loaders
+from profiler import FrameProfiler, ProfilerOverlay
+from profiler import PHASE_EVENTS, PHASE_GAME, PHASE_OBJECTS
+from profiler import PHASE_FROG_DRAW, PHASE_HUD, PHASE_FLIP, TOTAL
+from textcache import TEXT_CACHE, getFont
+from simulation import Simulation, Inputs, NO_INPUTS, EVENT_COMPLETED
+from simulation import EVENT_KILLED, EVENT_DROWNED, EVENT_GAME_OVER
 
 if not pygame.font:
-    print('Warning, fonts disabled.')
+    LOG.warning('Fonts disabled.')
 if not pygame.mixer:
-    print('Warning, sound disabled.')
+    LOG.warning('Sound disabled.')
 
 # Directory for game, level, object and animation settings.
 MAIN_DIR = os.path.split(os.path.abspath(__file__))[0]
@@ -36,6 +50,19 @@ PLAYER_NAME_CHARS = (K_0, K_1, K_2, K_3, K_4, K_5, K_6, K_7, K_8, K_9,
                      K_k, K_l, K_m, K_n, K_o, K_p, K_q, K_r, K_s, K_t,
                      K_u, K_v, K_w, K_x, K_y, K_z)
 
+# Max amount of simulation steps to run per drawn frame. If drawing is too
+# slow to keep up, the game slows down instead of skipping frog movement.
+MAX_STEPS_PER_FRAME = 3
+
+# Keys controlling the frog and Inputs field names they set.
+INPUT_KEYS = {K_UP: 'up',
+              K_DOWN: 'down',
+              K_LEFT: 'left',
+              K_RIGHT: 'right',
+              K_c: 'cont',
+              K_r: 'restart',
+              }
+
 # Max allowed length for player name in highscores table.
 MAX_LEN_PLAYER_NAME = 9
 
@@ -64,7 +91,7 @@ class Text:
         self.rendered = None
         self.halignment = None
         self.screenWidth = None
-        self.font = pygame.font.Font(self.fontName, self.size)
+        self.font = getFont(self.fontName, self.size)
 
     @property
     def halignment(self):
@@ -81,19 +108,22 @@ class Text:
 
     def render(self):
         """Render text."""
-        self.rendered = self.font.render(self.msg, True,
-                                         pygame.Color(self.colour))
+        self.rendered = TEXT_CACHE.render(self.msg, self.size, self.colour,
+                                          self.fontName)
 
     def draw(self, surface):
         """Draw text on the given surface.
 
         Args:
             surface: Surface object to draw text on.
+
+        Returns:
+            Rect object of the changed area.
         """
         if not self.rendered:
             self.render()
 
-        surface.blit(self.rendered, self.position)
+        return surface.blit(self.rendered, self.position)
 
 
 class Game:
@@ -109,11 +139,10 @@ class Game:
         self.configDir = configDir
         self.imageDir = imageDir
 
-        self.gameConfig = configparser.ConfigParser()
-        self.gameConfig.read(os.path.join(configDir, 'game.conf'))
+        self.gameConfig = REGISTRY.game(os.path.join(configDir, 'game.conf'))
 
-        self.screenWidth = self.gameConfig['general'].getint('screenWidth')
-        self.screenHeight = self.gameConfig['general'].getint('screenHeight')
+        self.screenWidth = self.gameConfig.screenWidth
+        self.screenHeight = self.gameConfig.screenHeight
 
         pygame.init()
         pygame.display.set_caption('Forggie2')
@@ -122,6 +151,14 @@ class Game:
 
         self.clock = pygame.time.Clock()
 
+        # Game events are also written to a JSON lines file, if configured.
+        if self.gameConfig.logPath:
+            LOG.addSink(JsonLinesSink(self.gameConfig.logPath))
+
+        # Loads levels ahead of time and keeps them for the next games.
+        self.preloader = LevelPreloader(configDir, imageDir,
+                                        self.screenWidth, self.screenHeight)
+
         # Menu images.
         self.itemStartOn = None
         self.itemStartOff = None
@@ -210,8 +247,7 @@ class Game:
         Args:
             levelTimes:  List of integers which are times required to
                          finish each level.
-            scores:      List of dictionaries with entries from highscore
-                         list.
+            scores:      Best results. highscores.TopScores object.
 
         Returns:
             Object of type Text with rendered text line.
@@ -220,9 +256,7 @@ class Game:
         minutes = int(totalSeconds / 60)
         seconds = totalSeconds % 60
 
-        onlySeconds = [x['totalSeconds'] for x in scores]
-        scorePosition = bisect.bisect(onlySeconds, totalSeconds)
-        scorePosition += 1  # Lowest bisect result will be 0.
+        scorePosition = scores.rank(totalSeconds)
 
         if scorePosition == 2:
             scorePositionText = '2nd'
@@ -257,16 +291,12 @@ class Game:
 
         Args:
             screen: Surface object to draw level on.
-            scores: All highscores as a list of dictionaries. All
-                    scores are sorted from best to worst.
+            scores: Best results. highscores.TopScores object.
         """
         self.renderTexts(self.screenWidth)
-        lifesCfg = self.gameConfig['LifeIndicator']
 
         # Get from config file the levels defined.
-        levels = []
-        for level in self.gameConfig['general']['levels'].split(','):
-            levels.append(level.strip())
+        levels = self.gameConfig.levels
 
         # Logging configuration.
         logger = Logger(screenWidth=self.screenWidth,
@@ -275,6 +305,20 @@ class Game:
         # By default do not show log messages.
         showLogs = False
 
+        # Messages of all levels are shown on top of the screen with <`>.
+        overlaySink = OverlaySink(logger, minLevel=DEBUG)
+        LOG.addSink(overlaySink)
+
+        # Times of frame phases, shown on top of the screen with <F3>.
+        profiler = FrameProfiler()
+        profilerOverlay = ProfilerOverlay(profiler, budget=1000 / FRAME_RATE)
+        showProfiler = False
+        if self.gameConfig.profilerTracePath:
+            profiler.openTrace(self.gameConfig.profilerTracePath)
+
+        # Push only changed screen areas to the display.
+        useDirtyRects = self.gameConfig.dirtyRects
+
         # Elements to enter highscore achiever's name.
         overlay = StaticImage('transparent.png', useAlpha=True)
 
@@ -283,6 +327,9 @@ class Game:
         # Text object to show what position player achieved.
         textPosition = None
 
+        # Text object to show player name being entered.
+        textPlayerName = None
+
         # Integer saying in which in our highscore would the result fit (1-13).
         scorePosition = None
 
@@ -299,69 +346,90 @@ class Game:
         # Store times for each completed level.
         levelTimes = []
 
-        for levelConfigPath in levels:
-            levelConfigPath = os.path.join(self.configDir, levelConfigPath)
-            print(f"Loading level '{levelConfigPath}'...")
+        # Records inputs of the game to the replay file.
+        replayPath = self.gameConfig.replayPath
+        recorder = Recorder(FRAME_RATE) if replayPath else None
+
+        # Cars are placed from known seeds, so levels can be replayed and
+        # built before they are played.
+        levelPaths = [os.path.join(self.configDir, name) for name in levels]
+        seeds = [newSeed() for _ in levels]
+
+        # Files of the next level are read while the current one is played.
+        preloader = self.preloader
+        if levelPaths:
+            preloader.prepare(levelPaths[0])
 
-            level = Level(self.configDir, self.imageDir, self.screenWidth,
-                          self.screenHeight)
-            level.load(levelConfigPath)
+        lifeIndicator = LifeIndicator(self.gameConfig, self.configDir,
+                                      self.imageDir)
 
-            waterObjects = pygame.sprite.RenderPlain(level.floaters)
-            trafficCars = pygame.sprite.RenderPlain(level.cars)
-            carShadows = pygame.sprite.RenderPlain(level.shadows)
+        for levelIdx, levelName in enumerate(levels):
+            levelConfigPath = levelPaths[levelIdx]
+            seed = seeds[levelIdx]
+            if recorder:
+                recorder.startLevel(levelName, seed)
 
-            trafficCarsCollideRects = []
-            for car in level.cars:
-                trafficCarsCollideRects.append(car.collisionRect)
+            loadStart = time.perf_counter()
+            level = preloader.take(levelConfigPath, FRAME_RATE, seed)
+            LOG.event(EVENT_LEVEL_LOADED, levelName=levelName, seed=seed,
+                      loadMs=round((time.perf_counter() - loadStart) * 1000,
+                                   2))
+            levelClock = level.clock
 
-            floaterCollideRects = []
-            for floater in level.floaters:
-                floaterCollideRects.append(floater.collisionRect)
+            nextLevelPath = None
+            if levelIdx + 1 < len(levels):
+                nextLevelPath = levelPaths[levelIdx + 1]
+                nextSeed = seeds[levelIdx + 1]
+                preloader.prepare(nextLevelPath)
 
-            lifeIndicator = LifeIndicator(lifesCfg, self.configDir,
-                                          self.imageDir)
+            waterObjects = level.floaterSprites
+            trafficCars = level.carSprites
+            carShadows = level.shadowSprites
 
-            groundObjects = pygame.sprite.OrderedUpdates(level.background,
-                                                         level.finishImage,
-                                                         waterObjects)
+            lifeIndicator.resetLifes()
+
+            renderer = LevelRenderer(self.screen, level,
+                                     useDirtyRects=useDirtyRects)
+
+            # Drawing times of the last frames in seconds.
+            renderTimes = []
 
             highscoreOverlay = pygame.sprite.OrderedUpdates(overlay)
 
             frog = level.frog
 
-            msg = '%s: Level %s' % (self.gameConfig['general']['name'],
-                                    level.name)
+            msg = '%s: Level %s' % (self.gameConfig.name, level.name)
             pygame.display.set_caption(msg)
 
             msg = 'Level: ' + level.name
             textLevelName = Text(msg, position=(5, 770), size=30)
 
+            simulation = Simulation(level)
+            simulation.profiler = profiler
+
             # Holds player name after the completion of the game.
             playerName = ''
 
-            # Marks if frog ran out of lifes.
-            gameOver = False
-
-            # Marks if level is completed.
-            levelCompleted = False
+            screen = self.screen
 
-            # Temporary value to calculate the period of inactivity.
-            inactiveTimeStart = None
+            # Keys pressed, but not yet passed to the simulation.
+            pressed = dict.fromkeys(NO_INPUTS._fields, False)
 
-            currentTime = pygame.time.get_ticks()
-            inactiveTime = currentTime
-            levelTime = currentTime - inactiveTime
+            # Last logged river collision. Logged only when it changes, so
+            # the log overlay is not redrawn every frame.
+            loggedRiverCollision = None
 
-            screen = self.screen
+            # Do not count level loading time as played time.
+            clock.tick()
 
             going = True
             while going and not (quitApplication or pressedEsc):
-                clock.tick(FRAME_RATE)
+                elapsed = clock.tick(FRAME_RATE)
+                profiler.beginFrame()
 
                 for event in pygame.event.get():
                     if event.type == QUIT:
-                        print('Quiting application!')
+                        LOG.info('Quiting application!')
                         quitApplication = True
 
                     elif event.type == KEYDOWN:
@@ -369,188 +437,198 @@ class Game:
                             pressedEsc = True
 
                         if event.key in (K_RETURN, K_KP_ENTER):
-                            if levelCompleted:
-                                inactiveTimeStart = 0
+                            if simulation.levelCompleted:
                                 going = False
 
-                        elif event.key == K_UP:
-                            frog.pressedUp = True
-
-                        elif event.key == K_DOWN:
-                            frog.pressedDown = True
+                        elif gameCompleted and event.key in PLAYER_NAME_CHARS:
+                            if len(playerName) < MAX_LEN_PLAYER_NAME:
+                                playerName += chr(event.key)
 
-                        elif event.key == K_LEFT:
-                            frog.pressedLeft = True
-
-                        elif event.key == K_RIGHT:
-                            frog.pressedRight = True
-
-                        elif (event.key == K_c
-                              and (frog.isDead or frog.isDrowned)
-                              and not gameOver):
-                            frog.pressedUp = False
-                            frog.pressedDown = False
-                            frog.pressedLeft = False
-                            frog.pressedRight = False
-
-                            frog.isDead = False
-                            frog.isDrowned = False
-                            frog.moveToStart()
-
-                            inactiveTime += (pygame.time.get_ticks()
-                                             - inactiveTimeStart)
-                            inactiveTimeStart = 0
-
-                        elif event.key == K_r and gameOver:
-                            frog.pressedUp = False
-                            frog.pressedDown = False
-                            frog.pressedLeft = False
-                            frog.pressedRight = False
-
-                            gameOver = False
-                            frog.isDead = False
-                            frog.isDrowned = False
-                            frog.lifesLeft = 3
-                            frog.moveToStart()
-                            lifeIndicator.resetLifes()
-
-                            inactiveTime += (pygame.time.get_ticks()
-                                             - inactiveTimeStart)
-                            inactiveTimeStart = 0
+                        elif event.key in INPUT_KEYS:
+                            pressed[INPUT_KEYS[event.key]] = True
 
                         elif event.key == K_BACKQUOTE:
                             # Turn on/off showing log messages on top of the
                             # screen.
                             showLogs = not showLogs
 
-                        elif gameCompleted and event.key in PLAYER_NAME_CHARS:
-                            if len(playerName) < MAX_LEN_PLAYER_NAME:
-                                playerName += chr(event.key)
+                        elif event.key == K_F3:
+                            showProfiler = not showProfiler
+
+                        elif event.key == K_F2:
+                            # Switch between dirty rects and full screen
+                            # updates to compare their frame cost.
+                            useDirtyRects = not useDirtyRects
+                            renderer.setDirtyRects(useDirtyRects)
+                            renderTimes = []
 
                         elif gameCompleted and event.key == K_BACKSPACE:
                             playerName = playerName[:-1]
 
-                frogCollide = frog.collisionRect.collidelist
-
-                collisionWithCars = frogCollide(trafficCarsCollideRects)
-
-                finishRect = level.finishImage.collisionRect
-                collisionsWithFinish = frog.collisionRect.colliderect(
-                    finishRect)
-
-                if level.riverTrackRects:
-                    collisionWithRiver = frogCollide(level.riverTrackRects)
-                    logger.log(f'collisionWithRiver: {collisionWithRiver}')
-                else:
-                    collisionWithRiver = None
-
-                collisionWithFloaters = frogCollide(floaterCollideRects)
-
-                # Clear area under sprites.
-                waterObjects.clear(screen, level.background)
-
-                waterObjects.update()
-                trafficCars.update()
-
-                groundObjects.draw(screen)
+                profiler.lap(PHASE_EVENTS)
+
+                # Run as many fixed length simulation steps as fit into the
+                # elapsed real time. Pressed keys go to the first step.
+                events = []
+                steps = levelClock.accumulate(elapsed,
+                                              maxSteps=MAX_STEPS_PER_FRAME)
+                for _ in range(steps):
+                    inputs = Inputs(**pressed)
+                    pressed = dict.fromkeys(NO_INPUTS._fields, False)
+                    if inputs.restart and simulation.gameOver:
+                        lifeIndicator.resetLifes()
+
+                    if recorder:
+                        recorder.record(inputs)
+
+                    events += simulation.step(inputs)
+
+                if (level.riverTrackRects and simulation.collisionWithRiver
+                        != loggedRiverCollision):
+                    loggedRiverCollision = simulation.collisionWithRiver
+                    LOG.debug(f'collisionWithRiver: {loggedRiverCollision}')
+
+                if EVENT_GAME_OVER in events:
+                    LOG.debug('Game Over. All lifes lost!')
+
+                for simEvent in events:
+                    if simEvent in (EVENT_KILLED, EVENT_DROWNED):
+                        LOG.event(EVENT_DEATH, levelName=levelName,
+                                  cause=simEvent, lifesLeft=frog.lifesLeft,
+                                  levelTime=simulation.levelTime)
+
+                if EVENT_COMPLETED in events:
+                    LOG.event(EVENT_LEVEL_COMPLETED, levelName=levelName,
+                              levelTime=simulation.levelTime)
+                    levelTimes.append(simulation.levelTime)
+                    if recorder:
+                        recorder.completeLevel(simulation.levelTime)
+                    levelsLeft -= 1
+                    if levelsLeft == 0:
+                        gameCompleted = True
+
+                # Build the next level while "Level completed" is shown, so
+                # <enter> switches to it at once. A level played twice in a
+                # row is the same pooled object, it is reset when taken.
+                if (simulation.levelCompleted and nextLevelPath
+                        and nextLevelPath != levelConfigPath
+                        and preloader.isReady(nextLevelPath)):
+                    preloader.build(nextLevelPath, FRAME_RATE, nextSeed)
+
+                profiler.lap(PHASE_GAME)
+
+                renderStart = time.perf_counter()
+                simulation.syncSprites()
+                renderer.beginFrame()
+                addRects = renderer.addRects
+
+                renderer.drawGroup(waterObjects)
 
                 if DRAW_COLLISION_RECTS:
                     for floater in level.floaters:
-                        pygame.draw.rect(screen, (255, 0, 0), floater.rect, 1)
-
-                    for carRect in trafficCarsCollideRects:
-                        pygame.draw.rect(screen, (255, 0, 0), carRect, 1)
+                        addRects(pygame.draw.rect(screen, (255, 0, 0),
+                                                  floater.rect, 1))
 
-                frog.update(collisionWithCars, collisionWithRiver,
-                            collisionWithFloaters, level.floaters,
-                            level.riverTracks)
-                frog.draw(screen)
+                    for carRect in simulation.carCollideRects:
+                        addRects(pygame.draw.rect(screen, (255, 0, 0),
+                                                  carRect, 1))
 
-                carShadows.draw(screen)
-                trafficCars.draw(screen)
+                profiler.lap(PHASE_OBJECTS)
+                addRects(frog.draw(screen))
+                profiler.lap(PHASE_FROG_DRAW)
 
-                if not (frog.isDead or frog.isDrowned) and not levelCompleted:
-                    currentTime = pygame.time.get_ticks()
-                    levelTime = currentTime - inactiveTime
+                renderer.drawGroup(carShadows)
+                renderer.drawGroup(trafficCars)
+                profiler.lap(PHASE_OBJECTS)
 
                 # Show lifes' indicator.
                 lifeIndicator.update(frog)
-                lifeIndicator.draw(screen)
+                addRects(lifeIndicator.draw(screen))
 
-                textLevelName.draw(screen)
-                self.textLevelTime.draw(screen)
+                addRects(textLevelName.draw(screen))
+                addRects(self.textLevelTime.draw(screen))
 
                 # Show level time.
-                font = pygame.font.Font(None, 30)
-                timeRendered = font.render(str(round(levelTime / 1000.0, 1)),
-                                           True, pygame.Color('white'))
-                screen.blit(timeRendered, (535, 770))
+                levelTime = simulation.levelTime
+                addRects(TEXT_CACHE.drawGlyphs(
+                    screen, str(round(levelTime / 1000.0, 1)), (535, 770),
+                    size=30))
 
                 # Show level completion message.
-                if collisionsWithFinish:
-                    if not levelCompleted:
-                        levelTimes.append(levelTime)
-                        levelsLeft -= 1
-                        if levelsLeft == 0:
-                            gameCompleted = True
-
-                    levelCompleted = True
-                    frog.isLocked = True
-
+                if simulation.levelCompleted:
                     if not gameCompleted:
-                        self.textLevelCompleted.draw(screen)
-                        self.textToNextLevel.draw(screen)
-
-                elif (frog.isDead or frog.isDrowned) and frog.lifesLeft == 0:
-                    msg = 'Game Over. All lifes lost!'
-                    logger.log(msg, screen)
-                    gameOver = True
-                    self.textLevelFailed.draw(screen)
-                    self.textLevelFailed2.draw(screen)
-
-                    if not inactiveTimeStart:
-                        inactiveTimeStart = pygame.time.get_ticks()
+                        addRects(self.textLevelCompleted.draw(screen))
+                        addRects(self.textToNextLevel.draw(screen))
 
-                elif (frog.isDead or frog.isDrowned) and not gameOver:
-                    self.textFrogDied.draw(screen)
-                    self.textFrogDied2.draw(screen)
+                elif simulation.gameOver:
+                    addRects(self.textLevelFailed.draw(screen))
+                    addRects(self.textLevelFailed2.draw(screen))
 
-                    if not inactiveTimeStart:
-                        inactiveTimeStart = pygame.time.get_ticks()
+                elif simulation.frogIsDown:
+                    addRects(self.textFrogDied.draw(screen))
+                    addRects(self.textFrogDied2.draw(screen))
 
                 if gameCompleted:
-                    highscoreOverlay.draw(screen)
-                    self.textCongrats.draw(screen)
+                    addRects(highscoreOverlay.draw(screen))
+                    addRects(self.textCongrats.draw(screen))
 
                     if not textPosition:
                         textPosition, scorePosition = \
                                 self.renderAchievedPositionText(levelTimes,
                                                                 scores)
 
-                    textPosition.draw(screen)
+                    addRects(textPosition.draw(screen))
 
                     # Request to enter player's name, if result is good enough
                     # to go to the highscore board.
                     if scorePosition <= 12:
-                        self.textEnterName.draw(screen)
+                        addRects(self.textEnterName.draw(screen))
 
-                        textPlayerName = Text(playerName, position=(0, 370),
-                                              size=45)
-                        textPlayerName.screenWidth = self.screenWidth
-                        textPlayerName.halignment = 'center'
-                        textPlayerName.draw(screen)
+                        if (textPlayerName is None
+                                or textPlayerName.msg != playerName):
+                            textPlayerName = Text(playerName,
+                                                  position=(0, 370), size=45)
+                            textPlayerName.screenWidth = self.screenWidth
+                            textPlayerName.halignment = 'center'
 
-                    self.textToMenu.draw(screen)
+                        addRects(textPlayerName.draw(screen))
 
-                if showLogs:
-                    logger.displayMessages(screen)
-
-                pygame.display.flip()
+                    addRects(self.textToMenu.draw(screen))
 
-            if quitApplication:
+                if showLogs:
+                    addRects(logger.displayMessages(screen))
+
+                if showProfiler:
+                    addRects(profilerOverlay.draw(screen))
+
+                profiler.lap(PHASE_HUD)
+                renderer.endFrame()
+                profiler.lap(PHASE_FLIP)
+                profiler.endFrame()
+
+                # Average time spent on drawing, to compare render modes.
+                renderTimes.append(time.perf_counter() - renderStart)
+                if len(renderTimes) == FRAME_RATE:
+                    mode = 'dirty rects' if renderer.useDirtyRects else 'flip'
+                    average = sum(renderTimes) / len(renderTimes) * 1000
+                    LOG.event(EVENT_FRAME_STATS, level=DEBUG, mode=mode,
+                              renderMs=round(average, 2),
+                              totalMsP95=round(
+                                  profiler.percentiles(TOTAL, (95,))[0], 2))
+                    renderTimes = []
+
+            # Do not load the remaining levels of an aborted game.
+            if quitApplication or pressedEsc:
                 break
 
-        print(f'LevelTimes: {levelTimes}')
+        LOG.info('Game finished', levelTimes=levelTimes)
+        profiler.closeTrace()
+        LOG.removeSink(overlaySink)
+
+        # A game aborted with <esc> does not replace the last replay.
+        if recorder and not pressedEsc:
+            recorder.save(replayPath)
+            LOG.info(f"Replay saved to '{replayPath}'.")
 
         if gameCompleted:
             totalSeconds = sum(levelTimes) / 1000
@@ -561,11 +639,14 @@ class Game:
                      'name': playerName,
                      'minutes': minutes,
                      'seconds': seconds,
+                     'levelTimes': levelTimes,
                      }
         else:
             score = None
 
-        print(f'score: {score}')
+        if score:
+            LOG.event(EVENT_GAME_COMPLETED, totalSeconds=score['totalSeconds'],
+                      levelTimes=levelTimes)
         return score, quitApplication, pressedEsc
 
     def loadMenuImages(self):
@@ -611,12 +692,22 @@ class Game:
 
         backgroundObjects = pygame.sprite.OrderedUpdates(self.background)
 
-        scorePath = self.gameConfig['general'].get('highscorePath')
+        scorePath = self.gameConfig.highscorePath
 
         highscores = Highscores()
         highscores.load(scorePath)
         highscores.render()
 
+        # All completed games, shown instead of the highscores, if kept.
+        leaderboard = None
+        leaderboardView = None
+        if self.gameConfig.leaderboardPath:
+            leaderboard = Leaderboard(self.gameConfig.leaderboardPath)
+            levels = [(name, REGISTRY.level(os.path.join(self.configDir,
+                                                         name)).name)
+                      for name in self.gameConfig.levels]
+            leaderboardView = LeaderboardView(leaderboard, levels)
+
         menuLevel = 1
         menuItemActive = 1
 
@@ -635,6 +726,14 @@ class Game:
                         menuLevel -= 1
                         showHighScores = False
 
+                    elif showHighScores and leaderboardView:
+                        if event.key == K_RIGHT:
+                            leaderboardView.nextPage()
+                        elif event.key == K_LEFT:
+                            leaderboardView.previousPage()
+                        elif event.key == K_TAB:
+                            leaderboardView.nextBoard()
+
                     if event.key in (K_RETURN, K_KP_ENTER):
                         if menuItemActive == 3:
                             quitApplication = True
@@ -643,21 +742,37 @@ class Game:
                             menuLevel += 1
                             showHighScores = True
 
+                            # Show results of other game processes sharing
+                            # the highscores journal.
+                            if highscores.refresh():
+                                highscores.render()
+
+                            if leaderboardView:
+                                leaderboardView.show()
+
                         elif menuItemActive == 1:
+                            if highscores.refresh():
+                                highscores.render()
+
                             score, quitApplication, pressedEsc = self.play(
-                                self.screen, highscores.scores)
+                                self.screen, highscores.top)
 
                             if quitApplication:
-                                print('Quitting application...')
+                                LOG.info('Quitting application...')
+                                self.preloader.close()
                                 pygame.quit()
                                 sys.exit(0)
 
                             # Save score only if user left level by pressing
                             # <enter> key.
                             if score and not pressedEsc:
-                                highscores.scores.append(score)
+                                highscores.submit(score)
                                 highscores.render()
-                                highscores.save(scorePath)
+
+                                if leaderboard:
+                                    leaderboard.addRun(
+                                        score['name'], score['levelTimes'],
+                                        self.gameConfig.levels)
 
                     elif event.key == K_UP:
                         menuItemActive -= 1
@@ -674,7 +789,10 @@ class Game:
             backgroundObjects.draw(self.screen)
 
             if showHighScores:
-                highscores.draw(self.screen)
+                if leaderboardView:
+                    leaderboardView.draw(self.screen)
+                else:
+                    highscores.draw(self.screen)
                 pygame.display.flip()
                 continue
 
@@ -702,13 +820,37 @@ class Game:
             pygame.display.flip()
 
         if quitApplication:
-            print('Quitting application...')
+            LOG.info('Quitting application...')
+            self.preloader.close()
+            if leaderboard:
+                leaderboard.close()
             pygame.quit()
             sys.exit(0)
 
 
 def main():
     """Entry point to start the game."""
+    # Packed images and configuration files (bin/forggie2-bundle.py) are
+    # used instead of the separate files, if present.
+    if os.path.exists(BUNDLE_PATH):
+        try:
+            assetBundle = AssetBundle(BUNDLE_PATH, IMAGE_DIR, CONFIG_DIR)
+        except ValueError as exc:
+            LOG.warning(f'{exc} Rebuild it with bin/forggie2-bundle.py. '
+                        'Using the separate files.')
+        else:
+            stale = assetBundle.staleFiles()
+            if stale:
+                LOG.warning(f"Asset bundle '{BUNDLE_PATH}' is older than "
+                            f'{len(stale)} files, for example '
+                            f"'{stale[0]}'. Rebuild it with "
+                            'bin/forggie2-bundle.py. Using the separate '
+                            'files.')
+                assetBundle.close()
+            else:
+                LOG.info(f"Using asset bundle '{BUNDLE_PATH}'.")
+                loaders.useBundle(assetBundle)
+
     game = Game(CONFIG_DIR, IMAGE_DIR)
     game.showMenu()
 
@@ -0,0 +1,163 @@
+"""Loading of the next level while the current one is played."""
+import os
+import concurrent.futures
+
+import loaders
+from clock import TickClock
+from level import Level
+from configregistry import REGISTRY
+from frog import ANIMATION_CONFIGS
+
+
+def levelImages(levelConfigPath, configDir):
+    """Return filenames of all images used by the level.
+
+    Args:
+        levelConfigPath: Absolute path to the level configuration file.
+                         String.
+        configDir:       Game settings directory. String.
+    """
+    cfg = REGISTRY.level(levelConfigPath)
+
+    images = [cfg.background, cfg.finishImage]
+    for track in cfg.tracks:
+        for carConfig in track.objects:
+            images += [carConfig.image, carConfig.shadowImage]
+
+    for track in cfg.riverTracks:
+        images += [floaterConfig.image for floaterConfig in track.objects]
+
+    for configName in ANIMATION_CONFIGS:
+        animationConfig = REGISTRY.animation(os.path.join(configDir,
+                                                          configName))
+        images.append(animationConfig.filename)
+
+    # Keep the order, drop duplicates.
+    return list(dict.fromkeys(images))
+
+
+class LevelPreloader:
+    """Prepares levels ahead of time and keeps them for reuse.
+
+    prepare() reads configuration and image files of a level on a worker
+    thread. build() then creates the Level object on the main thread, where
+    only the decoded images are converted to the display format. take()
+    returns the built level or builds it right away, if it was not prepared.
+
+    Built levels stay in a pool keyed by the configuration path. Taking a
+    level again, in the same or in the next game, only resets it (see
+    Level.reset()), no files are read and no sprites are created.
+    """
+
+    def __init__(self, configDir, imageDir, screenWidth, screenHeight):
+        """Initialize preloader.
+
+        Args:
+            configDir:    Game settings directory. String.
+            imageDir:     Image directory. String.
+            screenWidth:  Game window width in pixels. Integer.
+            screenHeight: Game window height in pixels. Integer.
+        """
+        self.configDir = configDir
+        self.imageDir = imageDir
+        self.screenWidth = screenWidth
+        self.screenHeight = screenHeight
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='LevelPreloader')
+
+        # Level configuration path -> Future of the file reading.
+        self.pending = {}
+
+        # Level configuration path -> Level object loaded so far.
+        self.pool = {}
+
+        # Level configuration path -> seed the pooled level was placed with,
+        # for levels built ahead and not taken yet.
+        self.built = {}
+
+    def prepare(self, levelConfigPath):
+        """Start reading files of the level on the worker thread.
+
+        Args:
+            levelConfigPath: Absolute path to the level configuration file.
+                             String.
+        """
+        if levelConfigPath in self.pool:
+            return
+
+        if levelConfigPath not in self.pending:
+            self.pending[levelConfigPath] = self.executor.submit(
+                self.readFiles, levelConfigPath)
+
+    def readFiles(self, levelConfigPath):
+        """Parse configuration files and decode images of the level.
+
+        Runs on the worker thread. REGISTRY parses under its lock, and
+        loaders.decodeImage() only stores to loaders.DECODED (see there).
+        """
+        for name in levelImages(levelConfigPath, self.configDir):
+            loaders.decodeImage(os.path.join(self.imageDir, name))
+
+    def isReady(self, levelConfigPath):
+        """Return True if files of the level were read."""
+        if levelConfigPath in self.pool:
+            return True
+
+        future = self.pending.get(levelConfigPath)
+        return future is not None and future.done()
+
+    def build(self, levelConfigPath, frameRate, seed=None):
+        """Create the Level object ahead of time or reset the pooled one.
+
+        Args:
+            levelConfigPath: Absolute path to the level configuration file.
+                             String.
+            frameRate:       Frame rate of the level clock. Integer.
+            seed:            Seed of the random car positions. Integer.
+        """
+        if self.built.get(levelConfigPath, ()) == seed:
+            return
+
+        level = self.pool.get(levelConfigPath)
+        if level is not None and level.clock.frameRate == frameRate:
+            level.reset(seed)
+            self.built[levelConfigPath] = seed
+            return
+
+        future = self.pending.pop(levelConfigPath, None)
+        if future is not None:
+            # Errors are reported by the loading on the main thread.
+            concurrent.futures.wait([future])
+
+        level = Level(self.configDir, self.imageDir, self.screenWidth,
+                      self.screenHeight, clock=TickClock(frameRate),
+                      seed=seed)
+        level.load(levelConfigPath)
+        self.pool[levelConfigPath] = level
+        self.built[levelConfigPath] = seed
+
+    def take(self, levelConfigPath, frameRate, seed=None):
+        """Return the loaded level, building it now if needed.
+
+        Args:
+            levelConfigPath: Absolute path to the level configuration file.
+                             String.
+            frameRate:       Frame rate of the level clock. Integer.
+            seed:            Seed of the random car positions. Integer.
+
+        Returns:
+            Level object in its initial state. Its cars are placed from the
+            given seed. The same object is returned for the path every time,
+            so the previously taken one must not be used anymore.
+        """
+        self.build(levelConfigPath, frameRate, seed)
+        del self.built[levelConfigPath]
+        return self.pool[levelConfigPath]
+
+    def close(self):
+        """Stop the worker thread and forget the pooled levels."""
+        self.executor.shutdown(wait=True)
+        self.pending = {}
+        self.pool = {}
+        self.built = {}
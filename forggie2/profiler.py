@@ -0,0 +1,297 @@
+"""Measuring where the time of every frame goes.
+
+Usage per frame:
+    profiler.beginFrame()
+    ... handle events ...
+    profiler.lap(PHASE_EVENTS)
+    ... draw sprites ...
+    profiler.lap(PHASE_OBJECTS)
+    profiler.endFrame()
+
+lap() adds the time passed since the previous lap (or beginFrame()) to the
+given phase, so a phase may be lapped several times per frame (e.g. once per
+simulation step).
+"""
+import csv
+import json
+import time
+import collections
+
+import pygame
+
+from textcache import TEXT_CACHE
+
+# Frame phases in the order they happen in the game loop.
+PHASE_EVENTS = 'events'
+PHASE_COLLISIONS = 'collisions'
+PHASE_TRAFFIC = 'traffic'
+PHASE_FROG = 'frog'
+# Logging the simulation events and building the next level.
+PHASE_GAME = 'game'
+PHASE_OBJECTS = 'objects'
+PHASE_FROG_DRAW = 'frogDraw'
+PHASE_HUD = 'hud'
+PHASE_FLIP = 'flip'
+PHASES = (PHASE_EVENTS, PHASE_COLLISIONS, PHASE_TRAFFIC, PHASE_FROG,
+          PHASE_GAME, PHASE_OBJECTS, PHASE_FROG_DRAW, PHASE_HUD, PHASE_FLIP)
+
+# Whole frame from beginFrame() to endFrame(), including time between laps.
+TOTAL = 'total'
+
+# Percentiles shown by the overlay.
+PERCENTILES = (50, 95, 99)
+
+# Amount of the last frames percentiles are calculated from.
+WINDOW_SIZE = 240
+
+# Trace file formats, chosen by the file name extension.
+TRACE_CSV = '.csv'
+TRACE_JSON = '.json'
+
+
+def percentile(values, pct):
+    """Return nearest rank percentile.
+
+    Args:
+        values: Sorted list of numbers.
+        pct:    Percentile, 0-100. Integer.
+    """
+    if not values:
+        return 0.0
+
+    rank = -(-len(values) * pct // 100)
+    return values[max(rank, 1) - 1]
+
+
+class FrameProfiler:
+    """Collects per phase frame times and keeps rolling percentiles."""
+
+    def __init__(self, phases=PHASES, windowSize=WINDOW_SIZE,
+                 timer=time.perf_counter):
+        """Initialize profiler.
+
+        Args:
+            phases:     Names of the measured phases. Tuple of strings.
+            windowSize: Amount of the last frames kept. Integer.
+            timer:      Function returning current time in seconds.
+        """
+        self.phases = tuple(phases)
+        self.timer = timer
+
+        # Phase -> times of the last frames in miliseconds.
+        self.history = {name: collections.deque(maxlen=windowSize)
+                        for name in self.phases + (TOTAL,)}
+
+        # Phase times of the current frame in seconds.
+        self.current = dict.fromkeys(self.phases, 0.0)
+
+        self.frameStart = None
+        self.lapStart = None
+        self.frameCount = 0
+
+        # Open trace file, its format and csv.writer for CSV traces.
+        self.traceFile = None
+        self.traceFormat = None
+        self.traceWriter = None
+
+    def beginFrame(self):
+        """Start measuring a new frame."""
+        self.frameStart = self.lapStart = self.timer()
+        for name in self.current:
+            self.current[name] = 0.0
+
+    def lap(self, phase):
+        """Add time since the previous lap to the phase.
+
+        Args:
+            phase: Phase name. String.
+        """
+        now = self.timer()
+        self.current[phase] += now - self.lapStart
+        self.lapStart = now
+
+    def endFrame(self):
+        """Finish the frame: store its times and write them to the trace.
+
+        Returns:
+            Dict phase -> time in miliseconds of the finished frame.
+        """
+        frame = {name: seconds * 1000
+                 for name, seconds in self.current.items()}
+        frame[TOTAL] = (self.timer() - self.frameStart) * 1000
+
+        for name, value in frame.items():
+            self.history[name].append(value)
+
+        if self.traceFile is not None:
+            self.writeTrace(frame)
+
+        self.frameCount += 1
+        return frame
+
+    def percentiles(self, phase, pcts=PERCENTILES):
+        """Return percentiles of the phase times of the last frames.
+
+        Args:
+            phase: Phase name or TOTAL. String.
+            pcts:  Percentiles to calculate. Tuple of integers.
+
+        Returns:
+            Tuple of times in miliseconds, one per percentile.
+        """
+        values = sorted(self.history[phase])
+        return tuple(percentile(values, pct) for pct in pcts)
+
+    def summary(self, pcts=PERCENTILES):
+        """Return percentiles of all phases.
+
+        Returns:
+            Dict phase -> tuple of times in miliseconds.
+        """
+        return {name: self.percentiles(name, pcts) for name in self.history}
+
+    def openTrace(self, path):
+        """Start appending times of every frame to a file.
+
+        Frames of every profiler are numbered from 0, so frame 0 starts the
+        trace of the next game in the file.
+
+        Args:
+            path: Path to the trace file. '.csv' - comma separated values,
+                  '.json' - one JSON object per line.
+        """
+        self.closeTrace()
+
+        if path.endswith(TRACE_CSV):
+            self.traceFormat = TRACE_CSV
+        elif path.endswith(TRACE_JSON):
+            self.traceFormat = TRACE_JSON
+        else:
+            raise ValueError(f"Unknown trace file format '{path}'.")
+
+        self.traceFile = open(path, 'a', newline='')
+        if self.traceFormat == TRACE_CSV:
+            self.traceWriter = csv.writer(self.traceFile)
+            if self.traceFile.tell() == 0:
+                self.traceWriter.writerow(('frame',) + self.phases + (TOTAL,))
+
+    def writeTrace(self, frame):
+        """Write times of one frame to the trace file."""
+        if self.traceFormat == TRACE_CSV:
+            self.traceWriter.writerow(
+                [self.frameCount] + [f'{frame[name]:.3f}'
+                                     for name in self.phases + (TOTAL,)])
+        else:
+            record = {'frame': self.frameCount}
+            record.update((name, round(value, 3))
+                          for name, value in frame.items())
+            self.traceFile.write(json.dumps(record) + '\n')
+
+    def closeTrace(self):
+        """Finish writing the trace file."""
+        if self.traceFile is not None:
+            self.traceFile.close()
+
+        self.traceFile = None
+        self.traceFormat = None
+        self.traceWriter = None
+
+
+class ProfilerOverlay:
+    """Draws phase percentiles and a sparkline of frame times."""
+
+    def __init__(self, profiler, budget, position=(330, 40), fontSize=18,
+                 refreshFrames=12):
+        """Initialize overlay.
+
+        Args:
+            profiler:      FrameProfiler object.
+            budget:        Time available for a frame in miliseconds. Float.
+            position:      Tuple with X and Y coordinates of the top left
+                           corner.
+            fontSize:      Text size. Integer.
+            refreshFrames: Redraw the table every so many frames. Integer.
+        """
+        self.profiler = profiler
+        self.budget = budget
+        self.position = position
+        self.fontSize = fontSize
+        self.refreshFrames = refreshFrames
+
+        self.rowHeight = fontSize - 2
+        self.labelWidth = 80
+        self.columnWidth = 55
+        self.sparklineHeight = 40
+
+        rows = len(profiler.phases) + 2
+        width = self.labelWidth + self.columnWidth * len(PERCENTILES) + 10
+        height = rows * self.rowHeight + self.sparklineHeight + 15
+        self.panel = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        # Frame count at the last table redraw.
+        self.drawnFrame = None
+
+    def render(self):
+        """Draw the table and the sparkline on the panel."""
+        panel = self.panel
+        panel.fill((0, 0, 0, 170))
+        size = self.fontSize
+        summary = self.profiler.summary()
+
+        header = ('ms',) + tuple(f'p{pct}' for pct in PERCENTILES)
+        rows = [(name,) + tuple(f'{value:.1f}' for value in summary[name])
+                for name in self.profiler.phases + (TOTAL,)]
+
+        posY = 5
+        for row in [header] + rows:
+            colour = 'red' if row[0] == TOTAL and \
+                float(row[2]) > self.budget else 'white'
+            panel.blit(TEXT_CACHE.render(row[0], size, colour), (5, posY))
+            for col, value in enumerate(row[1:]):
+                posX = self.labelWidth + col * self.columnWidth
+                TEXT_CACHE.drawGlyphs(panel, value, (posX, posY), size,
+                                      colour)
+            posY += self.rowHeight
+
+        self.renderSparkline(posY + 5)
+
+    def renderSparkline(self, top):
+        """Draw frame times of the last frames as vertical lines.
+
+        Args:
+            top: Y coordinate of the sparkline on the panel. Integer.
+        """
+        panel = self.panel
+        width = panel.get_width() - 10
+        height = self.sparklineHeight
+        bottom = top + height
+
+        # Twice the budget fills the whole height.
+        scale = height / (2 * self.budget)
+        totals = list(self.profiler.history[TOTAL])[-width:]
+        for posX, value in enumerate(totals, start=5):
+            lineHeight = min(int(value * scale), height)
+            colour = (255, 80, 80) if value > self.budget else (80, 220, 80)
+            pygame.draw.line(panel, colour, (posX, bottom),
+                             (posX, bottom - lineHeight))
+
+        budgetY = bottom - int(self.budget * scale)
+        pygame.draw.line(panel, (255, 255, 0), (5, budgetY),
+                         (5 + width, budgetY))
+
+    def draw(self, surface):
+        """Draw the overlay.
+
+        Args:
+            surface: Surface object to draw on.
+
+        Returns:
+            Rect object of the changed area.
+        """
+        frameCount = self.profiler.frameCount
+        if (self.drawnFrame is None
+                or frameCount - self.drawnFrame >= self.refreshFrames):
+            self.render()
+            self.drawnFrame = frameCount
+
+        return surface.blit(self.panel, self.position)
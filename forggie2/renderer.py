@@ -0,0 +1,107 @@
+"""Drawing of a level onto the screen."""
+import pygame
+
+
+class LevelRenderer:
+    """Draws level sprites and on screen texts and updates the display.
+
+    In dirty rectangle mode only the screen areas which changed since the
+    previous frame are restored from the background and pushed to the
+    display. Otherwise the whole background is redrawn and the whole display
+    is flipped every frame. Both modes produce the same picture.
+
+    Usage per frame:
+        renderer.beginFrame()
+        renderer.drawGroup(group) / renderer.addRects(text.draw(screen))
+        renderer.endFrame()
+    """
+
+    def __init__(self, screen, level, useDirtyRects=True):
+        """Initialize renderer.
+
+        Args:
+            screen:        Display surface. Surface object.
+            level:         Loaded level. Level object.
+            useDirtyRects: Update only changed screen areas. Boolean.
+        """
+        self.screen = screen
+        self.useDirtyRects = useDirtyRects
+
+        # Everything that does not move: background with the finish image.
+        self.staticLayer = level.background.image.copy()
+        self.staticLayer.blit(level.finishImage.image,
+                              level.finishImage.rect)
+
+        # Sprite groups drawn during the current and the previous frame.
+        self.groups = []
+        self.previousGroups = []
+
+        # Screen areas changed by the drawing not done through sprite groups
+        # (texts etc.) during the current and the previous frame.
+        self.rects = []
+        self.previousRects = []
+
+        # Areas of the screen to push to the display.
+        self.dirtyRects = []
+
+        # First frame must always be drawn fully.
+        self.redrawAll = True
+
+    def setDirtyRects(self, useDirtyRects):
+        """Switch between dirty rectangle and full screen update modes.
+
+        Args:
+            useDirtyRects: Update only changed screen areas. Boolean.
+        """
+        self.useDirtyRects = useDirtyRects
+        self.redrawAll = True
+
+    def beginFrame(self):
+        """Restore background under everything drawn in the previous frame."""
+        if self.redrawAll or not self.useDirtyRects:
+            self.screen.blit(self.staticLayer, (0, 0))
+            self.dirtyRects = []
+
+        else:
+            for group in self.previousGroups:
+                group.clear(self.screen, self.staticLayer)
+
+            for rect in self.previousRects:
+                self.screen.blit(self.staticLayer, rect, rect)
+
+            self.dirtyRects = list(self.previousRects)
+
+        self.groups = []
+        self.rects = []
+
+    def drawGroup(self, group):
+        """Draw sprite group.
+
+        Args:
+            group: Sprites to draw. pygame.sprite.RenderUpdates object.
+        """
+        self.dirtyRects += group.draw(self.screen)
+        self.groups.append(group)
+
+    def addRects(self, rects):
+        """Mark screen areas changed by drawing done outside the renderer.
+
+        Args:
+            rects: Rect object or a list of Rect objects.
+        """
+        if isinstance(rects, pygame.Rect):
+            rects = [rects]
+
+        self.rects += rects
+
+    def endFrame(self):
+        """Push changed screen areas to the display."""
+        if self.redrawAll or not self.useDirtyRects:
+            pygame.display.flip()
+
+        else:
+            pygame.display.update(self.dirtyRects + self.rects)
+
+        self.redrawAll = False
+        self.previousGroups = self.groups
+        self.previousRects = self.rects
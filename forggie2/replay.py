@@ -0,0 +1,391 @@
+"""Recording of played games and their deterministic replay.
+
+Replay file layout (little endian):
+    header:    magic b'FRG2', version (uint8), frame rate (uint16),
+               amount of levels (uint16)
+    per level: level config name length (uint16) and UTF-8 name,
+               random seed (uint64), amount of ticks (uint32),
+               recorded level time in miliseconds (int32, -1 - level was
+               not completed), amount of input runs (uint32) and the runs:
+               input bit mask (uint8) and amount of ticks it lasts (uint16)
+
+Every level is simulated with Simulation driven by TickClock and cars are
+placed and moved with random numbers of the level seeded with the recorded
+seed, so replaying the inputs gives exactly the same level times.
+"""
+import os
+import sys
+import random
+import struct
+import argparse
+
+import pygame
+
+from clock import TickClock
+from level import Level
+from configregistry import REGISTRY
+from simulation import Simulation, Inputs, EVENT_COMPLETED
+
+MAIN_DIR = os.path.split(os.path.abspath(__file__))[0]
+CONFIG_DIR = os.path.join(MAIN_DIR, '..', 'configs')
+IMAGE_DIR = os.path.join(MAIN_DIR, '..', 'images')
+
+REPLAY_MAGIC = b'FRG2'
+REPLAY_VERSION = 1
+
+HEADER = struct.Struct('<4sBHH')
+LEVEL_HEADER = struct.Struct('<QIiI')
+NAME_LENGTH = struct.Struct('<H')
+RUN = struct.Struct('<BH')
+
+# Longest run of equal inputs stored in a single RUN record.
+MAX_RUN = 0xFFFF
+
+
+def newSeed():
+    """Return a random seed for placing cars of a level."""
+    return random.SystemRandom().randrange(2 ** 32)
+
+
+def packInputs(inputs):
+    """Convert Inputs to a bit mask. Bit 0 is 'up', bit 5 - 'restart'."""
+    mask = 0
+    for bit, pressed in enumerate(inputs):
+        if pressed:
+            mask |= 1 << bit
+
+    return mask
+
+
+def unpackInputs(mask):
+    """Convert bit mask made by packInputs() back to Inputs."""
+    return Inputs(*(bool(mask & (1 << bit))
+                    for bit in range(len(Inputs._fields))))
+
+
+class LevelRecording:
+    """Inputs of every tick of one played level."""
+
+    def __init__(self, level, seed, inputs=None, levelTime=None):
+        """Initialize recording.
+
+        Args:
+            level:     Level configuration file name. String.
+            seed:      Seed used to place the cars. Integer.
+            inputs:    Input bit masks, one per tick. List of integers.
+            levelTime: Level time in miliseconds when the level was
+                       completed, None - level was not completed.
+        """
+        self.level = level
+        self.seed = seed
+        self.inputs = inputs if inputs is not None else []
+        self.levelTime = levelTime
+
+
+class Replay:
+    """Recorded game: levels played one after another."""
+
+    def __init__(self, frameRate, levels=None):
+        """Initialize replay.
+
+        Args:
+            frameRate: Simulation steps per second. Integer.
+            levels:    List of LevelRecording objects.
+        """
+        self.frameRate = frameRate
+        self.levels = levels if levels is not None else []
+
+    @property
+    def levelTimes(self):
+        """Return recorded times of completed levels."""
+        return [rec.levelTime for rec in self.levels
+                if rec.levelTime is not None]
+
+    def save(self, path):
+        """Write replay file.
+
+        Args:
+            path: Path to the replay file. String.
+        """
+        with open(path, 'wb') as replayFile:
+            replayFile.write(self.pack())
+
+    def pack(self):
+        """Return replay file contents. Bytes."""
+        data = [HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.frameRate,
+                            len(self.levels))]
+
+        for rec in self.levels:
+            name = rec.level.encode('utf-8')
+            runs = []
+            for mask in rec.inputs:
+                if runs and runs[-1][0] == mask and runs[-1][1] < MAX_RUN:
+                    runs[-1][1] += 1
+                else:
+                    runs.append([mask, 1])
+
+            levelTime = -1 if rec.levelTime is None else rec.levelTime
+            data.append(NAME_LENGTH.pack(len(name)))
+            data.append(name)
+            data.append(LEVEL_HEADER.pack(rec.seed, len(rec.inputs),
+                                          levelTime, len(runs)))
+            data.extend(RUN.pack(mask, count) for mask, count in runs)
+
+        return b''.join(data)
+
+    @classmethod
+    def load(cls, path):
+        """Read replay file.
+
+        Args:
+            path: Path to the replay file. String.
+
+        Returns:
+            Replay object.
+        """
+        with open(path, 'rb') as replayFile:
+            return cls.unpack(replayFile.read())
+
+    @classmethod
+    def unpack(cls, data):
+        """Parse replay file contents.
+
+        Args:
+            data: Contents made by pack(). Bytes.
+
+        Returns:
+            Replay object.
+        """
+        try:
+            magic, version, frameRate, levelCount = HEADER.unpack_from(data)
+            if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+                raise ValueError('Not a forggie2 replay file or unsupported '
+                                 'version.')
+
+            offset = HEADER.size
+            levels = []
+            for _ in range(levelCount):
+                nameLength, = NAME_LENGTH.unpack_from(data, offset)
+                offset += NAME_LENGTH.size
+                name = data[offset:offset + nameLength].decode('utf-8')
+                offset += nameLength
+
+                seed, tickCount, levelTime, runCount = \
+                    LEVEL_HEADER.unpack_from(data, offset)
+                offset += LEVEL_HEADER.size
+
+                inputs = []
+                for mask, count in RUN.iter_unpack(
+                        data[offset:offset + runCount * RUN.size]):
+                    inputs += [mask] * count
+                offset += runCount * RUN.size
+
+                if len(inputs) != tickCount:
+                    raise ValueError(f"Broken inputs of level '{name}'.")
+
+                levels.append(LevelRecording(
+                    name, seed, inputs,
+                    None if levelTime == -1 else levelTime))
+
+        except struct.error as exc:
+            raise ValueError(f'Broken replay file: {exc}') from exc
+
+        return cls(frameRate, levels)
+
+
+class Recorder:
+    """Collects inputs of the game being played."""
+
+    def __init__(self, frameRate):
+        """Initialize recorder.
+
+        Args:
+            frameRate: Simulation steps per second. Integer.
+        """
+        self.replay = Replay(frameRate)
+        self.current = None
+
+    def startLevel(self, level, seed):
+        """Start recording a new level.
+
+        Args:
+            level: Level configuration file name. String.
+            seed:  Seed used to place the cars. Integer.
+        """
+        self.current = LevelRecording(level, seed)
+        self.replay.levels.append(self.current)
+
+    def record(self, inputs):
+        """Record inputs of a simulation step.
+
+        Args:
+            inputs: Inputs object passed to Simulation.step().
+        """
+        self.current.inputs.append(packInputs(inputs))
+
+    def completeLevel(self, levelTime):
+        """Mark current level completed.
+
+        Args:
+            levelTime: Level time in miliseconds. Integer.
+        """
+        self.current.levelTime = levelTime
+
+    def save(self, path):
+        """Write recorded game to the replay file."""
+        self.replay.save(path)
+
+
+def loadLevel(rec, frameRate, configDir, imageDir, screenWidth,
+              screenHeight):
+    """Load recorded level with the recorded car positions.
+
+    Returns:
+        Level object.
+    """
+    level = Level(configDir, imageDir, screenWidth, screenHeight,
+                  clock=TickClock(frameRate), seed=rec.seed)
+    level.load(os.path.join(configDir, rec.level))
+    return level
+
+
+class ReplayRunner:
+    """Simulates recorded game again."""
+
+    def __init__(self, replay, configDir=CONFIG_DIR, imageDir=IMAGE_DIR):
+        """Initialize runner.
+
+        Args:
+            replay:    Replay object.
+            configDir: Game settings directory. String.
+            imageDir:  Image directory. String.
+        """
+        self.replay = replay
+        self.configDir = configDir
+        self.imageDir = imageDir
+
+        gameConfig = REGISTRY.game(os.path.join(configDir, 'game.conf'))
+        self.screenWidth = gameConfig.screenWidth
+        self.screenHeight = gameConfig.screenHeight
+
+    def run(self, render=False):
+        """Simulate all recorded levels.
+
+        Args:
+            render: Show the replay in a window at the recorded speed.
+                    Boolean. False - simulate as fast as possible.
+
+        Returns:
+            List of level times of completed levels, the same as
+            Replay.levelTimes for a valid replay.
+        """
+        screen = None
+        if render:
+            pygame.init()
+            screen = pygame.display.set_mode((self.screenWidth,
+                                              self.screenHeight))
+
+        levelTimes = []
+        for rec in self.replay.levels:
+            levelTime = self.runLevel(rec, screen)
+            if levelTime is not None:
+                levelTimes.append(levelTime)
+
+        return levelTimes
+
+    def runLevel(self, rec, screen=None):
+        """Simulate one recorded level.
+
+        Args:
+            rec:    LevelRecording object.
+            screen: Display surface to draw on or None.
+
+        Returns:
+            Level time in miliseconds if the level was completed or None.
+        """
+        level = loadLevel(rec, self.replay.frameRate, self.configDir,
+                          self.imageDir, self.screenWidth, self.screenHeight)
+        simulation = Simulation(level)
+
+        draw = None
+        if screen is not None:
+            draw = self.drawer(screen, level, simulation)
+
+        levelTime = None
+        for mask in rec.inputs:
+            events = simulation.step(unpackInputs(mask))
+            if EVENT_COMPLETED in events:
+                levelTime = simulation.levelTime
+
+            if draw is not None:
+                draw()
+
+        return levelTime
+
+    def drawer(self, screen, level, simulation):
+        """Return function drawing the simulated level at the recorded speed.
+
+        Args:
+            screen:     Display surface.
+            level:      Loaded level. Level object.
+            simulation: Simulation object.
+        """
+        from renderer import LevelRenderer
+
+        renderer = LevelRenderer(screen, level)
+        groups = (pygame.sprite.RenderUpdates(level.floaters),
+                  level.frog.all,
+                  pygame.sprite.RenderUpdates(level.shadows),
+                  pygame.sprite.RenderUpdates(level.cars))
+        clock = pygame.time.Clock()
+        frameRate = self.replay.frameRate
+
+        def draw():
+            pygame.event.pump()
+            simulation.syncSprites()
+            renderer.beginFrame()
+            for group in groups:
+                renderer.drawGroup(group)
+            renderer.endFrame()
+            clock.tick(frameRate)
+
+        return draw
+
+    def verify(self, render=False):
+        """Check that the replay gives the recorded level times.
+
+        Returns:
+            Tuple (isValid, levelTimes).
+        """
+        levelTimes = self.run(render)
+        return levelTimes == self.replay.levelTimes, levelTimes
+
+
+def parseArgs(args):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Replay a recorded forggie2 game and check its level '
+                    'times.')
+    parser.add_argument('path', help='replay file')
+    parser.add_argument('--render', action='store_true',
+                        help='show the replay in a window')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    """Entry point of the replay command line tool."""
+    options = parseArgs(sys.argv[1:] if args is None else args)
+    if not options.render:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+    replay = Replay.load(options.path)
+    isValid, levelTimes = ReplayRunner(replay).verify(options.render)
+
+    print(f'Recorded level times: {replay.levelTimes}')
+    print(f'Replayed level times: {levelTimes}')
+    print('Replay is valid.' if isValid else 'Replay does NOT match!')
+    sys.exit(0 if isValid else 1)
+
+
+if __name__ == '__main__':
+    main()
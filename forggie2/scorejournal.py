@@ -0,0 +1,233 @@
+"""Append-only store of game results shared by several game processes.
+
+Journal file layout (UTF-8 text):
+    # forggie2 score journal 1
+    <total seconds>\t<player name>
+    ...
+
+Every finished game appends one line, so a result is never lost by
+rewriting the file, and results of several processes are simply merged.
+Writers hold an exclusive lock on '<path>.lock' and fsync every line. Once
+the journal grows long, it is compacted to the best results: they are
+written to a temporary file, which atomically replaces the journal.
+
+Readers do not lock. They read only the lines appended since the last
+read and keep the best results in memory; a compacted (replaced) journal is
+read again from the start.
+"""
+import os
+import bisect
+import contextlib
+
+try:
+    import fcntl
+except ImportError:
+    # No POSIX locks (Windows): several processes must not share the file.
+    fcntl = None
+
+from eventlog import LOG
+
+JOURNAL_HEADER = '# forggie2 score journal 1\n'
+
+# Journal is compacted when it has this many times more lines than the kept
+# results.
+COMPACT_FACTOR = 8
+
+
+def formatLine(totalSeconds, name):
+    """Return journal line of the result.
+
+    Args:
+        totalSeconds: Time of the game in seconds. Float.
+        name:         Player name. String.
+    """
+    # Names are typed in the game, but the file may be edited by hand.
+    name = ' '.join(name.split())
+    return f'{float(totalSeconds)!r}\t{name}\n'
+
+
+class ScoreJournal:
+    """Best results read from a journal file."""
+
+    def __init__(self, path, maxEntries=12):
+        """Initialize journal. No file is read or created.
+
+        Args:
+            path:       Path to the journal file. String.
+            maxEntries: Amount of the best results kept. Integer.
+        """
+        self.path = path
+        self.lockPath = path + '.lock'
+        self.maxEntries = maxEntries
+        self.reset()
+
+    def reset(self):
+        """Forget the read results."""
+        # Best results as (total seconds, line number, name) tuples, from the
+        # best to the worst. Line number keeps earlier of equal results
+        # first.
+        self.best = []
+
+        # Bytes of the journal read so far.
+        self.offset = 0
+
+        # Lines and results read so far.
+        self.lineCount = 0
+        self.resultCount = 0
+
+        # (device, inode) of the read journal file, to notice compaction by
+        # another process.
+        self.identity = None
+
+    @property
+    def entries(self):
+        """Return best results as (total seconds, name) tuples."""
+        return [(seconds, name) for seconds, _, name in self.best]
+
+    @contextlib.contextmanager
+    def locked(self):
+        """Hold the exclusive lock of the journal, waiting for it if needed.
+        """
+        with open(self.lockPath, 'a') as lockFile:
+            if fcntl is not None:
+                # lockf() locks also work on NFS.
+                fcntl.lockf(lockFile, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(lockFile, fcntl.LOCK_UN)
+
+    def isJournal(self):
+        """Return False if the file exists, but is not a journal."""
+        try:
+            with open(self.path, 'rb') as journalFile:
+                header = journalFile.read(len(JOURNAL_HEADER))
+        except FileNotFoundError:
+            return True
+
+        return header in (b'', JOURNAL_HEADER.encode('utf-8'))
+
+    def addLine(self, line):
+        """Add result of one journal line to the best results."""
+        self.lineCount += 1
+        if not line or line.startswith('#'):
+            return
+
+        try:
+            seconds, name = line.split('\t', 1)
+            result = (float(seconds), self.lineCount, name)
+        except ValueError:
+            LOG.warning(f"Broken line {self.lineCount} in '{self.path}' "
+                        'skipped.')
+            return
+
+        self.resultCount += 1
+        if (len(self.best) == self.maxEntries
+                and result >= self.best[-1]):
+            return
+
+        bisect.insort(self.best, result)
+        del self.best[self.maxEntries:]
+
+    def refresh(self):
+        """Read lines appended since the last call.
+
+        Returns:
+            True if new lines were read.
+        """
+        try:
+            journalFile = open(self.path, 'rb')
+        except FileNotFoundError:
+            changed = self.offset > 0
+            self.reset()
+            return changed
+
+        with journalFile:
+            stat = os.fstat(journalFile.fileno())
+            identity = (stat.st_dev, stat.st_ino)
+            if identity != self.identity or stat.st_size < self.offset:
+                self.reset()
+                self.identity = identity
+
+            if stat.st_size == self.offset:
+                return False
+
+            journalFile.seek(self.offset)
+            data = journalFile.read()
+
+        # Line still being written by another process is read next time.
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        for line in data[:end].decode('utf-8').splitlines():
+            self.addLine(line)
+
+        return end > 0
+
+    def submit(self, totalSeconds, name):
+        """Append a result to the journal.
+
+        Args:
+            totalSeconds: Time of the game in seconds. Float.
+            name:         Player name. String.
+
+        Returns:
+            True if the journal was compacted.
+        """
+        data = formatLine(totalSeconds, name).encode('utf-8')
+        with self.locked():
+            with open(self.path, 'a+b') as journalFile:
+                size = journalFile.seek(0, os.SEEK_END)
+                if size == 0:
+                    data = JOURNAL_HEADER.encode('utf-8') + data
+                else:
+                    # Finish a line torn by a crash of the writer.
+                    journalFile.seek(size - 1)
+                    if journalFile.read(1) != b'\n':
+                        data = b'\n' + data
+
+                journalFile.write(data)
+                journalFile.flush()
+                os.fsync(journalFile.fileno())
+
+            self.refresh()
+            if self.resultCount > self.maxEntries * COMPACT_FACTOR:
+                self.rewrite(self.entries)
+                return True
+
+        return False
+
+    def rewrite(self, entries):
+        """Replace the journal with the given results.
+
+        Must be called with the lock held (see locked()).
+
+        Args:
+            entries: Results as (total seconds, name) tuples.
+        """
+        tmpPath = self.path + '.tmp'
+        with open(tmpPath, 'wb') as tmpFile:
+            tmpFile.write(JOURNAL_HEADER.encode('utf-8'))
+            for totalSeconds, name in entries:
+                tmpFile.write(formatLine(totalSeconds, name).encode('utf-8'))
+            tmpFile.flush()
+            os.fsync(tmpFile.fileno())
+
+        os.replace(tmpPath, self.path)
+
+        # Make the rename itself durable.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            dirFd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            pass
+        else:
+            try:
+                os.fsync(dirFd)
+            except OSError:
+                pass
+            finally:
+                os.close(dirFd)
+
+        self.reset()
+        self.refresh()
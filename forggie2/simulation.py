@@ -0,0 +1,210 @@
+"""Game logic of a single level, without rendering."""
+import collections
+
+from traffic import TrafficEngine
+from profiler import PHASE_COLLISIONS, PHASE_TRAFFIC, PHASE_FROG
+
+# Player input for one simulation step. All fields are booleans:
+# up, down, left, right - arrow keys pressed,
+# cont                  - continue after the frog died ('c' key),
+# restart               - restart level after the game is over ('r' key).
+Inputs = collections.namedtuple('Inputs', ('up', 'down', 'left', 'right',
+                                           'cont', 'restart'))
+
+# Step without any key pressed.
+NO_INPUTS = Inputs(False, False, False, False, False, False)
+
+# Events returned by Simulation.step().
+EVENT_KILLED = 'killed'
+EVENT_DROWNED = 'drowned'
+EVENT_GAME_OVER = 'gameOver'
+EVENT_COMPLETED = 'completed'
+EVENT_CONTINUED = 'continued'
+EVENT_RESTARTED = 'restarted'
+
+
+class Simulation:
+    """Advances loaded level one tick at a time.
+
+    Simulation does not draw anything and does not read the wall clock, so it
+    can run without a window and as fast as possible. Time is taken from the
+    level's TickClock, which is advanced by one step on every tick.
+    """
+
+    def __init__(self, level):
+        """Initialize simulation.
+
+        Args:
+            level: Loaded level. Level object.
+        """
+        self.level = level
+        self.frog = level.frog
+        self.cars = level.cars
+        self.floaters = level.floaters
+        self.riverTracks = level.riverTracks
+        self.riverTrackRects = level.riverTrackRects
+        self.finishRect = level.finishImage.collisionRect
+
+        # Cars and floaters are moved by the engine. Their sprites are
+        # updated only by syncSprites().
+        self.traffic = TrafficEngine(self.cars, self.floaters,
+                                     level.screenWidth, rng=level.rng)
+
+        self.carCollideRects = [car.collisionRect for car in self.cars]
+
+        self.clock = level.clock
+
+        # FrameProfiler timing collision, traffic and frog phases of every
+        # step or None.
+        self.profiler = None
+
+        # Time in miliseconds the frog spent alive in the level.
+        self.levelTime = 0
+
+        # Marks if level is completed.
+        self.levelCompleted = False
+
+        # Marks if frog ran out of lifes.
+        self.gameOver = False
+
+        # Collision detection results of the last step. Index of the object
+        # in the collision rect list or -1 if there is no collision.
+        self.collisionWithCars = -1
+        self.collisionWithRiver = -1
+        self.collisionWithFloaters = -1
+        self.collisionWithFinish = False
+
+    @property
+    def frogIsDown(self):
+        """Return True if frog is run over or drowned."""
+        return self.frog.isDead or self.frog.isDrowned
+
+    def releaseKeys(self):
+        """Forget movement keys pressed so far."""
+        self.frog.pressedUp = False
+        self.frog.pressedDown = False
+        self.frog.pressedLeft = False
+        self.frog.pressedRight = False
+
+    def continueLevel(self):
+        """Put the frog back to the start after it died."""
+        self.releaseKeys()
+        self.frog.isDead = False
+        self.frog.isDrowned = False
+        self.frog.moveToStart()
+
+    def restartLevel(self):
+        """Restart the level after all lifes were lost."""
+        self.continueLevel()
+        self.gameOver = False
+        self.frog.lifesLeft = 3
+
+    def applyInputs(self, inputs):
+        """Pass pressed keys to the frog.
+
+        Args:
+            inputs: Keys pressed during the step. Inputs object.
+
+        Returns:
+            List of events caused by the inputs.
+        """
+        events = []
+        frog = self.frog
+
+        if inputs.up:
+            frog.pressedUp = True
+
+        if inputs.down:
+            frog.pressedDown = True
+
+        if inputs.left:
+            frog.pressedLeft = True
+
+        if inputs.right:
+            frog.pressedRight = True
+
+        if inputs.cont and self.frogIsDown and not self.gameOver:
+            self.continueLevel()
+            events.append(EVENT_CONTINUED)
+
+        if inputs.restart and self.gameOver:
+            self.restartLevel()
+            events.append(EVENT_RESTARTED)
+
+        return events
+
+    def detectCollisions(self):
+        """Find objects the frog collides with."""
+        frogRect = self.frog.collisionRect
+
+        self.collisionWithCars = self.traffic.collideCars(frogRect)
+        self.collisionWithFinish = frogRect.colliderect(self.finishRect)
+        self.collisionWithRiver = frogRect.collidelist(self.riverTrackRects)
+        self.collisionWithFloaters = self.traffic.collideFloaters(frogRect)
+
+    def syncSprites(self):
+        """Move car and floater sprites to their current positions.
+
+        Needs to be called only before drawing the sprites.
+        """
+        self.traffic.syncSprites()
+
+    def step(self, inputs=NO_INPUTS):
+        """Advance the level by one tick.
+
+        Args:
+            inputs: Keys pressed during the step. Inputs object.
+
+        Returns:
+            List of events (EVENT_* constants) that happened during the step.
+        """
+        elapsed = self.clock.tick()
+        frog = self.frog
+        events = self.applyInputs(inputs)
+
+        # Collisions are checked against positions shown in the previous
+        # frame.
+        self.detectCollisions()
+
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.lap(PHASE_COLLISIONS)
+
+        self.traffic.step()
+
+        if profiler is not None:
+            profiler.lap(PHASE_TRAFFIC)
+
+        wasDead = frog.isDead
+        wasDrowned = frog.isDrowned
+
+        frog.update(self.collisionWithCars, self.collisionWithRiver,
+                    self.collisionWithFloaters, self.floaters,
+                    self.riverTracks)
+
+        if frog.isDead and not wasDead:
+            events.append(EVENT_KILLED)
+
+        if frog.isDrowned and not wasDrowned:
+            events.append(EVENT_DROWNED)
+
+        if not self.frogIsDown and not self.levelCompleted:
+            self.levelTime += elapsed
+
+        if self.collisionWithFinish:
+            if not self.levelCompleted:
+                events.append(EVENT_COMPLETED)
+
+            self.levelCompleted = True
+            frog.isLocked = True
+
+        elif self.frogIsDown and frog.lifesLeft == 0:
+            if not self.gameOver:
+                events.append(EVENT_GAME_OVER)
+
+            self.gameOver = True
+
+        if profiler is not None:
+            profiler.lap(PHASE_FROG)
+
+        return events
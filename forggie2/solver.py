@@ -0,0 +1,407 @@
+"""Search for the fastest way through levels.
+
+Breadth first search over the ticks of a level: every reachable frog state
+(position, jump animation frame, facing) is kept once per tick together with
+the amount of input sequences leading to it. Car and floater positions do
+not depend on the frog, so they are simulated once per tick with the level's
+TrafficEngine, while all frog states are advanced together with the frog
+rules of BatchFroggieEnv. The first tick at which a frog reaches the finish
+gives the minimum completion time.
+
+Levels (and random seeds of the car positions) are searched in a process
+pool, one level and seed per worker task.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+
+from clock import DEFAULT_FRAME_RATE
+from configregistry import REGISTRY
+from eventlog import LOG, WARNING, StdoutSink
+from level import Level
+from traffic import TrafficEngine
+from batchenv import BatchFroggieEnv
+from env import CONFIG_DIR, IMAGE_DIR, ACTIONS
+
+# Longest level time searched by default, in seconds.
+MAX_LEVEL_TIME = 60
+
+# Letters used to print found input sequences, one per action.
+ACTION_LETTERS = '.udlr'
+
+# Frog state fields compared to find equal states.
+STATE_FIELDS = ('frogX', 'frogY', 'frogAnim', 'frogFrame', 'frogActive',
+                'frogFacingUp')
+
+
+class Solution:
+    """Result of the search on a single level."""
+
+    def __init__(self, level, seed):
+        """Initialize empty result.
+
+        Args:
+            level: Level configuration file name. String.
+            seed:  Seed of the random car positions. Integer.
+        """
+        self.level = level
+        self.seed = seed
+
+        # Ticks and level time (miliseconds) of the fastest completion.
+        # None - level can't be completed in the searched time.
+        self.ticks = None
+        self.levelTime = None
+
+        # Amount of different input sequences completing the level in the
+        # minimum time without losing a life. Float, as it grows very fast.
+        self.safePaths = 0.0
+
+        # One of the fastest input sequences: action index per tick.
+        self.actions = []
+
+        # Largest amount of frog states kept for a single tick.
+        self.maxStates = 0
+
+        # Time spent searching in seconds.
+        self.duration = 0.0
+
+    @property
+    def isSolved(self):
+        """Return True if the level can be completed."""
+        return self.ticks is not None
+
+    def actionString(self):
+        """Return input sequence in short form, e.g. '3.u2.l'."""
+        parts = []
+        for action, count in runLengths(self.actions):
+            letter = ACTION_LETTERS[action]
+            parts.append(letter if count == 1 else f'{count}{letter}')
+
+        return ''.join(parts)
+
+    def asDict(self):
+        """Return result as a JSON compatible dict."""
+        return {'level': self.level,
+                'seed': self.seed,
+                'ticks': self.ticks,
+                'levelTime': self.levelTime,
+                'safePaths': self.safePaths,
+                'actions': self.actionString(),
+                'maxStates': self.maxStates,
+                'duration': round(self.duration, 3)}
+
+
+def packRows(columns):
+    """Pack rows of small integers into single integer keys.
+
+    Args:
+        columns: List of integer arrays of the same length.
+
+    Returns:
+        Integer array with equal keys for equal rows.
+    """
+    keys = np.zeros(len(columns[0]), dtype=np.int64)
+    capacity = 1
+    for column in columns:
+        low = int(column.min(initial=0))
+        span = int(column.max(initial=0)) - low + 1
+        capacity *= span
+        if capacity >= 2 ** 62:
+            # Too many different values for int64: compare rows instead.
+            _, keys = np.unique(np.column_stack(columns), axis=0,
+                                return_inverse=True)
+            return keys.reshape(-1)
+
+        keys = keys * span + (column - low)
+
+    return keys
+
+
+def runLengths(values):
+    """Return list of (value, count) tuples for runs of equal values."""
+    runs = []
+    for value in values:
+        if runs and runs[-1][0] == value:
+            runs[-1][1] += 1
+        else:
+            runs.append([value, 1])
+
+    return [tuple(run) for run in runs]
+
+
+class LevelSolver:
+    """Finds the fastest way to complete a level."""
+
+    def __init__(self, level, seed=0, configDir=CONFIG_DIR,
+                 imageDir=IMAGE_DIR, screenWidth=600, screenHeight=800,
+                 frameRate=DEFAULT_FRAME_RATE,
+                 maxTicks=MAX_LEVEL_TIME * DEFAULT_FRAME_RATE):
+        """Initialize solver.
+
+        Args:
+            level:        Level configuration file name. String.
+            seed:         Seed of the random car positions. Integer.
+            configDir:    Game settings directory. String.
+            imageDir:     Image directory. String.
+            screenWidth:  Screen width in pixels. Integer.
+            screenHeight: Screen height in pixels. Integer.
+            frameRate:    Simulated frames per second. Integer.
+            maxTicks:     Amount of ticks to search. Integer.
+        """
+        self.levelName = level
+        self.seed = seed
+        self.frameRate = frameRate
+        self.maxTicks = maxTicks
+
+        # Frog rules. Its own traffic is replaced with the level's one.
+        self.frogs = BatchFroggieEnv(level, 1, configDir=configDir,
+                                     imageDir=imageDir,
+                                     screenWidth=screenWidth,
+                                     screenHeight=screenHeight,
+                                     observation=None, frameRate=frameRate)
+
+        self.level = Level(configDir, imageDir, screenWidth, screenHeight,
+                           seed=seed)
+        self.level.load(os.path.join(configDir, level))
+        self.traffic = TrafficEngine(self.level.cars, self.level.floaters,
+                                     screenWidth, rng=self.level.rng)
+
+    def solve(self):
+        """Search for the fastest completion.
+
+        Returns:
+            Solution object.
+        """
+        started = time.perf_counter()
+        solution = Solution(self.levelName, self.seed)
+        frogs = self.frogs
+        traffic = self.traffic
+        actionCount = len(ACTIONS)
+
+        # Collision rects of all frogs are checked against the same traffic.
+        frogs.collisionX = traffic.collisionX[None, :]
+        frogs.collisionY = traffic.collisionY[None, :]
+
+        counts = np.ones(1)
+
+        # Per tick: index of the previous state and the action leading to
+        # every state. Used to get one of the fastest input sequences.
+        history = []
+
+        for tick in range(1, self.maxTicks + 1):
+            hitByCars, onFloater, floaterIdx, inRiver, riverIdx, completed = \
+                self.detectCollisions()
+            died = hitByCars | (inRiver & ~onFloater)
+
+            # Level is completed during this tick no matter what is pressed.
+            finished = completed & ~died
+            if finished.any():
+                solution.ticks = tick
+                solution.levelTime = tick * 1000 // self.frameRate
+                solution.safePaths = float(counts[finished].sum())
+                solution.actions = self.inputs(history,
+                                               int(np.argmax(finished)))
+                break
+
+            alive = np.flatnonzero(~died & ~completed)
+            if not alive.size:
+                break
+
+            # Frogs in the middle of a jump ignore the keys, so only idle
+            # frogs try every action.
+            idle = ~frogs.frogActive[alive]
+            repeats = np.where(idle, actionCount, 1)
+            parents = np.repeat(alive, repeats)
+            starts = np.repeat(np.cumsum(repeats) - repeats, repeats)
+            actions = np.arange(len(parents)) - starts
+
+            for name in STATE_FIELDS:
+                setattr(frogs, name, getattr(frogs, name)[parents])
+            frogs.frogMoveDistance = frogs.frogMoveDistance[parents]
+            counts = counts[parents]
+
+            traffic.step()
+            frogs.stepFrogs(actions, hitByCars[parents], onFloater[parents],
+                            floaterIdx[parents], inRiver[parents],
+                            riverIdx[parents])
+
+            # Merge equal states.
+            keys = packRows([getattr(frogs, name).astype(np.int64)
+                             for name in STATE_FIELDS]
+                            + list(frogs.frogMoveDistance.T))
+            _, first, inverse = np.unique(keys, return_index=True,
+                                          return_inverse=True)
+            counts = np.bincount(inverse, weights=counts)
+            history.append((parents[first], actions[first]))
+
+            for name in STATE_FIELDS:
+                setattr(frogs, name, getattr(frogs, name)[first])
+            frogs.frogMoveDistance = frogs.frogMoveDistance[first]
+
+            solution.maxStates = max(solution.maxStates, len(first))
+
+        solution.duration = time.perf_counter() - started
+        return solution
+
+    def detectCollisions(self):
+        """Find what every frog state collides with.
+
+        Many states differ only in the jump animation, so collisions are
+        checked once per frog position.
+
+        Returns:
+            The same tuple as BatchFroggieEnv.detectCollisions().
+        """
+        frogs = self.frogs
+        x = frogs.frogX
+        y = frogs.frogY
+        _, first, inverse = np.unique(packRows([x, y]), return_index=True,
+                                      return_inverse=True)
+
+        frogs.frogX = x[first]
+        frogs.frogY = y[first]
+        collisions = frogs.detectCollisions()
+        frogs.frogX = x
+        frogs.frogY = y
+
+        return tuple(result[inverse] for result in collisions)
+
+    @staticmethod
+    def inputs(history, state):
+        """Return actions leading to the given state of the last tick.
+
+        Args:
+            history: List of (parents, actions) arrays per tick.
+            state:   Index of the state after the last tick. Integer.
+        """
+        actions = []
+        for parents, stepActions in reversed(history):
+            actions.append(int(stepActions[state]))
+            state = int(parents[state])
+
+        actions.reverse()
+        return actions
+
+
+def quietLog():
+    """Keep game log messages below WARNING out of the report.
+
+    Stdout sinks of the log are replaced by a sink writing warnings and
+    errors to stderr. Run in every worker process and by main().
+    """
+    for sink in list(LOG.sinks):
+        if isinstance(sink, StdoutSink):
+            LOG.removeSink(sink)
+            LOG.addSink(StdoutSink(WARNING, stream=sys.stderr))
+
+
+def solveLevel(task):
+    """Solve one level. Worker function of the process pool.
+
+    Args:
+        task: Tuple (level name, seed, max ticks, frame rate).
+
+    Returns:
+        Solution object.
+    """
+    level, seed, maxTicks, frameRate = task
+
+    solver = LevelSolver(level, seed, maxTicks=maxTicks, frameRate=frameRate)
+    return solver.solve()
+
+
+def solveLevels(levels, seeds, maxTicks, frameRate=DEFAULT_FRAME_RATE,
+                processes=None):
+    """Solve levels in a process pool.
+
+    Args:
+        levels:    Level configuration file names. List of strings.
+        seeds:     Seeds of the car positions to try on every level. List.
+        maxTicks:  Amount of ticks to search. Integer.
+        frameRate: Simulated frames per second. Integer.
+        processes: Amount of worker processes. None - amount of CPUs.
+
+    Returns:
+        List of Solution objects in the order of levels and seeds.
+    """
+    tasks = [(level, seed, maxTicks, frameRate)
+             for level in levels for seed in seeds]
+
+    if processes == 1 or len(tasks) == 1:
+        return [solveLevel(task) for task in tasks]
+
+    with multiprocessing.Pool(processes, initializer=quietLog) as pool:
+        return pool.map(solveLevel, tasks, chunksize=1)
+
+
+def printReport(solutions, out=sys.stdout):
+    """Print a table of the results, one row per level and seed."""
+    out.write(f"{'level':<14}{'seed':>6}{'time, s':>10}{'safe paths':>14}"
+              f"{'states':>9}{'search, s':>11}  inputs\n")
+    for solution in solutions:
+        if solution.isSolved:
+            levelTime = f'{solution.levelTime / 1000:.3f}'
+        else:
+            levelTime = '-'
+
+        out.write(f'{solution.level:<14}{solution.seed:>6}{levelTime:>10}'
+                  f'{solution.safePaths:>14.6g}{solution.maxStates:>9}'
+                  f'{solution.duration:>11.2f}  {solution.actionString()}\n')
+
+
+def parseArgs(args):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Find the fastest way through forggie2 levels.')
+    parser.add_argument('levels', nargs='*',
+                        help='level configuration files (default: all '
+                             'levels of game.conf)')
+    parser.add_argument('--seeds', type=int, default=1,
+                        help='amount of random car placements to try on '
+                             'every level (default: 1)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='first random seed (default: 0)')
+    parser.add_argument('--max-time', type=float, default=MAX_LEVEL_TIME,
+                        help='longest level time to search, in seconds '
+                             f'(default: {MAX_LEVEL_TIME})')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='amount of worker processes (default: amount '
+                             'of CPUs)')
+    parser.add_argument('--json', action='store_true',
+                        help='print results as JSON lines')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    """Entry point of the solver command line tool."""
+    options = parseArgs(sys.argv[1:] if args is None else args)
+    quietLog()
+
+    levels = options.levels
+    if not levels:
+        levels = REGISTRY.game(os.path.join(CONFIG_DIR, 'game.conf')).levels
+
+    seeds = range(options.seed, options.seed + options.seeds)
+    maxTicks = int(options.max_time * DEFAULT_FRAME_RATE)
+
+    started = time.perf_counter()
+    solutions = solveLevels(levels, seeds, maxTicks,
+                            processes=options.processes)
+
+    if options.json:
+        for solution in solutions:
+            print(json.dumps(solution.asDict()))
+    else:
+        printReport(solutions)
+        print(f'Total time: {time.perf_counter() - started:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Shared fonts and rendered text surfaces."""
+import pygame
+
+from loaders import ImageCache
+
+# Max amount of bytes of rendered text kept in the cache (4 MB).
+TEXT_CACHE_SIZE = 4 * 1024 * 1024
+
+# (font name, size) -> pygame.font.Font object.
+FONTS = {}
+
+
+def getFont(fontName, size):
+    """Return font object, creating it only once.
+
+    Args:
+        fontName: Font file name or None for the default font. String.
+        size:     Font size. Integer.
+    """
+    key = (fontName, size)
+    font = FONTS.get(key)
+    if font is None:
+        font = pygame.font.Font(fontName, size)
+        FONTS[key] = font
+
+    return font
+
+
+class TextCache:
+    """Cache of rendered text surfaces keyed by text, size and colour."""
+
+    def __init__(self, maxBytes=TEXT_CACHE_SIZE):
+        """Initialize cache.
+
+        Args:
+            maxBytes: Max amount of bytes of rendered text to keep. Least
+                      recently used surfaces are dropped first. Integer.
+        """
+        self.surfaces = ImageCache(maxBytes=maxBytes)
+
+    def render(self, msg, size, colour='white', fontName=None,
+               antialias=True):
+        """Return rendered text surface.
+
+        Returned surface is shared and must not be modified.
+
+        Args:
+            msg:       Text string.
+            size:      Font size. Integer.
+            colour:    Text colour: name ('white'), tuple or pygame.Color.
+            fontName:  Font to use to write the text. String.
+            antialias: Smooth text edges. Boolean.
+        """
+        colour = tuple(pygame.Color(colour))
+        key = (msg, size, colour, fontName, antialias)
+
+        rendered = self.surfaces.get(key)
+        if rendered is None:
+            font = getFont(fontName, size)
+            rendered = font.render(msg, antialias, colour)
+            self.surfaces.put(key, rendered)
+
+        return rendered
+
+    def drawGlyphs(self, surface, msg, position, size, colour='white',
+                   fontName=None):
+        """Draw text by blitting cached single character surfaces.
+
+        Meant for often changing texts made of few different characters
+        (numbers), which would otherwise need a new surface every frame.
+
+        Args:
+            surface:  Surface to draw text on.
+            msg:      Text string.
+            position: Tuple with X and Y coordinates of the text.
+            size:     Font size. Integer.
+            colour:   Text colour.
+            fontName: Font to use to write the text. String.
+
+        Returns:
+            Rect object of the changed area.
+        """
+        posX, posY = position
+        rect = pygame.Rect(posX, posY, 0, 0)
+        for char in msg:
+            glyph = self.render(char, size, colour, fontName)
+            rect.union_ip(surface.blit(glyph, (posX, posY)))
+            posX += glyph.get_width()
+
+        return rect
+
+
+# Cache used by the game.
+TEXT_CACHE = TextCache()
@@ -0,0 +1,159 @@
+"""Movement of all cars and floaters of a level at once."""
+import random
+
+import numpy as np
+
+from laneindex import LaneIndex, laneKeys
+
+# Cars are moved to the other side of the screen once they are this many
+# pixels outside of it. A little bit more than the length of the longest car.
+CAR_WRAP_MARGIN = 80
+
+# Amount of pixels between screen edge and the car moved to the other side
+# of the screen.
+CAR_WRAP_GAP = 20
+
+
+class TrafficEngine:
+    """Keeps positions of cars and floaters in arrays and moves them together.
+
+    Car and Floater sprites are only views of the engine state used for
+    drawing: call syncSprites() before drawing them. Movement rules are the
+    same as in Car.update() and Floater.update().
+    """
+
+    def __init__(self, cars, floaters, screenWidth, rng=None):
+        """Initialize engine with current state of the sprites.
+
+        Args:
+            cars:        List of Car objects (placed on the road).
+            floaters:    List of Floater objects (placed on the river).
+            screenWidth: Screen width in pixels. Integer.
+            rng:         Random number generator for new car positions.
+                         random.Random object, normally Level.rng. None -
+                         a new generator seeded from the operating system.
+        """
+        self.cars = list(cars)
+        self.floaters = list(floaters)
+        self.sprites = self.cars + self.floaters
+        self.carCount = len(self.cars)
+        self.screenWidth = screenWidth
+        self.rng = rng or random.Random()
+
+        sprites = self.sprites
+
+        def array(values, dtype=np.int64):
+            return np.array(list(values), dtype=dtype)
+
+        self.isCar = array((i < self.carCount for i in range(len(sprites))),
+                           dtype=bool)
+        self.isFloater = ~self.isCar
+        self.toLeft = array((s.direction == 'to_left' for s in sprites),
+                            dtype=bool)
+
+        self.x = array(s.rect.left for s in sprites)
+        self.y = array(s.rect.top for s in sprites)
+        self.width = array(s.carWidth for s in sprites)
+        self.speed = array(s.speed for s in sprites)
+
+        self.roadTop = array(s.roadTop for s in sprites)
+        self.roadTopGap = array(s.roadTopGap for s in sprites)
+        self.freeVerticalSpace = array(s.freeVerticalSpace for s in sprites)
+
+        self.crMarginLeft = array(s.crMarginLeft for s in sprites)
+        self.crMarginTop = array(s.crMarginTop for s in sprites)
+
+        self.collisionX = array(s.collisionRect.left for s in sprites)
+        self.collisionY = array(s.collisionRect.top for s in sprites)
+        self.collisionWidth = array(s.collisionRect.width for s in sprites)
+        self.collisionHeight = array(s.collisionRect.height for s in sprites)
+
+        # Masks of objects wrapping around each screen edge.
+        self.carToLeft = self.isCar & self.toLeft
+        self.carToRight = self.isCar & ~self.toLeft
+        self.floaterToLeft = self.isFloater & self.toLeft
+        self.floaterToRight = self.isFloater & ~self.toLeft
+
+        # Collision lookup of cars and floaters. Indexes work on views of
+        # the engine arrays, so they see every move.
+        carCount = self.carCount
+        self.carIndex = LaneIndex(
+            self.collisionX[:carCount], self.collisionY[:carCount],
+            self.collisionWidth[:carCount], self.collisionHeight[:carCount],
+            laneKeys(self.cars))
+        self.floaterIndex = LaneIndex(
+            self.collisionX[carCount:], self.collisionY[carCount:],
+            self.collisionWidth[carCount:], self.collisionHeight[carCount:],
+            laneKeys(self.floaters))
+
+        # Collision rects of freshly placed cars and floaters are not derived
+        # from their positions yet (see Car.calcPositions()), so all lanes
+        # have to be sorted again after the first step.
+        self.isPlaced = False
+
+    def step(self):
+        """Move all objects by their speed for one frame."""
+        x = self.x
+        x += self.speed
+        right = x + self.width
+        width = self.screenWidth
+
+        # Keep distance between cars the same after moving car to the other
+        # side of the screen.
+        carLeft = self.carToLeft & (x <= -CAR_WRAP_MARGIN)
+        x[carLeft] += CAR_WRAP_MARGIN + CAR_WRAP_GAP + width
+
+        carRight = self.carToRight & (right >= width + CAR_WRAP_MARGIN)
+        x[carRight] -= CAR_WRAP_MARGIN + CAR_WRAP_GAP + width
+
+        floaterLeft = self.floaterToLeft & (right < 0)
+        x[floaterLeft] = width
+
+        floaterRight = self.floaterToRight & (x > width)
+        x[floaterRight] = -self.width[floaterRight]
+
+        wrapped = carLeft | carRight | floaterLeft | floaterRight
+        if wrapped.any():
+            self.y[wrapped] = self.roadTop[wrapped] + self.roadTopGap[wrapped]
+
+            # Cars moving to the right get a new random distance from the top
+            # of the road for the next time they appear.
+            randint = self.rng.randint
+            for idx in np.flatnonzero(carRight).tolist():
+                self.roadTopGap[idx] = randint(
+                    2, int(self.freeVerticalSpace[idx]))
+
+        np.add(x, self.crMarginLeft, out=self.collisionX)
+        np.add(self.y, self.crMarginTop, out=self.collisionY)
+
+        if not self.isPlaced:
+            self.carIndex.refresh()
+            self.floaterIndex.refresh()
+            self.isPlaced = True
+
+        elif wrapped.any():
+            jumped = np.flatnonzero(wrapped).tolist()
+            carCount = self.carCount
+            self.carIndex.refreshObjects(
+                idx for idx in jumped if idx < carCount)
+            self.floaterIndex.refreshObjects(
+                idx - carCount for idx in jumped if idx >= carCount)
+
+    def collideCars(self, rect):
+        """Return index of the first car colliding with rect or -1."""
+        return self.carIndex.collide(rect)
+
+    def collideFloaters(self, rect):
+        """Return index of the first floater colliding with rect or -1."""
+        return self.floaterIndex.collide(rect)
+
+    def syncSprites(self):
+        """Copy positions from the engine to the sprites."""
+        for sprite, x, y, collX, collY, isCar in zip(
+                self.sprites, self.x.tolist(), self.y.tolist(),
+                self.collisionX.tolist(), self.collisionY.tolist(),
+                self.isCar.tolist()):
+            sprite.rect.topleft = (x, y)
+            sprite.collisionRect.topleft = (collX, collY)
+            if isCar:
+                sprite.shadow.rect.topleft = (x, y - 4)
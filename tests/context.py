@@ -1,6 +1,9 @@
 import os
 import sys
 
+# Run tests without opening a window.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
 # Add forggie2/ directory to the search path.
 cwd = os.path.abspath(os.path.join(os.path.dirname(__file__)))
 path = os.path.join(cwd, '..', 'forggie2')
@@ -9,3 +12,25 @@ sys.path.insert(0, path)
 import car
 import frog
 import logger
+import loaders
+import configregistry
+import clock
+import level
+import simulation
+import renderer
+import textcache
+import traffic
+import env
+import batchenv
+import solver
+import replay
+import profiler
+import preloader
+import bundle
+import atlas
+import animatedsprite
+import eventlog
+import highscores
+import scorejournal
+import leaderboard
+import main
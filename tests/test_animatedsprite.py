@@ -0,0 +1,70 @@
+"""Tests for the animated sprite and its shared frames."""
+import os
+
+import pytest
+
+from context import animatedsprite, configregistry
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+
+class FakeClock:
+    """Clock returning the time set by the test."""
+
+    def __init__(self):
+        self.time = 0
+
+    def now(self):
+        return self.time
+
+
+@pytest.fixture
+def crystalConfig():
+    return configregistry.REGISTRY.animation(
+        os.path.join(CONFIG_DIR, 'life_crystal.conf'))
+
+
+def test_animationFrames_shared(crystalConfig):
+    """Tests that sprites of the same animation share frames."""
+    first = animatedsprite.AnimatedSprite(crystalConfig, IMAGE_DIR, (0, 0))
+    second = animatedsprite.AnimatedSprite(crystalConfig, IMAGE_DIR,
+                                           (10, 20))
+
+    assert first.frames is second.frames
+    assert first.frameTimes is second.frameTimes
+    assert first.distances is second.distances
+    assert first.rect.topleft == (0, 0)
+    assert second.rect.topleft == (10, 20)
+
+
+def test_animationFrames_rotateKey(crystalConfig):
+    """Tests that rotated frames are cached apart from the plain ones."""
+    plain = animatedsprite.animationFrames(crystalConfig, IMAGE_DIR)
+    rotated = animatedsprite.animationFrames(crystalConfig, IMAGE_DIR, 90)
+
+    assert rotated is not plain
+    assert rotated is animatedsprite.animationFrames(crystalConfig,
+                                                     IMAGE_DIR + os.sep, 90)
+    assert rotated.frameCount == plain.frameCount
+    for plainFrame, rotatedFrame in zip(plain.frames, rotated.frames):
+        width, height = plainFrame.get_size()
+        assert rotatedFrame.get_size() == (height, width)
+
+
+def test_AnimatedSprite_ownState(crystalConfig):
+    """Tests that playback state is kept apart per sprite."""
+    clock = FakeClock()
+    first = animatedsprite.AnimatedSprite(crystalConfig, IMAGE_DIR, (0, 0),
+                                          isActive=True, clock=clock)
+    second = animatedsprite.AnimatedSprite(crystalConfig, IMAGE_DIR, (0, 0),
+                                           clock=clock)
+
+    clock.time = sum(first.frameTimes)
+    first.update()
+    second.update()
+
+    assert first.currentFrame != second.currentFrame
+    assert first.currentCycleDistances is not second.currentCycleDistances
@@ -0,0 +1,112 @@
+"""Tests for the vehicle sprite atlas."""
+import os
+
+import pygame
+import pytest
+
+from context import atlas, level, loaders
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+
+def pixels(image):
+    """Return RGBA pixels of the image."""
+    return pygame.image.tobytes(image, 'RGBA')
+
+
+def test_SpriteAtlas_packing():
+    """Tests that packed images do not overlap and keep their pixels."""
+    images = {}
+    for idx, size in enumerate([(30, 10), (50, 20), (40, 20), (25, 5)]):
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        image.fill((idx * 50, 100, 200, 40 + idx * 50))
+        images[idx] = image
+
+    packed = atlas.SpriteAtlas(images, width=100)
+    rects = list(packed.rects.values())
+
+    for idx, rect in enumerate(rects):
+        assert packed.surface.get_rect().contains(rect)
+        assert rect.collidelist(rects[idx + 1:]) == -1
+
+    for key, image in images.items():
+        assert packed.get(key).get_size() == image.get_size()
+        assert pixels(packed.get(key)) == pixels(image)
+
+
+def test_SpriteAtlas_tooWide():
+    """Tests that images wider than the atlas are rejected."""
+    with pytest.raises(ValueError):
+        atlas.SpriteAtlas({0: pygame.Surface((20, 5))}, width=10)
+
+
+def test_vehicleAtlas_samePixels():
+    """Tests that atlas images equal the loaded and rotated images."""
+    packed = atlas.vehicleAtlas(CONFIG_DIR)
+    names = atlas.vehicleImages(CONFIG_DIR)
+
+    assert 'car1_shadow.png' in names
+    assert 'stuff1.png' in names
+    assert atlas.vehicleAtlas(CONFIG_DIR + os.sep) is packed
+
+    for name in names:
+        image, _ = loaders.loadImage(name, useAlpha=True)
+        rotated = pygame.transform.rotate(image, 180)
+        assert pixels(packed.get((name, False))) == pixels(image), name
+        assert pixels(packed.get((name, True))) == pixels(rotated), name
+
+
+def test_Level_load_spritesShareAtlas():
+    """Tests that cars, shadows and floaters use the atlas surface."""
+    lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=1)
+    lvl.load(os.path.join(CONFIG_DIR, 'level7.conf'))
+    surface = atlas.vehicleAtlas(CONFIG_DIR).surface
+
+    sprites = lvl.cars + lvl.shadows + lvl.floaters
+    assert sprites
+    for sprite in sprites:
+        assert sprite.image.get_parent() is surface
+
+
+def test_Level_load_shadowsNotLoaded(monkeypatch):
+    """Tests that car shadows are not loaded apart from the atlas."""
+    atlas.vehicleAtlas(CONFIG_DIR)
+    loadImage = loaders.loadImage
+    names = []
+
+    def recordingLoadImage(name, *args, **kwargs):
+        names.append(name)
+        return loadImage(name, *args, **kwargs)
+
+    monkeypatch.setattr(loaders, 'loadImage', recordingLoadImage)
+    lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=1)
+    lvl.load(os.path.join(CONFIG_DIR, 'level7.conf'))
+
+    assert lvl.shadows
+    assert not [name for name in names if 'shadow' in name]
+
+
+def test_vehicleImages_anyConfigName(tmp_path):
+    """Tests that vehicles are packed whatever their configs are named."""
+    renames = {'car1.conf': 'truck.conf', 'stuff1.conf': 'log.conf'}
+    for name in os.listdir(CONFIG_DIR):
+        with open(os.path.join(CONFIG_DIR, name)) as configFile:
+            text = configFile.read()
+        for oldName, newName in renames.items():
+            text = text.replace(oldName, newName)
+        (tmp_path / renames.get(name, name)).write_text(text)
+
+    configDir = str(tmp_path)
+    names = atlas.vehicleImages(configDir)
+    assert 'car1.png' in names
+    assert 'car1_shadow.png' in names
+    assert 'stuff1.png' in names
+
+    lvl = level.Level(configDir, IMAGE_DIR, 600, 800, seed=1)
+    lvl.load(os.path.join(configDir, 'level7.conf'))
+    surface = atlas.vehicleAtlas(configDir).surface
+    for sprite in lvl.cars + lvl.shadows + lvl.floaters:
+        assert sprite.image.get_parent() is surface
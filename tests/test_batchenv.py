@@ -0,0 +1,86 @@
+"""Tests for BatchFroggieEnv class."""
+import random
+
+import numpy as np
+import pytest
+
+from context import env, batchenv
+
+
+def copyTraffic(batch, froggie):
+    """Put cars and floaters of the first batch instance where they are in
+    the FroggieEnv."""
+    traffic = froggie.simulation.traffic
+    batch.x[0] = traffic.x
+    batch.y[0] = traffic.y
+    batch.roadTopGap[0] = traffic.roadTopGap
+    batch.collisionX[0] = traffic.collisionX
+    batch.collisionY[0] = traffic.collisionY
+
+
+@pytest.mark.parametrize('name', ['level1.conf', 'level4.conf',
+                                  'level7.conf'])
+def test_BatchFroggieEnv_step_sameAsFroggieEnv(name):
+    """Tests that batch instance behaves like FroggieEnv."""
+    batch = batchenv.BatchFroggieEnv(name, 1, seed=1)
+    froggie = env.FroggieEnv()
+    rnd = random.Random(5)
+
+    for _ in range(10):
+        batch.reset()
+        froggie.reset(name)
+        copyTraffic(batch, froggie)
+
+        done = False
+        while not done:
+            action = rnd.choice((0, 0, 1, 1, 1, 2, 3, 4))
+            observation, reward, done, info = froggie.step(action)
+            observations, rewards, dones, infos = batch.step([action])
+
+            assert dones[0] == done
+            assert rewards[0] == pytest.approx(reward)
+            if done:
+                assert infos['levelTime'][0] == info['levelTime']
+                assert infos['steps'][0] == info['steps']
+                assert infos['completed'][0] == ('completed' in
+                                                 info['events'])
+                break
+
+            frogRect = froggie.simulation.frog.collisionRect
+            assert (batch.frogX[0], batch.frogY[0]) == frogRect.topleft
+            assert (observations[0] == observation).all()
+
+            # Batch cars get their random road gaps from a different random
+            # generator.
+            batch.roadTopGap[0] = froggie.simulation.traffic.roadTopGap
+
+
+def test_BatchFroggieEnv_step_resetsFinished():
+    """Tests that finished instances start over and others continue."""
+    batch = batchenv.BatchFroggieEnv('level1.conf', 8, seed=2,
+                                     maxSteps=10)
+    start = (batch.frogX.copy(), batch.frogY.copy())
+    actions = np.full(8, batchenv.ACTION_NOOP)
+
+    for _ in range(9):
+        observations, rewards, dones, info = batch.step(actions)
+        assert not dones.any()
+
+    assert (batch.steps == 9).all()
+
+    observations, rewards, dones, info = batch.step(actions)
+    assert dones.all()
+    assert (info['steps'] == 10).all()
+    assert (batch.steps == 0).all()
+    assert (batch.frogX == start[0]).all()
+    assert (batch.frogY == start[1]).all()
+    assert observations.shape == (8, env.GRID_CHANNELS, 40, 30)
+
+
+def test_BatchFroggieEnv_noObservation():
+    """Tests that observations can be skipped."""
+    batch = batchenv.BatchFroggieEnv('level2.conf', 4, observation=None)
+    observations, rewards, dones, info = batch.step([1, 2, 3, 4])
+
+    assert observations is None
+    assert rewards.shape == dones.shape == (4,)
@@ -0,0 +1,123 @@
+"""Tests for asset bundles."""
+import os
+
+import mock
+import pygame
+import pytest
+
+from context import bundle, configregistry, level, loaders
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+
+@pytest.fixture(scope='module')
+def bundlePath(tmp_path_factory):
+    """Bundle of the game images and configuration files."""
+    path = str(tmp_path_factory.mktemp('bundle') / 'assets.bundle')
+    bundle.buildBundle(path, IMAGE_DIR, CONFIG_DIR)
+    return path
+
+
+@pytest.fixture
+def assetBundle(bundlePath):
+    """Bundle used by the loaders, with empty caches."""
+    loaders.IMAGE_CACHE.clear()
+    assets = bundle.AssetBundle(bundlePath, IMAGE_DIR, CONFIG_DIR)
+    loaders.useBundle(assets)
+    yield assets
+    loaders.useBundle(None)
+    loaders.IMAGE_CACHE.clear()
+
+
+@pytest.mark.parametrize('name', ['stuff1.png', 'car1.png',
+                                  'background1.png'])
+def test_AssetBundle_image_samePixels(assetBundle, name):
+    """Tests that bundled images have the pixels of the image files."""
+    path = os.path.join(IMAGE_DIR, name)
+    expected = pygame.image.load(path)
+    image = assetBundle.image(path)
+
+    assert image.get_size() == expected.get_size()
+    for pixelFormat in ('RGBA', 'RGB'):
+        assert (pygame.image.tobytes(image, pixelFormat)
+                == pygame.image.tobytes(expected, pixelFormat))
+
+
+def test_AssetBundle_config(assetBundle):
+    """Tests that configuration files are bundled as they are."""
+    path = os.path.join(CONFIG_DIR, 'level1.conf')
+    with open(path) as configFile:
+        assert assetBundle.config(path) == configFile.read()
+
+
+def test_AssetBundle_unknownFiles(assetBundle):
+    """Tests that files not in the bundle are not found."""
+    assert assetBundle.image(os.path.join(IMAGE_DIR, 'nothing.png')) is None
+    assert assetBundle.image(os.path.join(CONFIG_DIR, 'car1.png')) is None
+    assert assetBundle.config(os.path.join(IMAGE_DIR, 'car1.conf')) is None
+    assert not assetBundle.hasImage(os.path.join(IMAGE_DIR, 'nothing.png'))
+
+
+def test_AssetBundle_notBundle(tmp_path):
+    """Tests that other files are rejected."""
+    path = tmp_path / 'other.bundle'
+    path.write_bytes(b'PNG\0' + b'\0' * 20)
+
+    with pytest.raises(ValueError):
+        bundle.AssetBundle(str(path))
+
+
+def test_AssetBundle_staleFiles(tmp_path):
+    """Tests that files changed or removed after packing are noticed."""
+    imageDir = tmp_path / 'images'
+    configDir = tmp_path / 'configs'
+    imageDir.mkdir()
+    configDir.mkdir()
+    for name in ('car1.png', 'stuff1.png'):
+        (imageDir / name).write_bytes(
+            open(os.path.join(IMAGE_DIR, name), 'rb').read())
+    for name in ('car1.conf', 'level1.conf'):
+        (configDir / name).write_bytes(
+            open(os.path.join(CONFIG_DIR, name), 'rb').read())
+
+    path = str(tmp_path / 'assets.bundle')
+    bundle.buildBundle(path, str(imageDir), str(configDir))
+
+    assets = bundle.AssetBundle(path, str(imageDir), str(configDir))
+    assert assets.staleFiles() == []
+
+    # New files are read from disk, the bundle is still fresh.
+    (configDir / 'level2.conf').write_text('[general]\n')
+    assert assets.staleFiles() == []
+
+    with open(configDir / 'car1.conf', 'a') as configFile:
+        configFile.write('\n')
+    (imageDir / 'stuff1.png').unlink()
+
+    assert assets.staleFiles() == [str(imageDir / 'stuff1.png'),
+                                   str(configDir / 'car1.conf')]
+    assets.close()
+
+
+def test_Level_load_fromBundle(assetBundle):
+    """Tests that a level is loaded without reading image or config files."""
+    registry = configregistry.ConfigRegistry()
+    path = os.path.join(CONFIG_DIR, 'level2.conf')
+
+    with mock.patch.object(pygame.image, 'load',
+                           side_effect=AssertionError('file read')), \
+            mock.patch.object(configregistry, 'REGISTRY', registry), \
+            mock.patch.object(level, 'REGISTRY', registry):
+        lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=1)
+        lvl.load(path)
+
+    expected = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=1)
+    expected.load(path)
+
+    assert lvl.name == expected.name
+    assert ([tuple(car.rect) for car in lvl.cars]
+            == [tuple(car.rect) for car in expected.cars])
+    assert registry.parseCount > 0
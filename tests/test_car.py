@@ -3,7 +3,6 @@ import copy
 import mock
 import pytest
 import pygame
-import random
 
 from context import car
 
@@ -100,8 +99,8 @@ def test_car_update(speed, direction, rect, collisionRect, shadowRect, expRect,
     car.freeVerticalSpace = 5
     car.crMarginLeft = 5
     car.crMarginTop = 7
-
-    random.randint = mock.MagicMock(return_value=3)
+    car.rng = mock.MagicMock()
+    car.rng.randint.return_value = 3
 
     car.update()
 
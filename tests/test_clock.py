@@ -0,0 +1,36 @@
+"""Tests for clock classes."""
+import pytest
+
+from context import clock
+
+
+def test_TickClock_tick():
+    """Tests that TickClock time only changes with tick()."""
+    tickClock = clock.TickClock(frameRate=24)
+    assert tickClock.now() == 0
+
+    elapsed = [tickClock.tick() for _ in range(24)]
+
+    assert elapsed == [41, 42, 42] * 8
+    assert sum(elapsed) == tickClock.now() == 1000
+    assert tickClock.ticks == 24
+
+
+@pytest.mark.parametrize('frameRate,elapsed,maxSteps,expected',
+    (
+        (25, (40, 40, 40), None, [1, 1, 1]),
+        (25, (30, 30, 30), None, [0, 1, 1]),
+        (25, (10, 200, 10), None, [0, 5, 0]),
+        (25, (10, 200, 10), 3, [0, 3, 0]),
+        (24, (1000,), None, [24]),
+    ),
+    ids=('TEST2_CASE1', 'TEST2_CASE2', 'TEST2_CASE3', 'TEST2_CASE4',
+         'TEST2_CASE5'),
+)
+def test_TickClock_accumulate(frameRate, elapsed, maxSteps, expected):
+    """Tests for TickClock.accumulate()"""
+    tickClock = clock.TickClock(frameRate=frameRate)
+    result = [tickClock.accumulate(x, maxSteps=maxSteps) for x in elapsed]
+
+    msg = "expected '%s', but got '%s'" % (expected, result)
+    assert result == expected, msg
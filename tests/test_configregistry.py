@@ -0,0 +1,84 @@
+"""Tests for ConfigRegistry class."""
+import os
+import concurrent.futures
+
+from context import configregistry
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+
+
+def test_ConfigRegistry_parsesOnce():
+    """Tests that every configuration file is parsed only once."""
+    registry = configregistry.ConfigRegistry()
+    path = os.path.join(CONFIG_DIR, 'car1.conf')
+
+    car1 = registry.car(path)
+    car2 = registry.car(os.path.join(CONFIG_DIR, '..', 'configs',
+                                     'car1.conf'))
+
+    assert car1 is car2
+    assert registry.parseCount == 1
+    assert car1.image == 'car1.png'
+    assert car1.shadowImage == 'car1_shadow.png'
+    assert car1.direction == 'to_left'
+    assert car1.crMarginTop == 1
+
+
+def test_ConfigRegistry_level():
+    """Tests for ConfigRegistry.level()"""
+    registry = configregistry.ConfigRegistry()
+    level = registry.level(os.path.join(CONFIG_DIR, 'level1.conf'))
+
+    assert level.name == '1'
+    assert (level.frogPosX, level.frogPosY) == (300, 602)
+    assert [t.section for t in level.tracks] == ['track1', 'track2']
+    assert [t.section for t in level.riverTracks] == ['waterTrack1',
+                                                      'waterTrack2']
+
+    track = level.tracks[0]
+    assert (track.top, track.bottom, track.speed) == (473, 535, 2)
+    assert track.direction == 'to_left'
+    assert track.gaps == (240, 100, 100)
+    assert [os.path.basename(c.path) for c in track.objects] == [
+        'car3.conf', 'car2.conf', 'car1.conf']
+
+    # Every car config is parsed only once: level1.conf, car1-3.conf and
+    # stuff1-2.conf.
+    assert registry.parseCount == 6
+    assert track.objects[2] is level.tracks[1].objects[0]
+
+
+def test_ConfigRegistry_animation():
+    """Tests for ConfigRegistry.animation()"""
+    registry = configregistry.ConfigRegistry()
+    anim = registry.animation(os.path.join(CONFIG_DIR,
+                                           'animation_frog_up.conf'))
+
+    assert anim.filename == 'animation_frog_up.png'
+    assert anim.useAlpha is True
+    assert anim.frameSize == (40, 70)
+    assert anim.collisionFrameSize == (30, 40)
+    assert anim.frames == (
+        configregistry.FrameConfig((0, 0, 40, 70), 0, 15),
+        configregistry.FrameConfig((41, 0, 40, 70), 0, 47),
+        configregistry.FrameConfig((82, 0, 40, 70), 0, 0),
+    )
+
+    # Only the first MAX_FRAME_COUNT frames are used.
+    anim = registry.animation(os.path.join(CONFIG_DIR, 'life_crystal.conf'))
+    assert len(anim.frames) == configregistry.MAX_FRAME_COUNT
+    assert anim.collisionFrameSize == (0, 0)
+    assert anim.frames[0].distance is None
+
+
+def test_ConfigRegistry_level_threads():
+    """Tests that a level parsed on several threads at once is parsed once."""
+    registry = configregistry.ConfigRegistry()
+    path = os.path.join(CONFIG_DIR, 'level1.conf')
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        levels = list(executor.map(registry.level, [path] * 8))
+
+    assert all(level is levels[0] for level in levels)
+    assert registry.parseCount == 6
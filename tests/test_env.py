@@ -0,0 +1,78 @@
+"""Tests for FroggieEnv class."""
+import numpy as np
+import pytest
+
+from context import env
+
+
+@pytest.fixture
+def froggieEnv():
+    """Environment with the first level."""
+    froggie = env.FroggieEnv()
+    froggie.reset('level1.conf', seed=3)
+    return froggie
+
+
+def test_FroggieEnv_reset_grid(froggieEnv):
+    """Tests that the grid marks the frog and the traffic."""
+    grid = froggieEnv.reset()
+    frogRect = froggieEnv.simulation.frog.collisionRect
+    cell = env.GRID_CELL_SIZE
+
+    assert grid.shape == (env.GRID_CHANNELS, 40, 30)
+    assert grid.dtype == np.uint8
+    assert grid[env.GRID_FROG, frogRect.top // cell,
+                frogRect.left // cell] == 1
+    assert grid[env.GRID_FROG].sum() == 6
+    assert grid[env.GRID_CARS].sum() > 0
+    assert grid[env.GRID_FLOATERS].sum() > 0
+
+
+def test_FroggieEnv_step_progressReward(froggieEnv):
+    """Tests that jumping towards the finish is rewarded."""
+    start = froggieEnv.simulation.frog.collisionRect.top
+    _, reward, done, info = froggieEnv.step(env.ACTION_NAMES.index('up'))
+    rewards = [reward]
+    for _ in range(2):
+        _, reward, done, info = froggieEnv.step(0)
+        rewards.append(reward)
+
+    top = froggieEnv.simulation.frog.collisionRect.top
+
+    assert top < start
+    assert sum(rewards) == pytest.approx(
+        env.REWARD_PROGRESS * (start - top) / 602)
+    assert not done
+    assert info['steps'] == 3
+
+
+def test_FroggieEnv_step_doneOnDeath(froggieEnv):
+    """Tests that the episode ends when the frog dies."""
+    up = env.ACTION_NAMES.index('up')
+    done = False
+    while not done:
+        _, reward, done, info = froggieEnv.step(up)
+
+    assert info['events'] != [] or info['steps'] == froggieEnv.maxSteps
+    if 'completed' not in info['events']:
+        assert reward < 0
+
+    with pytest.raises(RuntimeError):
+        froggieEnv.step(0)
+
+
+def test_FroggieEnv_frame():
+    """Tests that frame observation is an RGB image of the screen."""
+    froggie = env.FroggieEnv(observation=env.OBSERVATION_FRAME)
+    frame = froggie.reset('level1.conf')
+    frame2, _, _, _ = froggie.step(0)
+
+    assert frame.shape == (800, 600, 3)
+    assert frame.dtype == np.uint8
+    assert not np.array_equal(frame, frame2)
+
+
+def test_FroggieEnv_unknownObservation():
+    """Tests that unknown observation type is rejected."""
+    with pytest.raises(ValueError):
+        env.FroggieEnv(observation='sound')
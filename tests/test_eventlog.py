@@ -0,0 +1,168 @@
+"""Tests for the leveled event log."""
+import io
+import json
+import threading
+
+import pygame
+
+from context import eventlog, logger
+
+# Logger renders messages with pygame fonts.
+pygame.init()
+
+
+class ListSink:
+    """Sink storing records in a list."""
+
+    def __init__(self, minLevel=eventlog.DEBUG, threaded=False):
+        self.minLevel = minLevel
+        self.threaded = threaded
+        self.records = []
+        self.threads = set()
+        self.closed = False
+
+    def write(self, record):
+        self.records.append(record)
+        self.threads.add(threading.current_thread().name)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_EventLog_levels():
+    """Tests that sinks get only records of their level and above."""
+    verbose = ListSink(eventlog.DEBUG)
+    quiet = ListSink(eventlog.WARNING)
+    log = eventlog.EventLog([verbose, quiet])
+
+    log.debug('a')
+    log.info('b')
+    log.error('c', code=3)
+
+    assert [record.message for record in verbose.records] == ['a', 'b', 'c']
+    assert [record.message for record in quiet.records] == ['c']
+    assert quiet.records[0].data == {'code': 3}
+
+
+def test_EventLog_minLevel():
+    """Tests that records below the level of all sinks are not created."""
+    log = eventlog.EventLog([ListSink(eventlog.INFO)])
+    assert log.minLevel == eventlog.INFO
+
+    sink = ListSink(eventlog.DEBUG)
+    log.addSink(sink)
+    assert log.minLevel == eventlog.DEBUG
+
+    log.removeSink(sink)
+    assert log.minLevel == eventlog.INFO
+
+
+def test_EventLog_threaded():
+    """Tests that threaded sinks are written on the background thread."""
+    sink = ListSink(threaded=True)
+    log = eventlog.EventLog([sink])
+
+    for idx in range(20):
+        log.event(eventlog.EVENT_DEATH, cause='killed', idx=idx)
+    log.flush()
+
+    assert [record.data['idx'] for record in sink.records] == list(range(20))
+    assert sink.threads == {'EventLog'}
+
+    log.close()
+    assert sink.closed
+    assert log.thread is None
+
+
+def test_EventLog_queueFull():
+    """Tests that records are dropped instead of waiting for the thread."""
+    sink = ListSink(threaded=True)
+    log = eventlog.EventLog(queueSize=2)
+
+    # Keep the thread busy until all records are logged.
+    blocker = threading.Event()
+    sink.write = lambda record: blocker.wait(10)
+    log.addSink(sink)
+
+    for idx in range(10):
+        log.info('msg')
+
+    assert log.dropped >= 7
+    blocker.set()
+    log.close()
+
+
+def test_EventLog_sinkError():
+    """Tests that a failing sink neither stops the thread nor hangs flush."""
+    failing = ListSink(threaded=True)
+    working = ListSink(threaded=True)
+
+    def write(record):
+        raise OSError('disk full')
+
+    failing.write = write
+    failing.flush = lambda: write(None)
+    log = eventlog.EventLog([failing, working])
+
+    for idx in range(5):
+        log.info('msg', idx=idx)
+    log.flush()
+
+    assert [record.data['idx'] for record in working.records] == list(range(5))
+    assert log.errors >= 6
+    assert log.thread.is_alive()
+    log.close()
+
+
+def test_EventLog_flush_deadThread():
+    """Tests that flush returns when the background thread is not running."""
+    log = eventlog.EventLog([ListSink(threaded=True)])
+    log.queue.put(eventlog.STOP)
+    log.thread.join()
+
+    log.info('msg')
+    log.flush()
+
+
+def test_JsonLinesSink(tmp_path):
+    """Tests that records are written as JSON objects."""
+    path = tmp_path / 'log.jsonl'
+    log = eventlog.EventLog([eventlog.JsonLinesSink(str(path))])
+
+    log.event(eventlog.EVENT_LEVEL_COMPLETED, levelName='level1.conf',
+              levelTime=1234)
+    log.warning('careful')
+    log.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines[0]['event'] == 'levelCompleted'
+    assert lines[0]['level'] == 'INFO'
+    assert lines[0]['levelTime'] == 1234
+    assert lines[1]['message'] == 'careful'
+    assert lines[1]['level'] == 'WARNING'
+
+
+def test_StdoutSink():
+    """Tests that records are printed as lines of text."""
+    stream = io.StringIO()
+    log = eventlog.EventLog([eventlog.StdoutSink(stream=stream)])
+
+    log.debug('hidden')
+    log.info('Game finished', levelTimes=[1, 2])
+    log.close()
+
+    assert stream.getvalue() == 'INFO Game finished levelTimes=[1, 2]\n'
+
+
+def test_OverlaySink():
+    """Tests that records are shown by the on-screen logger at once."""
+    overlay = logger.Logger(screenWidth=640, screenHeight=800)
+    log = eventlog.EventLog([eventlog.OverlaySink(overlay)])
+
+    log.debug('collisionWithRiver: -1')
+
+    assert list(overlay.entries) == ['DEBUG collisionWithRiver: -1']
+    assert log.thread is None
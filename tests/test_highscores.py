@@ -0,0 +1,144 @@
+"""Tests for Highscores class."""
+import pygame
+
+from context import highscores, scorejournal
+
+pygame.init()
+
+LEGACY = '''# This file must have 12 entries.
+
+[result1]
+name = alice
+time = 61.5
+
+[result2]
+name = bob
+time = 70.0
+'''
+
+
+def test_Highscores_load_legacy(tmp_path):
+    """Tests that highscores of the older versions are converted."""
+    path = tmp_path / 'highscores.conf'
+    path.write_text(LEGACY)
+
+    scores = highscores.Highscores()
+    scores.load(str(path))
+
+    assert [(score['name'], score['minutes']) for score in scores.scores] == [
+        ('alice', 1), ('bob', 1)]
+    assert path.read_text().startswith(scorejournal.JOURNAL_HEADER)
+
+
+def test_Highscores_submit_sharedFile(tmp_path):
+    """Tests that results of another game instance are picked up."""
+    path = str(tmp_path / 'highscores.conf')
+    first = highscores.Highscores()
+    first.load(path)
+    second = highscores.Highscores()
+    second.load(path)
+
+    first.submit(highscores.makeScore(80.0, 'first'))
+    second.submit(highscores.makeScore(75.0, 'second'))
+
+    assert first.refresh()
+    assert [score['name'] for score in first.scores] == ['second', 'first']
+    assert first.scores == second.scores
+
+
+def test_Highscores_readOnlyDirectory(tmp_path, monkeypatch):
+    """Tests that a journal which can not be locked is used read only."""
+    path = tmp_path / 'highscores.conf'
+    path.write_text(LEGACY)
+
+    def locked(self):
+        raise PermissionError('read only directory')
+
+    monkeypatch.setattr(scorejournal.ScoreJournal, 'locked', locked)
+    scores = highscores.Highscores()
+    scores.load(str(path))
+
+    assert scores.readOnly
+    assert [score['name'] for score in scores.scores] == ['alice', 'bob']
+    assert path.read_text() == LEGACY
+
+    scores.submit(highscores.makeScore(65.0, 'carol'))
+    assert not scores.refresh()
+    assert [score['name'] for score in scores.scores] == ['alice', 'carol',
+                                                          'bob']
+
+
+def test_Highscores_load_journalNotLocked(tmp_path, monkeypatch):
+    """Tests that reading a journal does not take the lock."""
+    path = str(tmp_path / 'highscores.conf')
+    writer = highscores.Highscores()
+    writer.load(path)
+    writer.submit(highscores.makeScore(80.0, 'first'))
+
+    def locked(self):
+        raise PermissionError('read only directory')
+
+    monkeypatch.setattr(scorejournal.ScoreJournal, 'locked', locked)
+    scores = highscores.Highscores()
+    scores.load(path)
+
+    assert not scores.readOnly
+    assert [score['name'] for score in scores.scores] == ['first']
+
+
+def test_TopScores_insert():
+    """Tests that scores are kept sorted and the worst ones dropped."""
+    top = highscores.TopScores(maxEntries=3)
+
+    assert top.insert(highscores.makeScore(50, 'a')) == 1
+    assert top.insert(highscores.makeScore(20, 'b')) == 1
+    assert top.insert(highscores.makeScore(50, 'c')) == 3
+    assert top.insert(highscores.makeScore(20, 'd')) == 2
+    assert top.insert(highscores.makeScore(60, 'e')) is None
+
+    assert [score['name'] for score in top] == ['b', 'd', 'a']
+    assert top.rank(10) == 1
+    assert top.rank(20) == 3
+    assert top.rank(99) == 4
+
+
+def test_Highscores_render_reusesRows():
+    """Tests that only rows of new scores are rendered."""
+    scores = highscores.Highscores()
+    scores.scores = [highscores.makeScore(60.5 + idx, f'player{idx}')
+                     for idx in range(scores.maxEntries)]
+    scores.render()
+    rows = list(scores.rendered)
+
+    scores.top.insert(highscores.makeScore(10.0, 'best'))
+    scores.render()
+
+    assert scores.rendered[1:] == rows[:-1]
+    assert all(new is old for new, old in zip(scores.rendered[1:], rows))
+    assert len(scores.rows) == scores.maxEntries
+
+
+def test_Highscores_draw_samePixels():
+    """Tests that rows look like separately drawn columns."""
+    scores = highscores.Highscores()
+    score = highscores.makeScore(75.25, 'frog')
+    scores.scores = [score]
+    scores.render()
+
+    surface = pygame.Surface((600, 800))
+    scores.draw(surface)
+
+    font = highscores.getFont(None, highscores.FONT_SIZE)
+    white = pygame.Color('white')
+    expected = pygame.Surface((600, 800))
+    expected.blit(scores.title, (80, 25))
+    for text, posX in [(font.render('1.', True, white), 50),
+                       (font.render('frog', True, white), 110),
+                       (font.render('1', True, white), 330),
+                       (scores.textMin, 375),
+                       (font.render('15.25', True, white), 460),
+                       (scores.textS, 550)]:
+        expected.blit(text, (posX, 100))
+
+    assert (pygame.image.tobytes(surface, 'RGB')
+            == pygame.image.tobytes(expected, 'RGB'))
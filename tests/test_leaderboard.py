@@ -0,0 +1,105 @@
+"""Tests for the SQLite leaderboard."""
+import pygame
+import pytest
+
+from context import leaderboard
+
+pygame.init()
+
+LEVELS = ('level1.conf', 'level2.conf', 'level3.conf')
+
+
+@pytest.fixture
+def board(tmp_path):
+    """Leaderboard with a few runs."""
+    runs = leaderboard.Leaderboard(str(tmp_path / 'leaderboard.db'))
+    runs.addRun('a', [3000, 4000, 5000], LEVELS, finished=1)
+    runs.addRun('b', [2000, 6000, 3000], LEVELS, finished=2)
+    runs.addRun('c', [1000, 3000, 8000], LEVELS, finished=3)
+    runs.addRun('d', [5000, 5000, 5000], LEVELS, finished=4)
+    yield runs
+    runs.close()
+
+
+def test_formatTime():
+    """Tests that times are shown as minutes and seconds."""
+    assert leaderboard.formatTime(61500) == '1:01.50'
+    assert leaderboard.formatTime(9990) == '0:09.99'
+
+
+def test_Leaderboard_top(board):
+    """Tests that runs are ordered by the total time, earlier first."""
+    entries = board.top(limit=3)
+
+    assert [(entry.rank, entry.name, entry.totalMs) for entry in entries] == [
+        (1, 'b', 11000), (2, 'a', 12000), (3, 'c', 12000)]
+    assert [entry.name for entry in board.top(limit=3, offset=2)] == [
+        'c', 'd']
+    assert board.count() == 4
+
+
+def test_Leaderboard_topLevel(board):
+    """Tests that level times are ordered separately."""
+    entries = board.topLevel('level3.conf', limit=2)
+
+    assert [(entry.rank, entry.name, entry.levelMs) for entry in entries] == [
+        (1, 'b', 3000), (2, 'a', 5000)]
+    assert board.levelCount('level3.conf') == 4
+    assert board.levelCount('level9.conf') == 0
+
+
+def test_Leaderboard_rank(board):
+    """Tests that ranks are counted without reading the runs."""
+    assert board.rank(10000) == 1
+    assert board.rank(12000) == 4
+    assert board.rank(99000) == 5
+    assert board.levelRank('level1.conf', 1500) == 2
+
+
+def test_Leaderboard_splits(board):
+    """Tests that level times of a run are kept in order."""
+    runId = board.top(limit=1)[0].runId
+    assert board.splits(runId) == [('level1.conf', 2000),
+                                   ('level2.conf', 6000),
+                                   ('level3.conf', 3000)]
+
+
+def test_Leaderboard_indexes(board):
+    """Tests that top and rank queries use the indexes."""
+    plans = [' '.join(str(row) for row in board.connection.execute(
+                 'EXPLAIN QUERY PLAN ' + query, args))
+             for query, args in [
+                 ('SELECT id FROM runs ORDER BY totalMs, id LIMIT 5', ()),
+                 ('SELECT COUNT(*) FROM splits WHERE level = ? AND '
+                  'levelMs <= ?', ('level1.conf', 1))]]
+
+    assert 'runsByTotal' in plans[0]
+    assert 'splitsByLevel' in plans[1]
+
+
+def test_LeaderboardView_paging(board):
+    """Tests that pages and boards are switched and rendered lazily."""
+    view = leaderboard.LeaderboardView(
+        board, [(name, name) for name in LEVELS], pageSize=3)
+    surface = pygame.Surface((600, 800))
+
+    view.draw(surface)
+    assert [entry[0] for entry in view.entries()] == [1, 2, 3]
+    rendered = view.rendered
+
+    view.previousPage()
+    assert view.rendered is rendered
+
+    view.nextPage()
+    assert view.page == 1
+    assert [entry[1] for entry in view.entries()] == ['d']
+    view.nextPage()
+    assert view.page == 1
+
+    view.nextBoard()
+    assert view.page == 0
+    assert [entry[1] for entry in view.entries()] == ['c', 'b', 'a']
+    view.draw(surface)
+
+    view.show()
+    assert (view.board, view.page, view.rendered) == (0, 0, None)
@@ -0,0 +1,70 @@
+"""Tests for image loading functions."""
+import pytest
+import pygame
+
+from context import loaders
+
+
+@pytest.fixture
+def cache():
+    """Replace process wide image cache with a clean one."""
+    original = loaders.IMAGE_CACHE
+    loaders.IMAGE_CACHE = loaders.ImageCache()
+    yield loaders.IMAGE_CACHE
+    loaders.IMAGE_CACHE = original
+
+
+def test_loadImage_cached(cache):
+    """Tests that loadImage() decodes every image only once."""
+    image1, rect1 = loaders.loadImage('car1.png', useAlpha=True)
+    image2, rect2 = loaders.loadImage('car1.png', useAlpha=True)
+
+    assert image1 is image2
+    assert rect1 == rect2
+    assert rect1 is not rect2, 'Every caller must get its own rect.'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Surface converted without alpha channel is a different surface.
+    image3, _ = loaders.loadImage('car1.png', useAlpha=False)
+    assert image3 is not image1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_loadImage_converted(cache):
+    """Tests that cached surface is converted to display pixel format."""
+    pygame.display.init()
+    screen = pygame.display.set_mode((60, 80))
+
+    image, _ = loaders.loadImage('car1.png', useAlpha=False)
+    assert image.get_bitsize() == screen.get_bitsize()
+
+    image, _ = loaders.loadImage('car1.png', useAlpha=True)
+    assert image.get_flags() & pygame.SRCALPHA
+
+    pygame.display.quit()
+
+
+@pytest.mark.parametrize('maxBytes,keys,expected',
+    (
+        (None, ('a', 'b', 'c'), ['a', 'b', 'c']),
+        (800, ('a', 'b', 'c'), ['b', 'c']),
+        (800, ('a', 'b', 'a', 'c'), ['a', 'c']),
+        (100, ('a', 'b'), ['b']),
+    ),
+    ids=('TEST3_CASE1', 'TEST3_CASE2', 'TEST3_CASE3', 'TEST3_CASE4'),
+)
+def test_ImageCache_lru(maxBytes, keys, expected):
+    """Tests for ImageCache size limit."""
+    cache = loaders.ImageCache(maxBytes=maxBytes)
+    surfaces = {}
+    for key in keys:
+        surface = cache.get(key)
+        if surface is None:
+            # 10x10 pixels, 4 bytes per pixel: 400 bytes.
+            surface = surfaces.get(key) or pygame.Surface((10, 10), 0, 32)
+            surfaces[key] = surface
+            cache.put(key, surface)
+
+    msg = "expected '%s', but got '%s'" % (expected, list(cache.surfaces))
+    assert list(cache.surfaces) == expected, msg
+    assert cache.size == 400 * len(expected)
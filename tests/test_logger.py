@@ -71,3 +71,42 @@ def test_Logger_log(msg, logToScreen, logToStdout, expReturn, expected):
     msg = "expected '%s', but got '%s'" % (expected, loger.messages)
     assert expected == loger.messages, msg
 
+
+def test_Logger_log_keepsNewest():
+    """Tests that only the newest messages are kept."""
+    loger = logger.Logger(screenWidth=640, screenHeight=800)
+    for idx in range(loger.messageBufferSize + 50):
+        loger.log(str(idx))
+
+    assert len(loger.entries) == loger.messageBufferSize
+    assert loger.messages[0] == '50'
+    assert loger.messages[-1] == str(loger.messageBufferSize + 49)
+
+
+def test_Logger_displayMessages_cached():
+    """Tests that messages are drawn like separate lines and cached."""
+    loger = logger.Logger(screenWidth=640, screenHeight=800)
+    for idx in range(loger.messageShowCount + 5):
+        loger.log(f'message {idx}')
+
+    screen = pygame.Surface((640, 800))
+    rects = loger.displayMessages(screen)
+    rendered = loger.rendered
+
+    expected = pygame.Surface((640, 800))
+    yPos = loger.msgY
+    for msg in loger.messages[-loger.messageShowCount:]:
+        text = logger.TEXT_CACHE.render(msg, loger.fontSize, loger.textColour)
+        expected.blit(text, (loger.msgX, yPos))
+        yPos += loger.verticalGap
+
+    assert len(rects) == 1
+    assert (pygame.image.tobytes(screen, 'RGB')
+            == pygame.image.tobytes(expected, 'RGB'))
+
+    loger.displayMessages(screen)
+    assert loger.rendered is rendered
+
+    loger.log('new message')
+    loger.displayMessages(screen)
+    assert loger.rendered is not rendered
@@ -0,0 +1,110 @@
+"""Tests for the game loop."""
+import os
+
+import pygame
+import pytest
+
+from context import highscores, logger, main
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+# Amount of frames played.
+FRAMES = 120
+
+
+class FakeClock:
+    """pygame.time.Clock which does not wait: every frame is one tick."""
+
+    def tick(self, framerate=0):
+        return 1000 / main.FRAME_RATE
+
+
+class CountingLogger(logger.Logger):
+    """Logger counting how often the shown messages are drawn."""
+
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.renderCount = 0
+        self.instances.append(self)
+
+    def render(self):
+        self.renderCount += 1
+        super().render()
+
+
+@pytest.fixture
+def game():
+    """Game with its level preloader shut down after the test."""
+    game = main.Game(CONFIG_DIR, IMAGE_DIR)
+    yield game
+    game.preloader.close()
+
+
+def test_Game_play_idleLevelKeepsLogCache(game, monkeypatch):
+    """Tests that an idle level does not redraw the log overlay."""
+    # Level with river tracks, the frog waits on the bank.
+    game.gameConfig = game.gameConfig._replace(levels=('level3.conf',))
+    monkeypatch.setattr(main.pygame.time, 'Clock', FakeClock)
+    monkeypatch.setattr(main, 'Logger', CountingLogger)
+
+    frames = [0]
+    getEvents = pygame.event.get
+
+    def events():
+        getEvents()
+        frames[0] += 1
+        if frames[0] == 1:
+            # Show log messages.
+            return [pygame.event.Event(pygame.KEYDOWN,
+                                       key=pygame.K_BACKQUOTE)]
+        if frames[0] > FRAMES:
+            return [pygame.event.Event(pygame.QUIT)]
+        return []
+
+    monkeypatch.setattr(main.pygame.event, 'get', events)
+    game.play(game.screen, highscores.TopScores())
+
+    log = CountingLogger.instances[-1]
+    messages = list(log.entries)
+    assert sum('collisionWithRiver' in msg for msg in messages) == 1
+
+    # Only new messages (level loading, frame statistics once a second)
+    # redraw the overlay.
+    assert log.renderCount <= len(messages)
+    assert log.renderCount < FRAMES / 10
+
+
+def test_Game_play_escStopsGame(game, monkeypatch, tmp_path):
+    """Tests that <esc> loads no further levels and keeps the last replay."""
+    replayPath = tmp_path / 'game.replay'
+    replayPath.write_text('last game')
+    game.gameConfig = game.gameConfig._replace(replayPath=str(replayPath))
+    monkeypatch.setattr(main.pygame.time, 'Clock', FakeClock)
+
+    taken = []
+    take = game.preloader.take
+
+    def recordingTake(levelConfigPath, *args, **kwargs):
+        taken.append(os.path.basename(levelConfigPath))
+        return take(levelConfigPath, *args, **kwargs)
+
+    monkeypatch.setattr(game.preloader, 'take', recordingTake)
+
+    getEvents = pygame.event.get
+
+    def events():
+        getEvents()
+        return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE)]
+
+    monkeypatch.setattr(main.pygame.event, 'get', events)
+    score, quitApplication, pressedEsc = game.play(game.screen,
+                                                   highscores.TopScores())
+
+    assert pressedEsc and not quitApplication
+    assert taken == [game.gameConfig.levels[0]]
+    assert replayPath.read_text() == 'last game'
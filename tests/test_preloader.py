@@ -0,0 +1,136 @@
+"""Tests for LevelPreloader class."""
+import os
+
+import pytest
+
+from context import level, loaders, preloader
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+
+def carPositions(lvl):
+    """Return rects of cars and floaters of the level as tuples."""
+    return [tuple(sprite.rect) for sprite in lvl.cars + lvl.floaters]
+
+
+@pytest.fixture
+def levelPreloader():
+    """Preloader of the game levels."""
+    loader = preloader.LevelPreloader(CONFIG_DIR, IMAGE_DIR, 600, 800)
+    yield loader
+    loader.close()
+
+
+def test_levelImages():
+    """Tests that all images of the level are listed once."""
+    images = preloader.levelImages(os.path.join(CONFIG_DIR, 'level1.conf'),
+                                   CONFIG_DIR)
+
+    assert len(images) == len(set(images))
+    assert 'background1.png' in images
+    assert 'finish1.png' in images
+    assert 'car3_shadow.png' in images
+    assert 'stuff1.png' in images
+    assert 'animation_frog_up.png' in images
+
+
+def test_decodeImage_usedByLoadImage():
+    """Tests that a decoded image is converted and cached by loadImage()."""
+    loaders.IMAGE_CACHE.clear()
+    path = os.path.normpath(os.path.join(IMAGE_DIR, 'car2.png'))
+
+    loaders.decodeImage(path)
+    decoded = loaders.DECODED[path]
+
+    image, rect = loaders.loadImage(path, useAlpha=True)
+    assert path not in loaders.DECODED
+    assert rect.size == decoded.get_size()
+
+    # Cached images are not decoded again.
+    loaders.decodeImage(path)
+    assert path not in loaders.DECODED
+
+
+def test_LevelPreloader_take_prepared(levelPreloader):
+    """Tests that a prepared level is the same as a level loaded directly."""
+    path = os.path.join(CONFIG_DIR, 'level3.conf')
+    levelPreloader.prepare(path)
+    levelPreloader.build(path, 24, seed=5)
+    assert path not in levelPreloader.pending
+    assert levelPreloader.isReady(path)
+
+    prepared = levelPreloader.take(path, 24, seed=5)
+
+    expected = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=5)
+    expected.load(path)
+
+    assert prepared.name == expected.name
+    assert prepared.clock.frameRate == 24
+    assert carPositions(prepared) == carPositions(expected)
+    assert path not in levelPreloader.built
+
+
+def test_LevelPreloader_take_otherSeed(levelPreloader):
+    """Tests that a level built with another seed is reset for the seed."""
+    path = os.path.join(CONFIG_DIR, 'level2.conf')
+    levelPreloader.build(path, 24, seed=1)
+    built = levelPreloader.pool[path]
+
+    taken = levelPreloader.take(path, 24, seed=2)
+
+    assert taken is built
+    expected = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=2)
+    expected.load(path)
+    assert carPositions(taken) == carPositions(expected)
+
+
+def test_LevelPreloader_take_pooled(levelPreloader, monkeypatch):
+    """Tests that a level taken again is reset without loading it."""
+    path = os.path.join(CONFIG_DIR, 'level1.conf')
+    first = levelPreloader.take(path, 24, seed=3)
+    first.frog.lifesLeft = 1
+    for _ in range(50):
+        first.clock.tick()
+        for sprite in first.cars + first.floaters:
+            sprite.update()
+
+    def fail(*args):
+        raise AssertionError('level loaded again')
+
+    monkeypatch.setattr(level.Level, 'load', fail)
+    levelPreloader.prepare(path)
+    assert levelPreloader.isReady(path)
+    assert path not in levelPreloader.pending
+
+    second = levelPreloader.take(path, 24, seed=3)
+
+    assert second is first
+    assert second.clock.now() == 0
+    assert second.frog.lifesLeft == 3
+    monkeypatch.undo()
+    expected = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=3)
+    expected.load(path)
+    assert carPositions(second) == carPositions(expected)
+
+
+def test_LevelPreloader_take_otherFrameRate(levelPreloader):
+    """Tests that a pooled level of another frame rate is built again."""
+    path = os.path.join(CONFIG_DIR, 'level1.conf')
+    first = levelPreloader.take(path, 24, seed=3)
+    second = levelPreloader.take(path, 30, seed=3)
+
+    assert second is not first
+    assert second.clock.frameRate == 30
+
+
+def test_LevelPreloader_isReady(levelPreloader):
+    """Tests that preparing finishes on the worker thread."""
+    path = os.path.join(CONFIG_DIR, 'level4.conf')
+    assert not levelPreloader.isReady(path)
+
+    levelPreloader.prepare(path)
+    levelPreloader.pending[path].result(timeout=10)
+    assert levelPreloader.isReady(path)
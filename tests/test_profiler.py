@@ -0,0 +1,172 @@
+"""Tests for FrameProfiler and ProfilerOverlay classes."""
+import csv
+import json
+import os
+
+import pygame
+import pytest
+
+from context import clock, level, profiler, simulation
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+
+class FakeTimer:
+    """Timer returning the time set by the test."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def playFrame(prof, timer, times):
+    """Lap phases taking the given miliseconds."""
+    prof.beginFrame()
+    for phase, ms in times:
+        timer.now += ms / 1000
+        prof.lap(phase)
+
+    return prof.endFrame()
+
+
+@pytest.mark.parametrize('values,pct,expected', (
+    ([], 50, 0.0),
+    ([1.0], 99, 1.0),
+    ([1.0, 2.0, 3.0, 4.0], 50, 2.0),
+    ([float(i) for i in range(1, 101)], 95, 95.0),
+    ([float(i) for i in range(1, 101)], 99, 99.0),
+))
+def test_percentile(values, pct, expected):
+    """Tests nearest rank percentiles."""
+    assert profiler.percentile(values, pct) == expected
+
+
+def test_FrameProfiler_lap_accumulates():
+    """Tests that phases lapped several times per frame are summed up."""
+    timer = FakeTimer()
+    prof = profiler.FrameProfiler(timer=timer)
+
+    frame = playFrame(prof, timer, [(profiler.PHASE_EVENTS, 2),
+                                    (profiler.PHASE_TRAFFIC, 3),
+                                    (profiler.PHASE_TRAFFIC, 4),
+                                    (profiler.PHASE_FLIP, 1)])
+    timer.now += 0.005
+
+    assert frame[profiler.PHASE_EVENTS] == pytest.approx(2)
+    assert frame[profiler.PHASE_TRAFFIC] == pytest.approx(7)
+    assert frame[profiler.PHASE_HUD] == 0
+    assert frame[profiler.TOTAL] == pytest.approx(10)
+
+    frame = playFrame(prof, timer, [(profiler.PHASE_EVENTS, 1)])
+    assert frame[profiler.PHASE_TRAFFIC] == 0
+    assert prof.frameCount == 2
+
+
+def test_FrameProfiler_percentiles_rolling():
+    """Tests that only the last frames are taken into account."""
+    timer = FakeTimer()
+    prof = profiler.FrameProfiler(windowSize=10, timer=timer)
+
+    for ms in range(1, 21):
+        playFrame(prof, timer, [(profiler.PHASE_HUD, ms)])
+
+    p50, p95, p99 = prof.percentiles(profiler.PHASE_HUD)
+    assert p50 == pytest.approx(15)
+    assert p95 == pytest.approx(20)
+    assert p99 == pytest.approx(20)
+    assert set(prof.summary()) == set(profiler.PHASES) | {profiler.TOTAL}
+
+
+@pytest.mark.parametrize('extension', ('.csv', '.json'))
+def test_FrameProfiler_trace(tmp_path, extension):
+    """Tests that every frame is written to the trace."""
+    timer = FakeTimer()
+    prof = profiler.FrameProfiler(timer=timer)
+    path = str(tmp_path / ('trace' + extension))
+
+    prof.openTrace(path)
+    for ms in (3, 5):
+        playFrame(prof, timer, [(profiler.PHASE_FROG, ms)])
+    prof.closeTrace()
+
+    with open(path, newline='') as traceFile:
+        if extension == '.csv':
+            rows = list(csv.DictReader(traceFile))
+        else:
+            rows = [json.loads(line) for line in traceFile]
+
+    assert [int(row['frame']) for row in rows] == [0, 1]
+    assert [float(row['frog']) for row in rows] == [3.0, 5.0]
+    assert [float(row['total']) for row in rows] == [3.0, 5.0]
+
+
+@pytest.mark.parametrize('extension', ('.csv', '.json'))
+def test_FrameProfiler_trace_append(tmp_path, extension):
+    """Tests that traces of later games are appended to the file."""
+    path = str(tmp_path / ('trace' + extension))
+
+    for ms in (3, 5):
+        timer = FakeTimer()
+        prof = profiler.FrameProfiler(timer=timer)
+        prof.openTrace(path)
+        playFrame(prof, timer, [(profiler.PHASE_FROG, ms)])
+        prof.closeTrace()
+
+    with open(path, newline='') as traceFile:
+        if extension == '.csv':
+            rows = list(csv.DictReader(traceFile))
+        else:
+            rows = [json.loads(line) for line in traceFile]
+
+    assert [int(row['frame']) for row in rows] == [0, 0]
+    assert [float(row['frog']) for row in rows] == [3.0, 5.0]
+
+
+def test_FrameProfiler_openTrace_unknownFormat(tmp_path):
+    """Tests that unknown trace formats are rejected."""
+    with pytest.raises(ValueError):
+        profiler.FrameProfiler().openTrace(str(tmp_path / 'trace.txt'))
+
+
+def test_Simulation_step_profiled():
+    """Tests that simulation steps are split into their phases."""
+    lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800,
+                      clock=clock.TickClock(), seed=1)
+    lvl.load(os.path.join(CONFIG_DIR, 'level1.conf'))
+    sim = simulation.Simulation(lvl)
+    sim.profiler = prof = profiler.FrameProfiler()
+
+    prof.beginFrame()
+    for _ in range(3):
+        sim.step()
+    frame = prof.endFrame()
+
+    for phase in (profiler.PHASE_COLLISIONS, profiler.PHASE_TRAFFIC,
+                  profiler.PHASE_FROG):
+        assert frame[phase] > 0
+
+    assert frame[profiler.PHASE_OBJECTS] == 0
+
+
+def test_ProfilerOverlay_draw():
+    """Tests that the overlay is drawn inside its panel."""
+    pygame.init()
+    screen = pygame.Surface((600, 800))
+    timer = FakeTimer()
+    prof = profiler.FrameProfiler(timer=timer)
+    overlay = profiler.ProfilerOverlay(prof, budget=1000 / 24,
+                                       position=(10, 20))
+
+    for ms in (20, 60):
+        playFrame(prof, timer, [(profiler.PHASE_OBJECTS, ms)])
+
+    rect = overlay.draw(screen)
+
+    assert rect.topleft == (10, 20)
+    assert rect.size == overlay.panel.get_size()
+    assert overlay.drawnFrame == 2
@@ -0,0 +1,62 @@
+"""Tests for LevelRenderer class."""
+import os
+
+import pygame
+
+from context import level, renderer, simulation
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+
+def renderFrames(screen, useDirtyRects, frameCount):
+    """Play first level and return pixels of every drawn frame."""
+    lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=1)
+    lvl.load(os.path.join(CONFIG_DIR, 'level1.conf'))
+    sim = simulation.Simulation(lvl)
+
+    levelRenderer = renderer.LevelRenderer(screen, lvl,
+                                           useDirtyRects=useDirtyRects)
+    groups = [pygame.sprite.RenderUpdates(sprites)
+              for sprites in (lvl.floaters, lvl.shadows, lvl.cars)]
+    font = pygame.font.Font(None, 30)
+
+    frames = []
+    for i in range(frameCount):
+        sim.step(simulation.NO_INPUTS._replace(up=(i % 9 == 0),
+                                               cont=(i % 40 == 0)))
+
+        sim.syncSprites()
+        levelRenderer.beginFrame()
+        levelRenderer.drawGroup(groups[0])
+        levelRenderer.addRects(lvl.frog.draw(screen))
+        levelRenderer.drawGroup(groups[1])
+        levelRenderer.drawGroup(groups[2])
+
+        text = font.render(str(sim.levelTime), True, (255, 255, 255))
+        levelRenderer.addRects(screen.blit(text, (535, 770)))
+        if sim.frogIsDown:
+            text = font.render('Ooops!', True, (255, 255, 255))
+            levelRenderer.addRects(screen.blit(text, (200, 300)))
+
+        levelRenderer.endFrame()
+        frames.append(pygame.image.tobytes(screen, 'RGB'))
+
+    return frames
+
+
+def test_LevelRenderer_dirtyRectsSameAsFlip():
+    """Tests that dirty rect mode draws the same picture as full redraw."""
+    pygame.init()
+    screen = pygame.display.set_mode((600, 800))
+
+    expected = renderFrames(screen, useDirtyRects=False, frameCount=150)
+    result = renderFrames(screen, useDirtyRects=True, frameCount=150)
+
+    pygame.display.quit()
+
+    different = [i for i, (x, y) in enumerate(zip(expected, result))
+                 if x != y]
+    assert different == [], 'Frames drawn differently: %s' % different
@@ -0,0 +1,80 @@
+"""Tests for replay recording and the replay runner."""
+import pytest
+
+from context import env, replay, solver, simulation
+from context import clock
+
+
+def makeReplay(name='level2.conf', seed=4):
+    """Record solver's inputs of a level as a replay."""
+    solution = solver.LevelSolver(name, seed=seed).solve()
+    recorder = replay.Recorder(clock.DEFAULT_FRAME_RATE)
+    recorder.startLevel(name, seed)
+    for action in solution.actions + [0]:
+        recorder.record(env.ACTIONS[action])
+
+    recorder.completeLevel(solution.levelTime)
+    return recorder.replay
+
+
+def test_packInputs_roundTrip():
+    """Tests that all input combinations survive packing."""
+    for mask in range(2 ** len(simulation.Inputs._fields)):
+        inputs = replay.unpackInputs(mask)
+        assert replay.packInputs(inputs) == mask
+
+    assert replay.packInputs(simulation.NO_INPUTS) == 0
+
+
+def test_Replay_pack_roundTrip():
+    """Tests that unpacked replay equals the packed one."""
+    inputs = [0] * 70000 + [1, 1, 4, 32, 0]
+    original = replay.Replay(24, [
+        replay.LevelRecording('level1.conf', 2 ** 32 - 1, inputs, 12345),
+        replay.LevelRecording('level2.conf', 7, [], None)])
+
+    data = original.pack()
+    # Inputs are run length encoded.
+    assert len(data) < 100
+
+    loaded = replay.Replay.unpack(data)
+    assert loaded.frameRate == 24
+    assert [rec.level for rec in loaded.levels] == ['level1.conf',
+                                                    'level2.conf']
+    assert [rec.seed for rec in loaded.levels] == [2 ** 32 - 1, 7]
+    assert loaded.levels[0].inputs == inputs
+    assert loaded.levels[1].inputs == []
+    assert loaded.levelTimes == [12345]
+
+
+def test_Replay_unpack_broken():
+    """Tests that broken files are rejected."""
+    data = makeReplay().pack()
+
+    with pytest.raises(ValueError):
+        replay.Replay.unpack(b'XXXX' + data[4:])
+
+    with pytest.raises(ValueError):
+        replay.Replay.unpack(data[:-1])
+
+
+def test_ReplayRunner_verify(tmp_path):
+    """Tests that replayed level times match the recorded ones."""
+    path = str(tmp_path / 'game.replay')
+    makeReplay().save(path)
+
+    loaded = replay.Replay.load(path)
+    isValid, levelTimes = replay.ReplayRunner(loaded).verify()
+
+    assert isValid
+    assert levelTimes == loaded.levelTimes
+    assert len(levelTimes) == 1
+
+
+def test_ReplayRunner_verify_tampered():
+    """Tests that a changed level time is detected."""
+    recorded = makeReplay()
+    recorded.levels[0].levelTime -= 1000
+
+    isValid, _ = replay.ReplayRunner(recorded).verify()
+    assert not isValid
@@ -0,0 +1,90 @@
+"""Tests for the append-only score journal."""
+import multiprocessing
+
+from context import scorejournal
+
+
+def submitScores(path, first, count):
+    """Submit results from another process."""
+    journal = scorejournal.ScoreJournal(path, maxEntries=1000)
+    for idx in range(first, first + count):
+        journal.submit(idx / 10, f'p{idx}')
+
+
+def test_ScoreJournal_submit_best(tmp_path):
+    """Tests that only the best results are kept, earlier first on ties."""
+    journal = scorejournal.ScoreJournal(str(tmp_path / 'scores'),
+                                        maxEntries=3)
+    for seconds, name in [(50, 'a'), (20, 'b'), (30, 'c'), (20, 'd'),
+                          (10, 'e'), (30, 'f')]:
+        journal.submit(seconds, name)
+
+    assert journal.entries == [(10, 'e'), (20, 'b'), (20, 'd')]
+
+
+def test_ScoreJournal_refresh_incremental(tmp_path):
+    """Tests that readers read only lines appended since the last read."""
+    path = str(tmp_path / 'scores')
+    writer = scorejournal.ScoreJournal(path)
+    reader = scorejournal.ScoreJournal(path)
+    assert not reader.refresh()
+
+    writer.submit(40.5, 'abc')
+    assert reader.refresh()
+    offset = reader.offset
+
+    writer.submit(30.25, 'def')
+    assert reader.refresh()
+    assert reader.offset > offset
+    assert reader.entries == [(30.25, 'def'), (40.5, 'abc')]
+    assert not reader.refresh()
+
+
+def test_ScoreJournal_compact(tmp_path):
+    """Tests that a long journal is replaced with the best results."""
+    path = str(tmp_path / 'scores')
+    journal = scorejournal.ScoreJournal(path, maxEntries=2)
+    reader = scorejournal.ScoreJournal(path, maxEntries=2)
+
+    compacted = [journal.submit(100 - idx, str(idx))
+                 for idx in range(2 * scorejournal.COMPACT_FACTOR + 1)]
+
+    assert compacted[-1] and not any(compacted[:-1])
+    with open(path) as journalFile:
+        lines = journalFile.read().splitlines()
+    assert lines == [scorejournal.JOURNAL_HEADER.strip(), '84.0\t16',
+                     '85.0\t15']
+
+    # Reader notices the replaced file.
+    reader.refresh()
+    assert reader.entries == [(84.0, '16'), (85.0, '15')]
+
+
+def test_ScoreJournal_brokenLines(tmp_path):
+    """Tests that broken and torn lines are skipped."""
+    path = tmp_path / 'scores'
+    path.write_text(scorejournal.JOURNAL_HEADER + 'oops\n12.5\tok\n13')
+    journal = scorejournal.ScoreJournal(str(path))
+
+    journal.refresh()
+    assert journal.entries == [(12.5, 'ok')]
+
+    journal.submit(11.0, 'new')
+    assert journal.entries == [(11.0, 'new'), (12.5, 'ok')]
+
+
+def test_ScoreJournal_concurrent(tmp_path):
+    """Tests that results submitted by several processes are all kept."""
+    path = str(tmp_path / 'scores')
+    processes = [multiprocessing.Process(target=submitScores,
+                                         args=(path, idx * 50, 50))
+                 for idx in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+
+    journal = scorejournal.ScoreJournal(path, maxEntries=1000)
+    journal.refresh()
+    assert sorted(name for _, name in journal.entries) == sorted(
+        f'p{idx}' for idx in range(200))
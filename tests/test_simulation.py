@@ -0,0 +1,154 @@
+"""Tests for Simulation class."""
+import os
+import pytest
+
+from context import clock, level, simulation
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+UP = simulation.NO_INPUTS._replace(up=True)
+CONTINUE = simulation.NO_INPUTS._replace(cont=True)
+RESTART = simulation.NO_INPUTS._replace(restart=True)
+
+
+@pytest.fixture
+def sim():
+    """Simulation of the first level."""
+    lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800,
+                      clock=clock.TickClock(frameRate=25))
+    lvl.load(os.path.join(CONFIG_DIR, 'level1.conf'))
+    return simulation.Simulation(lvl)
+
+
+def test_Simulation_step_movesTraffic(sim):
+    """Tests that cars and floaters move by their speed every step."""
+    cars = [car.rect.left for car in sim.cars]
+    floaters = [floater.rect.left for floater in sim.floaters]
+
+    events = sim.step()
+    sim.syncSprites()
+
+    assert events == []
+    assert [car.rect.left for car in sim.cars] == [
+        x + car.speed for x, car in zip(cars, sim.cars)]
+    assert [floater.rect.left for floater in sim.floaters] == [
+        x + floater.speed for x, floater in zip(floaters, sim.floaters)]
+    assert (sim.clock.ticks, sim.levelTime) == (1, 40)
+
+
+def test_Simulation_step_jump(sim):
+    """Tests that frog jumps up when up key is pressed."""
+    top = sim.frog.collisionRect.top
+
+    sim.step(UP)
+    for _ in range(5):
+        sim.step()
+
+    # Jump up animation moves the frog by 15 and 47 pixels.
+    assert sim.frog.collisionRect.top == top - 15 - 47
+
+
+def test_Simulation_step_killed(sim):
+    """Tests that frog run over by a car loses life and can continue."""
+    startCenter = sim.frog.collisionRect.center
+    sim.frog.collisionRect.center = sim.carCollideRects[0].center
+
+    assert sim.step() == [simulation.EVENT_KILLED]
+    assert sim.frog.isDead
+    assert sim.frog.lifesLeft == 2
+
+    # Time does not run while frog is dead.
+    levelTime = sim.levelTime
+    sim.step(UP)
+    assert sim.levelTime == levelTime
+
+    assert sim.step(CONTINUE) == [simulation.EVENT_CONTINUED]
+    assert not sim.frog.isDead
+    assert sim.frog.collisionRect.center == startCenter
+
+
+def test_Simulation_step_gameOver(sim):
+    """Tests that level can be restarted after all lifes are lost."""
+    sim.frog.lifesLeft = 1
+    sim.frog.collisionRect.center = sim.carCollideRects[0].center
+
+    events = sim.step()
+    assert events == [simulation.EVENT_KILLED, simulation.EVENT_GAME_OVER]
+    assert sim.gameOver
+
+    # Frog can not continue once the game is over.
+    assert sim.step(CONTINUE) == []
+
+    assert sim.step(RESTART) == [simulation.EVENT_RESTARTED]
+    assert not sim.gameOver
+    assert sim.frog.lifesLeft == 3
+
+
+def test_Simulation_step_completed(sim):
+    """Tests that level is completed when frog reaches the finish."""
+    sim.step()
+    sim.frog.collisionRect.center = sim.finishRect.center
+
+    assert sim.step() == [simulation.EVENT_COMPLETED]
+    assert sim.levelCompleted
+    assert sim.frog.isLocked
+
+    # Level time stops after completion.
+    levelTime = sim.levelTime
+    assert sim.step(UP) == []
+    assert sim.levelTime == levelTime == 80
+
+
+def playLevel(frameRate, steps):
+    """Play first level with the same inputs and return frog positions."""
+    lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800,
+                      clock=clock.TickClock(frameRate=frameRate))
+    lvl.load(os.path.join(CONFIG_DIR, 'level1.conf'))
+    sim = simulation.Simulation(lvl)
+
+    positions = []
+    for i in range(steps):
+        sim.step(UP if i % 4 == 0 else simulation.NO_INPUTS)
+        positions.append((sim.frog.collisionRect.topleft, sim.frog.isDrowned,
+                          sim.frog.anim.currentFrame))
+
+    return positions, sim.levelTime
+
+
+def test_Simulation_deterministic():
+    """Tests that the same inputs always give the same results."""
+    assert playLevel(24, 100) == playLevel(24, 100)
+
+
+def playSteps(lvl, steps):
+    """Play the level and return frog and car positions of every step."""
+    sim = simulation.Simulation(lvl)
+
+    positions = []
+    for i in range(steps):
+        sim.step(UP if i % 4 == 0 else simulation.NO_INPUTS)
+        sim.syncSprites()
+        positions.append((sim.frog.collisionRect.topleft, sim.frog.lifesLeft,
+                          sim.frog.anim.currentFrame,
+                          [tuple(car.rect) for car in lvl.cars]))
+
+    return positions, sim.levelTime
+
+
+def test_Level_reset_samePlay():
+    """Tests that a reset level plays like a freshly loaded one."""
+    path = os.path.join(CONFIG_DIR, 'level1.conf')
+    lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=7)
+    lvl.load(path)
+    first = playSteps(lvl, 150)
+
+    lvl.reset(seed=7)
+    assert playSteps(lvl, 150) == first
+
+    fresh = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=9)
+    fresh.load(path)
+    lvl.reset(seed=9)
+    assert playSteps(lvl, 150) == playSteps(fresh, 150)
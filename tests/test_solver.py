@@ -0,0 +1,67 @@
+"""Tests for the level solver."""
+import numpy as np
+import pytest
+
+from context import env, eventlog, solver
+
+
+@pytest.mark.parametrize('name', ['level2.conf', 'level3.conf'])
+def test_LevelSolver_solve_inputsCompleteLevel(name):
+    """Tests that found inputs complete the level in the found time."""
+    solution = solver.LevelSolver(name, seed=4).solve()
+
+    assert solution.isSolved
+    assert solution.safePaths >= 1
+    assert len(solution.actions) == solution.ticks - 1
+
+    froggie = env.FroggieEnv()
+    froggie.reset(name, seed=4)
+    for action in solution.actions:
+        _, _, done, info = froggie.step(action)
+        assert not done
+
+    _, _, done, info = froggie.step(0)
+    assert done
+    assert info['events'] == ['completed']
+    assert info['levelTime'] == solution.levelTime
+
+
+def test_LevelSolver_solve_notSolved():
+    """Tests that too short search finds nothing."""
+    solution = solver.LevelSolver('level1.conf', maxTicks=20).solve()
+
+    assert not solution.isSolved
+    assert solution.safePaths == 0
+    assert solution.actionString() == ''
+
+
+def test_Solution_actionString():
+    """Tests short form of the input sequence."""
+    solution = solver.Solution('level1.conf', 0)
+    solution.actions = [0, 0, 0, 1, 0, 0, 3]
+
+    assert solution.actionString() == '3.u2.l'
+
+
+def test_packRows():
+    """Tests that equal rows get equal keys."""
+    keys = solver.packRows([np.array([1, 5, 1, -3]), np.array([2, 2, 2, 2]),
+                            np.array([0, 7, 0, 7])])
+
+    assert keys[0] == keys[2]
+    assert len(set(keys.tolist())) == 3
+
+
+def test_quietLog(monkeypatch, capsys):
+    """Tests that only warnings and errors of the log reach stderr."""
+    log = eventlog.EventLog([eventlog.StdoutSink(eventlog.INFO)])
+    monkeypatch.setattr(solver, 'LOG', log)
+
+    solver.quietLog()
+    log.info('Loading level')
+    log.warning('Broken line')
+    log.close()
+
+    out, err = capsys.readouterr()
+    assert out == ''
+    assert err == 'WARNING Broken line\n'
@@ -0,0 +1,52 @@
+"""Tests for TextCache class."""
+import pygame
+
+from context import textcache
+
+# Need to initialize pygame parts (like pygame.font.init()) or the whole
+# pygame with pygame.init().
+pygame.init()
+
+
+def test_getFont_shared():
+    """Tests that font objects are created only once."""
+    assert textcache.getFont(None, 31) is textcache.getFont(None, 31)
+    assert textcache.getFont(None, 31) is not textcache.getFont(None, 32)
+
+
+def test_TextCache_render():
+    """Tests that the same text is rendered only once."""
+    cache = textcache.TextCache()
+
+    text1 = cache.render('Level: 1', 30, 'white')
+    text2 = cache.render('Level: 1', 30, (255, 255, 255))
+    assert text1 is text2
+
+    assert cache.render('Level: 1', 30, 'red') is not text1
+    assert cache.render('Level: 1', 27, 'white') is not text1
+    assert (cache.surfaces.hits, cache.surfaces.misses) == (1, 3)
+
+
+def test_TextCache_renderBounded():
+    """Tests that the cache does not grow over the size limit."""
+    cache = textcache.TextCache(maxBytes=64 * 1024)
+    for i in range(1000):
+        cache.render(str(i), 30)
+
+    assert cache.surfaces.size <= 64 * 1024
+    assert len(cache.surfaces.surfaces) < 1000
+
+
+def test_TextCache_drawGlyphs():
+    """Tests that numbers are drawn from cached digit surfaces."""
+    cache = textcache.TextCache()
+    surface = pygame.Surface((200, 50))
+
+    rect = cache.drawGlyphs(surface, '12.5', (10, 5), 30)
+    rect2 = cache.drawGlyphs(surface, '21.5', (10, 5), 30)
+
+    # Only characters '1', '2', '.' and '5' are rendered.
+    assert len(cache.surfaces.surfaces) == 4
+    assert rect.topleft == (10, 5)
+    assert rect.width == sum(cache.render(x, 30).get_width() for x in '12.5')
+    assert rect2.width == rect.width
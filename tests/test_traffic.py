@@ -0,0 +1,93 @@
+"""Tests for TrafficEngine class."""
+import os
+import random
+
+import pygame
+import pytest
+
+from context import level, traffic
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                          'configs')
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                         'images')
+
+
+def loadLevel(name):
+    """Load level with the same random car positions every time."""
+    lvl = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800, seed=7)
+    lvl.load(os.path.join(CONFIG_DIR, name))
+    return lvl
+
+
+def positions(sprites):
+    """Return rects of the sprites as tuples."""
+    return [(tuple(s.rect), tuple(s.collisionRect)) for s in sprites]
+
+
+@pytest.mark.parametrize('name', ['level%d.conf' % i for i in range(1, 8)])
+def test_TrafficEngine_step_sameAsUpdate(name):
+    """Tests that engine moves objects the same way as Car/Floater.update()"""
+    expected = loadLevel(name)
+    result = loadLevel(name)
+    engine = traffic.TrafficEngine(result.cars, result.floaters, 600,
+                                   rng=result.rng)
+
+    expectedPositions = []
+    for _ in range(500):
+        for sprite in expected.floaters + expected.cars:
+            sprite.update()
+        expectedPositions.append(positions(expected.cars + expected.floaters))
+
+    for i in range(500):
+        engine.step()
+        engine.syncSprites()
+        assert positions(engine.sprites) == expectedPositions[i], i
+
+    shadows = [tuple(car.shadow.rect) for car in result.cars]
+    assert shadows == [tuple(car.shadow.rect) for car in expected.cars]
+
+
+@pytest.mark.parametrize('name', ['level1.conf', 'level4.conf',
+                                  'level7.conf'])
+def test_TrafficEngine_collide(name):
+    """Tests that collisions are found the same way as collidelist() does."""
+    lvl = loadLevel(name)
+    engine = traffic.TrafficEngine(lvl.cars, lvl.floaters, 600)
+
+    carRects = [car.collisionRect for car in lvl.cars]
+    floaterRects = [floater.collisionRect for floater in lvl.floaters]
+
+    for step in range(60):
+        engine.syncSprites()
+        for x in range(-40, 640, 13):
+            for y in range(0, 800, 17):
+                rect = pygame.Rect(x, y, 30, 40)
+                assert engine.collideCars(rect) == rect.collidelist(carRects)
+                assert (engine.collideFloaters(rect)
+                        == rect.collidelist(floaterRects))
+
+        for _ in range(7):
+            engine.step()
+
+
+def test_TrafficEngine_step_levelsIndependent():
+    """Tests that levels with the same seed move cars the same way, whatever
+    other levels and the random module do in between."""
+    first = loadLevel('level2.conf')
+    second = loadLevel('level2.conf')
+    other = level.Level(CONFIG_DIR, IMAGE_DIR, 600, 800)
+    other.load(os.path.join(CONFIG_DIR, 'level2.conf'))
+
+    engines = [traffic.TrafficEngine(lvl.cars, lvl.floaters, 600,
+                                     rng=lvl.rng)
+               for lvl in (first, second, other)]
+
+    for _ in range(500):
+        engines[0].step()
+        engines[2].step()
+        random.random()
+        engines[1].step()
+
+        assert engines[0].y.tolist() == engines[1].y.tolist()
+        assert engines[0].x.tolist() == engines[1].x.tolist()